@@ -3,6 +3,10 @@ Memory package for Deep Research Agent
 Contains short-term and long-term memory modules
 """
 
+import atexit
+import asyncio
+import weakref
+
 from .short_term import ShortTermMemory
 from .long_term import LongTermMemory
 
@@ -11,10 +15,20 @@ __all__ = [
     'LongTermMemory'
 ]
 
+# Number of important memories buffered by MemoryManager before they are
+# embedded and stored together
+MEMORY_BATCH_SIZE = 32
+
+def _close_on_exit(manager_ref: "weakref.ref") -> None:
+    """Store a still-alive manager's pending memories before the interpreter shuts down"""
+    manager = manager_ref()
+    if manager is not None:
+        manager.close()
+
 # Memory factory functions
-def create_short_term_memory(max_messages: int = 20, max_age_hours: int = 24):
+def create_short_term_memory(max_messages: int = 20, max_age_hours: int = 24, token_budget: int = None):
     """Create a short-term memory instance"""
-    return ShortTermMemory(max_messages=max_messages, max_age_hours=max_age_hours)
+    return ShortTermMemory(max_messages=max_messages, max_age_hours=max_age_hours, token_budget=token_budget)
 
 def create_long_term_memory(vector_store_type: str = "chroma", 
                            collection_name: str = "research_memory",
@@ -31,32 +45,79 @@ class MemoryManager:
     
     def __init__(self, 
                  short_term_config: dict = None,
-                 long_term_config: dict = None):
+                 long_term_config: dict = None,
+                 long_term: LongTermMemory = None,
+                 batch_size: int = MEMORY_BATCH_SIZE):
         """
         Initialize memory manager
         
         Args:
             short_term_config: Configuration for short-term memory
             long_term_config: Configuration for long-term memory
+            long_term: Existing long-term memory to share instead of creating one
+            batch_size: Important memories buffered before one batched store (1 disables buffering)
         """
         # Initialize short-term memory
         st_config = short_term_config or {}
         self.short_term = create_short_term_memory(**st_config)
         
         # Initialize long-term memory
-        lt_config = long_term_config or {}
-        self.long_term = create_long_term_memory(**lt_config)
+        if long_term is not None:
+            self.long_term = long_term
+        else:
+            lt_config = long_term_config or {}
+            self.long_term = create_long_term_memory(**lt_config)
+        
+        # Important memories waiting to be embedded in one batch
+        self.batch_size = batch_size
+        self._pending = []
+        atexit.register(_close_on_exit, weakref.ref(self))
     
     def add_conversation_message(self, message: dict):
         """Add a message to short-term memory"""
         self.short_term.add_message(message)
     
-    def store_important_memory(self, content: str, metadata: dict = None, importance: float = 1.0):
-        """Store important information in long-term memory"""
-        return self.long_term.store_memory(content, metadata, importance=importance)
+    def store_important_memory(self, content, metadata: dict = None, importance: float = 1.0):
+        """
+        Store important information in long-term memory
+        
+        A single content is stored right away, so other sessions sharing the
+        long-term store see it at once. A list of contents is queued and embedded
+        in one batch once batch_size are pending, or when sync(), close() or a
+        context lookup flushes them.
+        
+        Returns:
+            Memory ID, or a list of IDs when content is a list; IDs are assigned
+            when queued and identify the memories once they are stored
+        """
+        if not isinstance(content, list):
+            # Keep queued memories ahead of this one
+            self.sync()
+            return self.long_term.store_memory(content, metadata, importance=importance)
+        
+        ids = self.long_term.new_memory_ids(len(content))
+        self._pending.extend(
+            {"id": memory_id, "content": item, "metadata": metadata, "importance": importance}
+            for memory_id, item in zip(ids, content)
+        )
+        if len(self._pending) >= self.batch_size:
+            self.sync()
+        return ids
+    
+    def sync(self):
+        """Store all pending important memories with a single batched call"""
+        if not self._pending:
+            return []
+        pending, self._pending = self._pending, []
+        return self.long_term.store_memories_batch(pending)
+    
+    def close(self) -> None:
+        """Store pending memories; also runs at interpreter exit"""
+        self.sync()
     
     def get_relevant_context(self, query: str, include_short_term: bool = True, include_long_term: bool = True):
         """Get relevant context from both memory types"""
+        self.sync()
         context = {
             "short_term": [],
             "long_term": []
@@ -70,8 +131,25 @@ class MemoryManager:
         
         return context
     
+    async def aget_relevant_context(self, query: str, include_short_term: bool = True, include_long_term: bool = True):
+        """Async version of get_relevant_context; both memory types are searched concurrently"""
+        # Storing runs the encoder and writes the index, so keep it off the event loop
+        await asyncio.to_thread(self.sync)
+        async def no_results():
+            return []
+        
+        short_term, long_term = await asyncio.gather(
+            asyncio.to_thread(self.short_term.search_messages, query) if include_short_term else no_results(),
+            self.long_term.aretrieve_memories(query) if include_long_term else no_results()
+        )
+        return {
+            "short_term": short_term,
+            "long_term": long_term
+        }
+    
     def get_memory_summary(self):
         """Get summary of both memory types"""
+        self.sync()
         return {
             "short_term": self.short_term.summarize_conversation(),
             "long_term": self.long_term.get_memory_stats()
@@ -3,33 +3,267 @@ Long-term Memory Module - Vector store integration for persistent memory
 """
 
 import os
+import sys
 import json
-from typing import Dict, List, Any, Optional, Union
+import mmap
+import atexit
+import asyncio
+import time
+import hashlib
+import weakref
+import threading
+import numpy as np
+from functools import lru_cache
+from collections import OrderedDict, defaultdict
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Tuple, Union
 from datetime import datetime
-from dotenv import load_dotenv
+from utils.config import load_environment
 
-# Load environment variables
-load_dotenv()
+# Load environment variables (once per process, shared with the other packages)
+load_environment()
 
 try:
     import chromadb
     from chromadb.config import Settings
+    from chromadb.errors import ChromaError
     CHROMA_AVAILABLE = True
 except ImportError:
     CHROMA_AVAILABLE = False
 
 try:
     import faiss
-    import numpy as np
     FAISS_AVAILABLE = True
 except ImportError:
     FAISS_AVAILABLE = False
 
+try:
+    from sentence_transformers import SentenceTransformer
+    SENTENCE_TRANSFORMERS_AVAILABLE = True
+except ImportError:
+    SENTENCE_TRANSFORMERS_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Embedding model settings (all-MiniLM-L6-v2 produces 384-dim vectors)
+EMBEDDING_MODEL_NAME = "all-MiniLM-L6-v2"
+EMBEDDING_DIM = 384
+EMBEDDING_BATCH_SIZE = 32
+
+# Number of query embeddings kept in the LRU cache
+QUERY_EMBEDDING_CACHE_SIZE = 1024
+
+# Number of distinct metadata filters kept in the LRU cache
+METADATA_FILTER_CACHE_SIZE = 128
+
+# FAISS HNSW graph settings
+FAISS_HNSW_M = 32
+FAISS_HNSW_EF_CONSTRUCTION = 200
+FAISS_HNSW_EF_SEARCH = 64
+
+# FAISS quantization settings ("sq8" = 8-bit scalar, "pq" = IVF + product quantization)
+FAISS_QUANTIZATION_TYPES = ("none", "sq8", "pq")
+FAISS_IVF_NLIST = 256
+FAISS_IVF_NPROBE = 16
+FAISS_PQ_M = 48
+FAISS_PQ_NBITS = 8
+FAISS_PQ_TRAIN_SIZE = 10000
+
+# Write-behind buckets: a type's bucket is written once it holds this many
+# memories, and every bucket is drained at least once per interval
+WRITE_BEHIND_FLUSH_THRESHOLD = 64
+WRITE_BEHIND_FLUSH_INTERVAL_S = 1.0
+
+# Number of FAISS inserts buffered before the index is written to disk
+FAISS_FLUSH_EVERY = 256
+
+# ChromaDB client/server settings
+CHROMA_MODES = ("persistent", "server")
+CHROMA_UPSERT_CHUNK_SIZE = 256
+CHROMA_MAX_CONCURRENT_UPSERTS = 16
+
+# Initial row capacity of the in-memory fallback embedding matrix
+FALLBACK_INITIAL_CAPACITY = 64
+
+# Recency boost half-life; a memory this old gets half of recency_weight added
+RECENCY_HALF_LIFE_S = 7 * 24 * 3600.0
+
+# Fallback store lists grow in fixed blocks of this many entries
+CHUNKED_LIST_CHUNK_SIZE = 512
+CHUNKED_LIST_FIRST_CAPACITY = 8
+
+if NUMBA_AVAILABLE:
+    # fastmath without the no-NaN/no-Inf assumptions, since -inf marks filtered rows
+    @njit(parallel=True, fastmath={"nsz", "arcp", "contract", "afn", "reassoc"}, cache=True)
+    def _score_memories(emb, query, importance, allowed, min_importance,
+                        timestamps, now_ts, recency_weight, half_life):
+        """Dot product + exponential recency boost, -inf for filtered rows"""
+        n, dim = emb.shape
+        scores = np.empty(n, dtype=np.float32)
+        decay = np.log(2.0) / half_life
+        for i in prange(n):
+            if allowed[i] and importance[i] >= min_importance:
+                total = np.float32(0.0)
+                for j in range(dim):
+                    total += emb[i, j] * query[j]
+                if recency_weight > 0.0:
+                    age = max(now_ts - timestamps[i], 0.0)
+                    total += np.float32(recency_weight * np.exp(-age * decay))
+                scores[i] = total
+            else:
+                scores[i] = -np.inf
+        return scores
+    
+    @njit(cache=True)
+    def _topk_dot(emb, query, importance, allowed, min_importance,
+                  timestamps, now_ts, recency_weight, half_life, k):
+        """Fused scoring + importance filter + top-k over the fallback matrix"""
+        n = emb.shape[0]
+        scores = _score_memories(emb, query, importance, allowed, min_importance,
+                                 timestamps, now_ts, recency_weight, half_life)
+        
+        # Keep the k best rows in a small sorted buffer
+        top_indices = np.full(k, -1, dtype=np.int64)
+        top_scores = np.full(k, -np.inf, dtype=np.float32)
+        for i in range(n):
+            score = scores[i]
+            if score == -np.inf or score <= top_scores[k - 1]:
+                continue
+            pos = k - 1
+            while pos > 0 and top_scores[pos - 1] < score:
+                top_scores[pos] = top_scores[pos - 1]
+                top_indices[pos] = top_indices[pos - 1]
+                pos -= 1
+            top_scores[pos] = score
+            top_indices[pos] = i
+        
+        return top_indices, top_scores
+
+def _dumps_json(data: Any) -> bytes:
+    """Serialize metadata to JSON bytes, using orjson when available"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(data).encode("utf-8")
+
+def _loads_json(data: bytes) -> Any:
+    """Deserialize JSON bytes, using orjson when available"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def iso_from_ns(timestamp_ns: int) -> str:
+    """Format a created_at_ns metadata value as an ISO timestamp for display"""
+    return datetime.fromtimestamp(timestamp_ns / 1e9).isoformat()
+
+@lru_cache(maxsize=METADATA_FILTER_CACHE_SIZE)
+def _metadata_filter(memory_type: Optional[str], min_importance: float) -> Optional[Dict[str, Any]]:
+    """
+    Build the ChromaDB/Pinecone metadata filter, cached per (memory_type, min_importance)
+    
+    The returned dict is shared between calls and must not be modified.
+    """
+    filter_dict = {}
+    if memory_type:
+        filter_dict["type"] = memory_type
+    if min_importance > 0:
+        filter_dict["importance"] = {"$gte": min_importance}
+    return filter_dict or None
+
+def _flush_on_exit(memory_ref: "weakref.ref") -> None:
+    """Flush a still-alive memory instance before the interpreter shuts down"""
+    memory = memory_ref()
+    if memory is not None:
+        memory.flush()
+
+def _write_behind_loop(memory_ref: "weakref.ref", wake: threading.Event, interval: float) -> None:
+    """Drain write-behind buckets until the memory instance is garbage collected"""
+    while True:
+        wake.wait(interval)
+        wake.clear()
+        memory = memory_ref()
+        if memory is None:
+            return
+        memory.flush_writes()
+        del memory
+
+class ChunkedList:
+    """Append-only list stored in fixed-size object array blocks
+    
+    The first block doubles up to chunk_size; after that whole blocks are added,
+    so a small store never over-allocates by more than one block.
+    """
+    
+    def __init__(self, items: Iterable[Any] = (), chunk_size: int = CHUNKED_LIST_CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self._chunks: List[np.ndarray] = []
+        self._fill: List[int] = []
+        self._len = 0
+        self.extend(items)
+    
+    def append(self, item: Any) -> None:
+        if not self._chunks or self._fill[-1] == len(self._chunks[-1]):
+            self._grow()
+        self._chunks[-1][self._fill[-1]] = item
+        self._fill[-1] += 1
+        self._len += 1
+    
+    def extend(self, items: Iterable[Any]) -> None:
+        for item in items:
+            self.append(item)
+    
+    def _grow(self) -> None:
+        """Make room for one more item"""
+        if len(self._chunks) == 1 and len(self._chunks[0]) < self.chunk_size:
+            # Still growing the first block geometrically
+            first = self._chunks[0]
+            grown = np.empty(min(len(first) * 2, self.chunk_size), dtype=object)
+            grown[:len(first)] = first
+            self._chunks[0] = grown
+        elif not self._chunks:
+            self._chunks.append(np.empty(min(CHUNKED_LIST_FIRST_CAPACITY, self.chunk_size), dtype=object))
+            self._fill.append(0)
+        else:
+            self._chunks.append(np.empty(self.chunk_size, dtype=object))
+            self._fill.append(0)
+    
+    def __getitem__(self, index: int) -> Any:
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("ChunkedList index out of range")
+        return self._chunks[index // self.chunk_size][index % self.chunk_size]
+    
+    def __len__(self) -> int:
+        return self._len
+    
+    def __iter__(self) -> Iterator[Any]:
+        for chunk, fill in zip(self._chunks, self._fill):
+            yield from chunk[:fill]
+
 class LongTermMemory:
     def __init__(self, 
                  vector_store_type: str = "chroma",
                  collection_name: str = "research_memory",
-                 persist_directory: str = "./memory_db"):
+                 persist_directory: str = "./memory_db",
+                 embedding_model: str = EMBEDDING_MODEL_NAME,
+                 flush_every: int = FAISS_FLUSH_EVERY,
+                 quantization: str = "none",
+                 keep_raw: bool = False,
+                 chroma_mode: str = "persistent",
+                 read_only: bool = False,
+                 write_behind: bool = False,
+                 flush_threshold: int = WRITE_BEHIND_FLUSH_THRESHOLD,
+                 flush_interval_s: float = WRITE_BEHIND_FLUSH_INTERVAL_S,
+                 recency_weight: float = 0.0):
         """
         Initialize long-term memory with vector store
         
@@ -37,19 +271,100 @@ class LongTermMemory:
             vector_store_type: Type of vector store ("chroma", "faiss", "pinecone")
             collection_name: Name of the collection/index
             persist_directory: Directory to persist data
+            embedding_model: Sentence-transformers model used for embeddings
+            flush_every: Number of FAISS inserts buffered before persisting to disk
+            quantization: FAISS vector compression ("none", "sq8", "pq")
+            keep_raw: Also keep full-precision FAISS embeddings when quantizing
+            chroma_mode: "persistent" for the embedded client, "server" to talk to a
+                         ChromaDB server at CHROMA_HOST/CHROMA_PORT
+            read_only: Memory-map an existing FAISS index instead of loading it;
+                       inserts are rejected
+            write_behind: Queue stores in per-type buckets and write them in
+                          grouped batches from a background thread
+            flush_threshold: Bucket size that triggers an immediate write
+            flush_interval_s: Maximum time a queued memory waits before being written
+            recency_weight: Score boost for new memories in the in-memory fallback,
+                            halved every RECENCY_HALF_LIFE_S (0 disables it)
         """
+        if quantization not in FAISS_QUANTIZATION_TYPES:
+            raise ValueError(f"Unsupported quantization: {quantization}")
+        if chroma_mode not in CHROMA_MODES:
+            raise ValueError(f"Unsupported ChromaDB mode: {chroma_mode}")
+        
         self.vector_store_type = vector_store_type.lower()
         self.collection_name = collection_name
         self.persist_directory = persist_directory
+        self.embedding_model = embedding_model
         self.client = None
         self.collection = None
         self.index = None
         
+        # ChromaDB server mode also gets an async client, created on first async call
+        self.chroma_mode = chroma_mode
+        self.chroma_host = os.getenv("CHROMA_HOST", "localhost")
+        self.chroma_port = int(os.getenv("CHROMA_PORT", "8000"))
+        self._async_collection = None
+        
+        # FAISS file paths, computed once
+        self._index_path = os.path.join(persist_directory, f"{collection_name}.index")
+        self._metadata_path = os.path.join(persist_directory, f"{collection_name}_metadata.json")
+        self._vectors_path = os.path.join(persist_directory, f"{collection_name}_vectors.npz")
+        
+        # FAISS persistence is deferred until flush()
+        self.flush_every = flush_every
+        self._dirty = False
+        self._writes_since_flush = 0
+        
+        # HNSW search breadth; can be tuned at runtime for recall vs. speed
+        self.faiss_ef_search = FAISS_HNSW_EF_SEARCH
+        
+        # Weight of the recency boost in fallback scoring
+        self.recency_weight = recency_weight
+        
+        # Quantized FAISS indexes; PQ buffers vectors until it has enough to train
+        self.quantization = quantization
+        self.keep_raw = keep_raw
+        self.read_only = read_only
+        self._pending = np.empty((0, EMBEDDING_DIM), dtype=np.float32)
+        self._pending_ids = np.empty(0, dtype=np.int64)
+        self._raw_chunks: List[np.ndarray] = []
+        self._raw_id_chunks: List[np.ndarray] = []
+        
+        # Sentence encoder is loaded once, on first use
+        self._encoder = None
+        
+        # Memory ids come from a monotonic counter seeded with the wall clock, so
+        # ids stay unique across restarts and sort in insertion order
+        self._next_id = time.time_ns()
+        self._id_lock = threading.Lock()
+        
+        # Query embedding LRU keyed by a digest of the query text
+        self._query_cache: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+        
+        # Write-behind buckets of (id, content, metadata) keyed by memory type;
+        # backend writes are serialized between callers and the flusher thread
+        self.write_behind = write_behind
+        self.flush_threshold = flush_threshold
+        self.flush_interval_s = flush_interval_s
+        self._write_buckets: Dict[str, List[Tuple[str, str, Dict[str, Any]]]] = defaultdict(list)
+        self._bucket_lock = threading.Lock()
+        self._store_lock = threading.RLock()
+        self._flush_wake = threading.Event()
+        
         # Create persist directory if it doesn't exist
         os.makedirs(persist_directory, exist_ok=True)
         
         # Initialize vector store
         self._initialize_vector_store()
+        
+        if self.write_behind:
+            threading.Thread(
+                target=_write_behind_loop,
+                args=(weakref.ref(self), self._flush_wake, flush_interval_s),
+                name=f"{collection_name}-write-behind",
+                daemon=True
+            ).start()
+            atexit.register(_flush_on_exit, weakref.ref(self))
     
     def _initialize_vector_store(self) -> None:
         """Initialize the selected vector store"""
@@ -68,17 +383,16 @@ class LongTermMemory:
             raise ImportError("ChromaDB not available. Install with: pip install chromadb")
         
         try:
-            self.client = chromadb.PersistentClient(path=self.persist_directory)
+            if self.chroma_mode == "server":
+                self.client = chromadb.HttpClient(host=self.chroma_host, port=self.chroma_port)
+            else:
+                self.client = chromadb.PersistentClient(path=self.persist_directory)
             
-            # Get or create collection
-            try:
-                self.collection = self.client.get_collection(name=self.collection_name)
-            except:
-                self.collection = self.client.create_collection(
-                    name=self.collection_name,
-                    metadata={"description": "Deep Research Agent long-term memory"}
-                )
-        except Exception as e:
+            self.collection = self.client.get_or_create_collection(
+                name=self.collection_name,
+                metadata={"description": "Deep Research Agent long-term memory"}
+            )
+        except (ChromaError, OSError, ValueError) as e:
             print(f"ChromaDB initialization error: {e}")
             # Fallback to in-memory storage
             self._initialize_fallback()
@@ -89,22 +403,114 @@ class LongTermMemory:
             raise ImportError("FAISS not available. Install with: pip install faiss-cpu")
         
         try:
-            index_path = os.path.join(self.persist_directory, f"{self.collection_name}.index")
-            metadata_path = os.path.join(self.persist_directory, f"{self.collection_name}_metadata.json")
-            
             # Load existing index or create new one
-            if os.path.exists(index_path):
-                self.index = faiss.read_index(index_path)
-                with open(metadata_path, 'r') as f:
-                    self.metadata = json.load(f)
+            if os.path.exists(self._index_path):
+                if self.read_only:
+                    # Keep the index on disk and page vectors in on demand
+                    self.index = faiss.read_index(self._index_path, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+                else:
+                    self.index = faiss.read_index(self._index_path)
+                self.metadata = _loads_json(self._read_sequential(self._metadata_path))
+                
+                if "records" not in self.metadata:
+                    self._migrate_legacy_faiss()
+                
+                if os.path.exists(self._vectors_path):
+                    with np.load(self._vectors_path) as vectors:
+                        if "pending" in vectors:
+                            self._pending = vectors["pending"]
+                            self._pending_ids = vectors["pending_ids"]
+                        if self.keep_raw and "raw" in vectors:
+                            self._raw_chunks = [vectors["raw"]]
+                            self._raw_id_chunks = [vectors["raw_ids"]]
             else:
-                # Create new index (384 dimensions for sentence transformers)
-                self.index = faiss.IndexFlatL2(384)
-                self.metadata = {"documents": [], "ids": []}
+                self.index = self._create_faiss_index()
+                # FAISS id (as a string key) -> memory id, content and metadata
+                self.metadata = {"records": {}}
+            
+            # __del__ may run too late at shutdown, so also flush from atexit
+            atexit.register(_flush_on_exit, weakref.ref(self))
         except Exception as e:
             print(f"FAISS initialization error: {e}")
             self._initialize_fallback()
     
+    def _migrate_legacy_faiss(self) -> None:
+        """Convert a positional index with parallel documents/ids lists to an IndexIDMap2"""
+        self.index = self._create_faiss_index()
+        
+        # Re-embed the stored documents: the legacy vectors may come from another
+        # model or be unnormalized, and quantized legacy indexes cannot reconstruct them
+        documents = self.metadata["documents"]
+        if documents:
+            vectors = self._generate_embeddings(documents)
+            faiss_ids = np.arange(len(documents), dtype=np.int64)
+            if self.keep_raw:
+                self._raw_chunks = [vectors]
+                self._raw_id_chunks = [faiss_ids]
+            if not self.index.is_trained and len(vectors) >= FAISS_PQ_TRAIN_SIZE:
+                self.index.train(vectors)
+            if self.index.is_trained:
+                self.index.add_with_ids(vectors, faiss_ids)
+            else:
+                self._pending, self._pending_ids = vectors, faiss_ids
+        
+        self.metadata = {
+            "records": {
+                str(row): {"id": memory_id, "content": content, "metadata": {}}
+                for row, (memory_id, content) in enumerate(zip(self.metadata["ids"], self.metadata["documents"]))
+            }
+        }
+        self._dirty = True
+    
+    def _faiss_base_index(self) -> "faiss.Index":
+        """The index wrapped by the IndexIDMap2"""
+        return faiss.downcast_index(self.index.index)
+    
+    def _read_sequential(self, path: str) -> bytes:
+        """Read a file through mmap, hinting the kernel to read ahead sequentially"""
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return b""
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if hasattr(mmap, "MADV_SEQUENTIAL"):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                return mm[:]
+    
+    def _create_faiss_index(self) -> "faiss.Index":
+        """Create an empty FAISS index for the configured quantization"""
+        # Memory ids map straight to FAISS ids, so the library handles id lookup and removal
+        return faiss.IndexIDMap2(self._create_faiss_base_index())
+    
+    def _create_faiss_base_index(self) -> "faiss.Index":
+        """Create the underlying FAISS vector index"""
+        # Embeddings are unit-normalized, so inner product == cosine similarity
+        if self.quantization == "pq":
+            quantizer = faiss.IndexFlatIP(EMBEDDING_DIM)
+            index = faiss.IndexIVFPQ(
+                quantizer, EMBEDDING_DIM, FAISS_IVF_NLIST,
+                FAISS_PQ_M, FAISS_PQ_NBITS, faiss.METRIC_INNER_PRODUCT
+            )
+            index.nprobe = FAISS_IVF_NPROBE
+            return index
+        
+        if self.quantization == "sq8":
+            index = faiss.IndexScalarQuantizer(
+                EMBEDDING_DIM, faiss.ScalarQuantizer.QT_8bit, faiss.METRIC_INNER_PRODUCT
+            )
+            # Normalized components lie in [-1, 1], so train on those bounds up front
+            bounds = np.vstack([
+                -np.ones(EMBEDDING_DIM, dtype=np.float32),
+                np.ones(EMBEDDING_DIM, dtype=np.float32)
+            ])
+            index.train(bounds)
+            return index
+        
+        # Create new HNSW index (384 dimensions for sentence transformers)
+        index = faiss.IndexHNSWFlat(EMBEDDING_DIM, FAISS_HNSW_M, faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efConstruction = FAISS_HNSW_EF_CONSTRUCTION
+        index.hnsw.efSearch = self.faiss_ef_search
+        return index
+    
     def _initialize_pinecone(self) -> None:
         """Initialize Pinecone"""
         try:
@@ -122,7 +528,7 @@ class LongTermMemory:
             if self.collection_name not in pinecone.list_indexes():
                 pinecone.create_index(
                     name=self.collection_name,
-                    dimension=384,  # sentence transformer dimension
+                    dimension=EMBEDDING_DIM,  # sentence transformer dimension
                     metric="cosine"
                 )
             
@@ -136,17 +542,85 @@ class LongTermMemory:
         """Initialize fallback in-memory storage"""
         self.vector_store_type = "memory"
         self.memory_store = {
-            "documents": [],
-            "embeddings": [],
-            "metadata": [],
-            "ids": []
+            "documents": ChunkedList(),
+            "metadata": ChunkedList(),
+            "ids": ChunkedList()
         }
+        
+        # Embeddings live in one contiguous matrix; row i belongs to memory_store[...][i]
+        self._emb = np.empty((FALLBACK_INITIAL_CAPACITY, EMBEDDING_DIM), dtype=np.float32)
+        self._importance = np.empty(FALLBACK_INITIAL_CAPACITY, dtype=np.float32)
+        self._created_s = np.empty(FALLBACK_INITIAL_CAPACITY, dtype=np.float64)
+        self._n = 0
+        
+        # Token -> row ids, used to narrow the candidates scored per query
+        self._postings: Dict[str, set] = defaultdict(set)
+        self._doc_lower: List[str] = []
+    
+    def flush(self) -> None:
+        """Write queued memories, then pending FAISS index and metadata changes to disk"""
+        self.flush_writes()
+        with self._store_lock:
+            if self.vector_store_type != "faiss" or not self._dirty or self.read_only:
+                return
+            
+            try:
+                # Write to temporary files and swap in atomically
+                faiss.write_index(self.index, f"{self._index_path}.tmp")
+                with open(f"{self._metadata_path}.tmp", 'wb') as f:
+                    f.write(_dumps_json(self.metadata))
+                
+                os.replace(f"{self._index_path}.tmp", self._index_path)
+                os.replace(f"{self._metadata_path}.tmp", self._metadata_path)
+                
+                # Vectors still waiting for PQ training, and optional full-precision copies
+                vectors = {}
+                if len(self._pending):
+                    vectors["pending"] = self._pending
+                    vectors["pending_ids"] = self._pending_ids
+                if self.keep_raw and self._raw_chunks:
+                    self._raw_chunks = [np.vstack(self._raw_chunks)]
+                    self._raw_id_chunks = [np.concatenate(self._raw_id_chunks)]
+                    vectors["raw"] = self._raw_chunks[0]
+                    vectors["raw_ids"] = self._raw_id_chunks[0]
+                self._save_arrays(vectors, self._vectors_path)
+                
+                self._dirty = False
+                self._writes_since_flush = 0
+            except Exception as e:
+                print(f"FAISS flush error: {e}")
+    
+    def _save_arrays(self, arrays: Dict[str, np.ndarray], path: str) -> None:
+        """Atomically save arrays next to the index, removing the file when empty"""
+        if not arrays:
+            if os.path.exists(path):
+                os.remove(path)
+            return
+        
+        with open(f"{path}.tmp", 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(f"{path}.tmp", path)
+    
+    def __enter__(self) -> "LongTermMemory":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.flush()
+    
+    def __del__(self):
+        if sys.is_finalizing():
+            return
+        try:
+            self.flush()
+        except Exception:
+            pass
     
     def store_memory(self, 
                     content: str, 
                     metadata: Optional[Dict[str, Any]] = None,
                     memory_type: str = "research",
-                    importance: float = 1.0) -> str:
+                    importance: float = 1.0,
+                    sync: bool = False) -> str:
         """
         Store a memory in long-term storage
         
@@ -155,33 +629,216 @@ class LongTermMemory:
             metadata: Additional metadata
             memory_type: Type of memory (research, conversation, insight, etc.)
             importance: Importance score (0.0 to 1.0)
+            sync: Write immediately even when write-behind is enabled
             
         Returns:
             Memory ID
         """
-        # Create memory ID
-        memory_id = f"{memory_type}_{datetime.now().timestamp()}"
-        
-        # Prepare metadata
-        full_metadata = {
-            "type": memory_type,
-            "importance": importance,
-            "created_at": datetime.now().isoformat(),
-            "content_length": len(content),
-            **(metadata or {})
-        }
+        return self.store_memories_batch([{
+            "content": content,
+            "metadata": metadata,
+            "memory_type": memory_type,
+            "importance": importance
+        }], sync=sync)[0]
+    
+    def store_memories_batch(self, items: List[Dict[str, Any]], sync: bool = False) -> List[str]:
+        """
+        Store several memories with a single vector store call
         
-        # Store based on vector store type
-        if self.vector_store_type == "chroma":
-            self._store_chroma(memory_id, content, full_metadata)
-        elif self.vector_store_type == "faiss":
-            self._store_faiss(memory_id, content, full_metadata)
-        elif self.vector_store_type == "pinecone":
-            self._store_pinecone(memory_id, content, full_metadata)
-        else:
-            self._store_memory_fallback(memory_id, content, full_metadata)
+        Args:
+            items: Memory dicts with "content" and optional "metadata",
+                   "memory_type", "importance" and "id" (from new_memory_ids) keys
+            sync: Write immediately even when write-behind is enabled
+            
+        Returns:
+            Memory IDs in input order
+        """
+        if not items:
+            return []
+        
+        ids, contents, metadatas = self._prepare_batch(items)
+        
+        if not self.write_behind or sync:
+            self._write_batch(ids, contents, metadatas)
+            return ids
+        
+        # Queue by memory type; wake the flusher as soon as a bucket is full
+        full = False
+        with self._bucket_lock:
+            for record in zip(ids, contents, metadatas):
+                bucket = self._write_buckets[record[2]["type"]]
+                bucket.append(record)
+                full = full or len(bucket) >= self.flush_threshold
+        if full:
+            self._flush_wake.set()
+        
+        return ids
+    
+    def new_memory_ids(self, count: int, memory_type: str = "research") -> List[str]:
+        """Reserve ids for memories of one type that are stored later with store_memories_batch"""
+        with self._id_lock:
+            first_id = self._next_id + 1
+            self._next_id += count
+        return [f"{memory_type}_{first_id + i:016x}" for i in range(count)]
+    
+    def flush_writes(self) -> None:
+        """Write every queued memory, largest bucket first"""
+        while True:
+            with self._bucket_lock:
+                if not self._write_buckets:
+                    return
+                memory_type = max(self._write_buckets, key=lambda t: len(self._write_buckets[t]))
+                records = self._write_buckets.pop(memory_type)
+            
+            ids, contents, metadatas = (list(column) for column in zip(*records))
+            try:
+                self._write_batch(ids, contents, metadatas)
+            except Exception as e:
+                print(f"Write-behind flush error: {e}")
+    
+    def _write_batch(self, ids: List[str], contents: List[str], metadatas: List[Dict[str, Any]]) -> None:
+        """Store prepared memories in the selected vector store"""
+        with self._store_lock:
+            if self.vector_store_type == "chroma":
+                self._store_chroma(ids, contents, metadatas)
+            elif self.vector_store_type == "faiss":
+                self._store_faiss(ids, contents, metadatas)
+            elif self.vector_store_type == "pinecone":
+                self._store_pinecone(ids, contents, metadatas)
+            else:
+                self._store_memory_fallback(ids, contents, metadatas)
+    
+    def _prepare_batch(self, items: List[Dict[str, Any]]):
+        """Build ids, contents and full metadata for a batch of memories"""
+        created_at_ns = time.time_ns()
+        
+        # Reserve a block of ids for the items that were not given one
+        with self._id_lock:
+            next_id = self._next_id + 1
+            self._next_id += sum(1 for item in items if "id" not in item)
+        
+        ids = []
+        contents = []
+        metadatas = []
+        
+        for item in items:
+            content = item["content"]
+            memory_type = item.get("memory_type", "research")
+            
+            memory_id = item.get("id")
+            if memory_id is None:
+                memory_id = f"{memory_type}_{next_id:016x}"
+                next_id += 1
+            ids.append(memory_id)
+            contents.append(content)
+            metadatas.append({
+                "type": memory_type,
+                "importance": item.get("importance", 1.0),
+                "created_at_ns": created_at_ns,
+                "content_length": len(content),
+                **(item.get("metadata") or {})
+            })
+        
+        return ids, contents, metadatas
+    
+    async def astore_memory(self, 
+                           content: str, 
+                           metadata: Optional[Dict[str, Any]] = None,
+                           memory_type: str = "research",
+                           importance: float = 1.0) -> str:
+        """Async version of store_memory"""
+        ids = await self.astore_memories_batch([{
+            "content": content,
+            "metadata": metadata,
+            "memory_type": memory_type,
+            "importance": importance
+        }])
+        return ids[0]
+    
+    async def astore_memories_batch(self, items: List[Dict[str, Any]]) -> List[str]:
+        """
+        Async version of store_memories_batch
+        
+        In ChromaDB server mode the batch is split into chunks that are upserted
+        concurrently; other backends run the sync path in a worker thread.
+        """
+        if not items:
+            return []
+        
+        if self.vector_store_type != "chroma" or self.chroma_mode != "server":
+            return await asyncio.to_thread(self.store_memories_batch, items)
+        
+        ids, contents, metadatas = self._prepare_batch(items)
+        
+        try:
+            collection = await self._get_async_collection()
+            semaphore = asyncio.Semaphore(CHROMA_MAX_CONCURRENT_UPSERTS)
+            
+            async def upsert_chunk(start: int) -> None:
+                end = start + CHROMA_UPSERT_CHUNK_SIZE
+                async with semaphore:
+                    await collection.upsert(
+                        documents=contents[start:end],
+                        metadatas=metadatas[start:end],
+                        ids=ids[start:end]
+                    )
+            
+            await asyncio.gather(*[
+                upsert_chunk(start) for start in range(0, len(ids), CHROMA_UPSERT_CHUNK_SIZE)
+            ])
+        except Exception as e:
+            print(f"ChromaDB storage error: {e}")
+        
+        return ids
+    
+    async def aretrieve_memories(self, 
+                                query: str, 
+                                limit: int = 5,
+                                memory_type: Optional[str] = None,
+                                min_importance: float = 0.0) -> List[Dict[str, Any]]:
+        """Async version of retrieve_memories"""
+        results = await self.aretrieve_memories_batch([query], limit, memory_type, min_importance)
+        return results[0]
+    
+    async def aretrieve_memories_batch(self, 
+                                      queries: List[str], 
+                                      limit: int = 5,
+                                      memory_type: Optional[str] = None,
+                                      min_importance: float = 0.0) -> List[List[Dict[str, Any]]]:
+        """Async version of retrieve_memories_batch"""
+        if not queries:
+            return []
+        
+        if self.vector_store_type != "chroma" or self.chroma_mode != "server":
+            return await asyncio.to_thread(
+                self.retrieve_memories_batch, queries, limit, memory_type, min_importance
+            )
+        
+        if self.write_behind:
+            await asyncio.to_thread(self.flush_writes)
         
-        return memory_id
+        try:
+            where_clause = _metadata_filter(memory_type, min_importance)
+            collection = await self._get_async_collection()
+            results = await collection.query(
+                query_texts=queries,
+                n_results=limit,
+                where=where_clause
+            )
+            return self._format_chroma_results(results, len(queries))
+        except Exception as e:
+            print(f"ChromaDB retrieval error: {e}")
+            return [[] for _ in queries]
+    
+    async def _get_async_collection(self):
+        """Create the async ChromaDB server client and collection once"""
+        if self._async_collection is None:
+            client = await chromadb.AsyncHttpClient(host=self.chroma_host, port=self.chroma_port)
+            self._async_collection = await client.get_or_create_collection(
+                name=self.collection_name,
+                metadata={"description": "Deep Research Agent long-term memory"}
+            )
+        return self._async_collection
     
     def retrieve_memories(self, 
                          query: str, 
@@ -200,202 +857,439 @@ class LongTermMemory:
         Returns:
             List of relevant memories with scores
         """
-        if self.vector_store_type == "chroma":
-            return self._retrieve_chroma(query, limit, memory_type, min_importance)
-        elif self.vector_store_type == "faiss":
-            return self._retrieve_faiss(query, limit, memory_type, min_importance)
-        elif self.vector_store_type == "pinecone":
-            return self._retrieve_pinecone(query, limit, memory_type, min_importance)
-        else:
-            return self._retrieve_memory_fallback(query, limit, memory_type, min_importance)
+        return self.retrieve_memories_batch([query], limit, memory_type, min_importance)[0]
     
-    def _store_chroma(self, memory_id: str, content: str, metadata: Dict[str, Any]) -> None:
-        """Store memory in ChromaDB"""
+    def retrieve_memories_batch(self, 
+                               queries: List[str], 
+                               limit: int = 5,
+                               memory_type: Optional[str] = None,
+                               min_importance: float = 0.0) -> List[List[Dict[str, Any]]]:
+        """
+        Retrieve relevant memories for several queries in one shot
+        
+        Args:
+            queries: Search queries
+            limit: Maximum number of memories to return per query
+            memory_type: Filter by memory type
+            min_importance: Minimum importance score
+            
+        Returns:
+            One list of relevant memories per query, in input order
+        """
+        if not queries:
+            return []
+        
+        # Queued memories must be visible to the search that follows them
+        if self.write_behind:
+            self.flush_writes()
+        
+        # One instance is shared by every Streamlit session; searches read the index
+        # and update the query-embedding LRU, so they must not interleave with writes
+        with self._store_lock:
+            if self.vector_store_type == "chroma":
+                return self._retrieve_chroma(queries, limit, memory_type, min_importance)
+            elif self.vector_store_type == "faiss":
+                return self._retrieve_faiss(queries, limit, memory_type, min_importance)
+            elif self.vector_store_type == "pinecone":
+                return self._retrieve_pinecone(queries, limit, memory_type, min_importance)
+            else:
+                return self._retrieve_memory_fallback(queries, limit, memory_type, min_importance)
+    
+    def _store_chroma(self, ids: List[str], contents: List[str], metadatas: List[Dict[str, Any]]) -> None:
+        """Store memories in ChromaDB"""
         try:
             self.collection.add(
-                documents=[content],
-                metadatas=[metadata],
-                ids=[memory_id]
+                documents=contents,
+                metadatas=metadatas,
+                ids=ids
             )
         except Exception as e:
             print(f"ChromaDB storage error: {e}")
     
-    def _store_faiss(self, memory_id: str, content: str, metadata: Dict[str, Any]) -> None:
-        """Store memory in FAISS"""
+    def _store_faiss(self, ids: List[str], contents: List[str], metadatas: List[Dict[str, Any]]) -> None:
+        """Store memories in FAISS"""
+        if self.read_only:
+            print("FAISS storage error: memory was opened read-only")
+            return
+        
         try:
-            # Generate embedding (placeholder - would use actual embedding model)
-            embedding = self._generate_embedding(content)
+            embeddings = self._generate_embeddings(contents)
+            
+            # The counter part of each memory id doubles as its FAISS id
+            faiss_ids = np.fromiter(
+                (int(memory_id.rsplit("_", 1)[1], 16) for memory_id in ids),
+                dtype=np.int64,
+                count=len(ids)
+            )
             
-            # Add to index
-            self.index.add(np.array([embedding]))
+            if self.keep_raw:
+                self._raw_chunks.append(embeddings)
+                self._raw_id_chunks.append(faiss_ids)
             
-            # Store metadata
-            self.metadata["documents"].append(content)
-            self.metadata["ids"].append(memory_id)
+            # Add to index, buffering until a PQ index has enough vectors to train
+            if self.index.is_trained:
+                self.index.add_with_ids(embeddings, faiss_ids)
+            else:
+                self._pending = np.vstack([self._pending, embeddings])
+                self._pending_ids = np.concatenate([self._pending_ids, faiss_ids])
+                if len(self._pending) >= FAISS_PQ_TRAIN_SIZE:
+                    self.index.train(self._pending)
+                    self.index.add_with_ids(self._pending, self._pending_ids)
+                    self._pending = np.empty((0, EMBEDDING_DIM), dtype=np.float32)
+                    self._pending_ids = np.empty(0, dtype=np.int64)
             
-            # Save index and metadata
-            index_path = os.path.join(self.persist_directory, f"{self.collection_name}.index")
-            metadata_path = os.path.join(self.persist_directory, f"{self.collection_name}_metadata.json")
+            # Store metadata
+            records = self.metadata["records"]
+            for memory_id, faiss_id, content, metadata in zip(ids, faiss_ids.tolist(), contents, metadatas):
+                records[str(faiss_id)] = {"id": memory_id, "content": content, "metadata": metadata}
             
-            faiss.write_index(self.index, index_path)
-            with open(metadata_path, 'w') as f:
-                json.dump(self.metadata, f)
+            # Persist lazily instead of rewriting the index on every insert
+            self._dirty = True
+            self._writes_since_flush += len(ids)
+            if self._writes_since_flush >= self.flush_every:
+                self.flush()
                 
         except Exception as e:
             print(f"FAISS storage error: {e}")
     
-    def _store_pinecone(self, memory_id: str, content: str, metadata: Dict[str, Any]) -> None:
-        """Store memory in Pinecone"""
+    def _store_pinecone(self, ids: List[str], contents: List[str], metadatas: List[Dict[str, Any]]) -> None:
+        """Store memories in Pinecone"""
         try:
-            embedding = self._generate_embedding(content)
+            embeddings = self._generate_embeddings(contents)
             
             self.index.upsert(
-                vectors=[(memory_id, embedding, metadata)]
+                vectors=[
+                    (memory_id, embedding.tolist(), metadata)
+                    for memory_id, embedding, metadata in zip(ids, embeddings, metadatas)
+                ]
             )
         except Exception as e:
             print(f"Pinecone storage error: {e}")
     
-    def _store_memory_fallback(self, memory_id: str, content: str, metadata: Dict[str, Any]) -> None:
-        """Store memory in fallback storage"""
-        embedding = self._generate_embedding(content)
+    def _store_memory_fallback(self, ids: List[str], contents: List[str], metadatas: List[Dict[str, Any]]) -> None:
+        """Store memories in fallback storage"""
+        embeddings = self._generate_embeddings(contents)
+        start = self._n
+        
+        # Grow the embedding matrix by doubling when it is full
+        needed = start + len(embeddings)
+        if needed > len(self._emb):
+            capacity = len(self._emb)
+            while capacity < needed:
+                capacity *= 2
+            grown = np.empty((capacity, EMBEDDING_DIM), dtype=np.float32)
+            grown[:start] = self._emb[:start]
+            self._emb = grown
+            grown_importance = np.empty(capacity, dtype=np.float32)
+            grown_importance[:start] = self._importance[:start]
+            self._importance = grown_importance
+            grown_created = np.empty(capacity, dtype=np.float64)
+            grown_created[:start] = self._created_s[:start]
+            self._created_s = grown_created
+        
+        self._emb[start:needed] = embeddings
+        self._importance[start:needed] = [metadata["importance"] for metadata in metadatas]
+        self._created_s[start:needed] = [metadata["created_at_ns"] / 1e9 for metadata in metadatas]
         
-        self.memory_store["documents"].append(content)
-        self.memory_store["embeddings"].append(embedding)
-        self.memory_store["metadata"].append(metadata)
-        self.memory_store["ids"].append(memory_id)
+        self._index_documents(start, contents)
+        self._n = needed
+        
+        store = self.memory_store
+        store["documents"].extend(contents)
+        store["metadata"].extend(metadatas)
+        store["ids"].extend(ids)
+    
+    def _index_documents(self, start: int, contents: Iterable[str]) -> None:
+        """Add fallback documents, stored from row start on, to the inverted index"""
+        # Locally bound lookups for the per-token loop
+        postings = self._postings
+        doc_lower_append = self._doc_lower.append
+        for row, content in enumerate(contents, start):
+            content_lower = content.lower()
+            doc_lower_append(content_lower)
+            for token in content_lower.split():
+                postings[token].add(row)
+    
+    def _candidate_rows(self, query: str) -> Optional[np.ndarray]:
+        """Rows containing every query token, or None to scan all rows"""
+        postings = [self._postings.get(token) for token in set(query.lower().split())]
+        if not postings or not all(postings):
+            return None
+        
+        candidates = set.intersection(*sorted(postings, key=len))
+        if not candidates:
+            return None
+        return np.fromiter(sorted(candidates), dtype=np.int64, count=len(candidates))
     
-    def _retrieve_chroma(self, query: str, limit: int, memory_type: Optional[str], min_importance: float) -> List[Dict[str, Any]]:
+    def _retrieve_chroma(self, queries: List[str], limit: int, memory_type: Optional[str], min_importance: float) -> List[List[Dict[str, Any]]]:
         """Retrieve memories from ChromaDB"""
         try:
-            # Build where clause for filtering
-            where_clause = {}
-            if memory_type:
-                where_clause["type"] = memory_type
-            if min_importance > 0:
-                where_clause["importance"] = {"$gte": min_importance}
+            where_clause = _metadata_filter(memory_type, min_importance)
             
             results = self.collection.query(
-                query_texts=[query],
+                query_texts=queries,
                 n_results=limit,
-                where=where_clause if where_clause else None
+                where=where_clause
             )
             
-            # Format results
-            memories = []
-            for i, doc in enumerate(results["documents"][0]):
-                memories.append({
-                    "id": results["ids"][0][i],
-                    "content": doc,
-                    "metadata": results["metadatas"][0][i],
-                    "distance": results["distances"][0][i] if "distances" in results else 0.0
-                })
-            
-            return memories
+            return self._format_chroma_results(results, len(queries))
             
         except Exception as e:
             print(f"ChromaDB retrieval error: {e}")
-            return []
+            return [[] for _ in queries]
     
-    def _retrieve_faiss(self, query: str, limit: int, memory_type: Optional[str], min_importance: float) -> List[Dict[str, Any]]:
+    def _format_chroma_results(self, results: Dict[str, Any], num_queries: int) -> List[List[Dict[str, Any]]]:
+        """Format a ChromaDB query response into one memory list per query"""
+        all_documents = results["documents"]
+        all_ids = results["ids"]
+        all_metadatas = results["metadatas"]
+        all_distances = results.get("distances")
+        
+        all_memories = []
+        for q in range(num_queries):
+            documents = all_documents[q]
+            distances = all_distances[q] if all_distances else [0.0] * len(documents)
+            all_memories.append([
+                {"id": memory_id, "content": doc, "metadata": metadata, "distance": distance}
+                for memory_id, doc, metadata, distance in zip(all_ids[q], documents, all_metadatas[q], distances)
+            ])
+        
+        return all_memories
+    
+    def _retrieve_faiss(self, queries: List[str], limit: int, memory_type: Optional[str], min_importance: float) -> List[List[Dict[str, Any]]]:
         """Retrieve memories from FAISS"""
         try:
-            query_embedding = self._generate_embedding(query)
+            query_embeddings = self._embed_queries(queries)
             
-            # Search
-            distances, indices = self.index.search(np.array([query_embedding]), limit)
+            base_index = self._faiss_base_index()
+            if hasattr(base_index, "hnsw"):
+                base_index.hnsw.efSearch = max(self.faiss_ef_search, limit)
+            
+            # Search all queries at once
+            if len(self._pending):
+                scores, indices = self._search_pending(query_embeddings, limit)
+            else:
+                scores, indices = self.index.search(query_embeddings, limit)
             
             # Format results
-            memories = []
-            for i, idx in enumerate(indices[0]):
-                if idx < len(self.metadata["documents"]):
-                    memories.append({
-                        "id": self.metadata["ids"][idx],
-                        "content": self.metadata["documents"][idx],
-                        "metadata": {},
-                        "distance": distances[0][i]
-                    })
+            records = self.metadata["records"]
+            all_memories = []
+            for q in range(len(queries)):
+                memories = []
+                for i, faiss_id in enumerate(indices[q]):
+                    record = records.get(str(faiss_id))
+                    if record is not None:
+                        memories.append({
+                            "id": record["id"],
+                            "content": record["content"],
+                            "metadata": record["metadata"],
+                            "score": float(scores[q][i])
+                        })
+                all_memories.append(memories)
             
-            return memories
+            return all_memories
             
         except Exception as e:
             print(f"FAISS retrieval error: {e}")
-            return []
+            return [[] for _ in queries]
     
-    def _retrieve_pinecone(self, query: str, limit: int, memory_type: Optional[str], min_importance: float) -> List[Dict[str, Any]]:
+    def _search_pending(self, query_embeddings: np.ndarray, limit: int):
+        """Exact search over vectors buffered before PQ training, FAISS-style output"""
+        scores = query_embeddings @ self._pending.T
+        k = min(limit, len(self._pending))
+        
+        top_scores = np.full((len(query_embeddings), limit), -np.inf, dtype=np.float32)
+        top_indices = np.full((len(query_embeddings), limit), -1, dtype=np.int64)
+        for q, query_scores in enumerate(scores):
+            top = np.argpartition(-query_scores, k - 1)[:k]
+            top = top[np.argsort(-query_scores[top])]
+            top_scores[q, :k] = query_scores[top]
+            top_indices[q, :k] = self._pending_ids[top]
+        
+        return top_scores, top_indices
+    
+    def _retrieve_pinecone(self, queries: List[str], limit: int, memory_type: Optional[str], min_importance: float) -> List[List[Dict[str, Any]]]:
         """Retrieve memories from Pinecone"""
         try:
-            query_embedding = self._generate_embedding(query)
-            
-            # Build filter
-            filter_dict = {}
-            if memory_type:
-                filter_dict["type"] = memory_type
-            if min_importance > 0:
-                filter_dict["importance"] = {"$gte": min_importance}
-            
-            results = self.index.query(
-                vector=query_embedding,
-                top_k=limit,
-                filter=filter_dict if filter_dict else None,
-                include_metadata=True
-            )
+            query_embeddings = self._embed_queries(queries)
             
-            # Format results
-            memories = []
-            for match in results["matches"]:
-                memories.append({
-                    "id": match["id"],
-                    "content": match["metadata"].get("content", ""),
-                    "metadata": match["metadata"],
-                    "score": match["score"]
-                })
+            filter_dict = _metadata_filter(memory_type, min_importance)
+            
+            # Pinecone queries one vector per request; embeddings are still batched
+            all_memories = []
+            for query_embedding in query_embeddings:
+                results = self.index.query(
+                    vector=query_embedding.tolist(),
+                    top_k=limit,
+                    filter=filter_dict,
+                    include_metadata=True
+                )
+                
+                # Format results
+                memories = []
+                for match in results["matches"]:
+                    memories.append({
+                        "id": match["id"],
+                        "content": match["metadata"].get("content", ""),
+                        "metadata": match["metadata"],
+                        "score": match["score"]
+                    })
+                all_memories.append(memories)
             
-            return memories
+            return all_memories
             
         except Exception as e:
             print(f"Pinecone retrieval error: {e}")
-            return []
+            return [[] for _ in queries]
     
-    def _retrieve_memory_fallback(self, query: str, limit: int, memory_type: Optional[str], min_importance: float) -> List[Dict[str, Any]]:
+    def _retrieve_memory_fallback(self, queries: List[str], limit: int, memory_type: Optional[str], min_importance: float) -> List[List[Dict[str, Any]]]:
         """Retrieve memories from fallback storage"""
-        # Simple text matching for fallback
-        query_lower = query.lower()
-        matches = []
+        if self._n == 0 or limit <= 0:
+            return [[] for _ in queries]
+        
+        query_embeddings = self._embed_queries(queries)
+        n = self._n
+        k = min(limit, n)
+        
+        # Rows allowed by the type filter; importance is filtered on its own column
+        if memory_type:
+            allowed = np.fromiter(
+                (metadata.get("type") == memory_type for metadata in self.memory_store["metadata"]),
+                dtype=bool,
+                count=n
+            )
+        else:
+            allowed = np.ones(n, dtype=bool)
+        
+        importance_ok = self._importance[:n] >= min_importance
+        recency_weight = self.recency_weight
+        now_ts = time.time()
         
-        for i, doc in enumerate(self.memory_store["documents"]):
-            if query_lower in doc.lower():
-                matches.append({
+        # Only score documents sharing all query tokens; fall back to a full scan
+        all_candidates = [self._candidate_rows(query) for query in queries]
+        
+        # Queries that need a full scan are scored together with one matrix product
+        full_scan = [q for q, candidates in enumerate(all_candidates) if candidates is None]
+        full_scores = None
+        if not NUMBA_AVAILABLE and len(full_scan) > 1:
+            full_scores = self._emb[:n] @ query_embeddings[full_scan].T
+            full_column = {q: column for column, q in enumerate(full_scan)}
+        
+        results = []
+        for q, (candidates, query_embedding) in enumerate(zip(all_candidates, query_embeddings)):
+            if NUMBA_AVAILABLE:
+                query_allowed = allowed
+                if candidates is not None:
+                    query_allowed = np.zeros(n, dtype=bool)
+                    query_allowed[candidates] = allowed[candidates]
+                results.append(
+                    _topk_dot(self._emb[:n], query_embedding, self._importance[:n], query_allowed, min_importance,
+                              self._created_s[:n], now_ts, recency_weight, RECENCY_HALF_LIFE_S, k)
+                )
+            else:
+                rows = candidates if candidates is not None else np.arange(n)
+                if full_scores is not None and candidates is None:
+                    row_scores = full_scores[:, full_column[q]].copy()
+                else:
+                    row_scores = self._emb[rows] @ query_embedding
+                if recency_weight > 0:
+                    age = np.maximum(now_ts - self._created_s[rows], 0.0)
+                    row_scores += (recency_weight * np.exp2(-age / RECENCY_HALF_LIFE_S)).astype(np.float32)
+                row_scores[~(allowed[rows] & importance_ok[rows])] = -np.inf
+                
+                row_k = min(k, len(rows))
+                top = np.argpartition(-row_scores, row_k - 1)[:row_k]
+                top = top[np.argsort(-row_scores[top])]
+                results.append((rows[top], row_scores[top]))
+        
+        all_memories = []
+        for top_indices, top_scores in results:
+            all_memories.append([
+                {
                     "id": self.memory_store["ids"][i],
-                    "content": doc,
+                    "content": self.memory_store["documents"][i],
                     "metadata": self.memory_store["metadata"][i],
-                    "score": 1.0
-                })
+                    "score": float(score)
+                }
+                for i, score in zip(top_indices, top_scores) if score != -np.inf
+            ])
         
-        return matches[:limit]
+        return all_memories
+    
+    def _get_encoder(self) -> "SentenceTransformer":
+        """Load the sentence encoder once and cache it on the instance"""
+        if self._encoder is None:
+            if not SENTENCE_TRANSFORMERS_AVAILABLE:
+                raise ImportError("sentence-transformers not available. Install with: pip install sentence-transformers")
+            self._encoder = SentenceTransformer(self.embedding_model)
+        return self._encoder
     
-    def _generate_embedding(self, text: str) -> List[float]:
-        """Generate embedding for text (placeholder implementation)"""
-        # TODO: Implement actual embedding generation using sentence transformers
-        # For now, return a simple hash-based embedding
-        import hashlib
+    def _embed_queries(self, queries: List[str]) -> np.ndarray:
+        """Embed queries, reusing cached embeddings for repeated queries"""
+        digests = [hashlib.blake2b(query.encode(), digest_size=16).digest() for query in queries]
+        
+        # Encode all cache misses in a single batch
+        misses = [i for i, digest in enumerate(digests) if digest not in self._query_cache]
+        if misses:
+            encoded = self._generate_embeddings([queries[i] for i in misses])
+            for i, embedding in zip(misses, encoded):
+                embedding.flags.writeable = False
+                self._query_cache[digests[i]] = embedding
+        
+        embeddings = np.empty((len(queries), EMBEDDING_DIM), dtype=np.float32)
+        for i, digest in enumerate(digests):
+            self._query_cache.move_to_end(digest)
+            embeddings[i] = self._query_cache[digest]
+        
+        while len(self._query_cache) > QUERY_EMBEDDING_CACHE_SIZE:
+            self._query_cache.popitem(last=False)
+        
+        return embeddings
+    
+    def _generate_embedding(self, text: str) -> np.ndarray:
+        """Generate a normalized embedding for a single text"""
+        return self._generate_embeddings([text])[0]
+    
+    def _generate_embeddings(self, texts: List[str]) -> np.ndarray:
+        """
+        Generate normalized embeddings for a batch of texts
         
-        hash_obj = hashlib.md5(text.encode())
-        hash_hex = hash_obj.hexdigest()
+        Texts are sorted by length and encoded in mini-batches so that each
+        batch is only padded to its own longest text ("smart batching").
+        Every vector is unit-length, so stores and queries never re-normalize.
         
-        # Convert to pseudo-embedding (384 dimensions)
-        embedding = []
-        for i in range(0, len(hash_hex), 2):
-            val = int(hash_hex[i:i+2], 16) / 255.0
-            embedding.append(val)
+        Args:
+            texts: Texts to embed
+            
+        Returns:
+            float32 array of shape (len(texts), EMBEDDING_DIM), in input order
+        """
+        if not texts:
+            return np.empty((0, EMBEDDING_DIM), dtype=np.float32)
         
-        # Pad to 384 dimensions
-        while len(embedding) < 384:
-            embedding.append(0.0)
+        encoder = self._get_encoder()
         
-        return embedding[:384]
+        # Group texts of similar length together
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i].split()))
+        embeddings = np.empty((len(texts), EMBEDDING_DIM), dtype=np.float32)
+        
+        for start in range(0, len(order), EMBEDDING_BATCH_SIZE):
+            batch_indices = order[start:start + EMBEDDING_BATCH_SIZE]
+            batch_embeddings = encoder.encode(
+                [texts[i] for i in batch_indices],
+                batch_size=EMBEDDING_BATCH_SIZE,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                show_progress_bar=False
+            )
+            # Scatter back into original positions
+            embeddings[batch_indices] = batch_embeddings
+        
+        return embeddings
     
     def get_memory_stats(self) -> Dict[str, Any]:
         """Get statistics about stored memories"""
+        self.flush_writes()
         if self.vector_store_type == "chroma":
             try:
                 count = self.collection.count()
@@ -404,12 +1298,12 @@ class LongTermMemory:
                     "vector_store": "chroma",
                     "collection_name": self.collection_name
                 }
-            except:
+            except Exception:
                 return {"total_memories": 0, "vector_store": "chroma", "error": "Unable to get stats"}
         
         elif self.vector_store_type == "faiss":
             return {
-                "total_memories": self.index.ntotal if self.index else 0,
+                "total_memories": (self.index.ntotal + len(self._pending)) if self.index else 0,
                 "vector_store": "faiss",
                 "collection_name": self.collection_name
             }
@@ -422,7 +1316,7 @@ class LongTermMemory:
                     "vector_store": "pinecone",
                     "collection_name": self.collection_name
                 }
-            except:
+            except Exception:
                 return {"total_memories": 0, "vector_store": "pinecone", "error": "Unable to get stats"}
         
         else:
@@ -434,32 +1328,128 @@ class LongTermMemory:
     
     def clear_memories(self, memory_type: Optional[str] = None) -> int:
         """Clear memories, optionally filtered by type"""
-        # TODO: Implement memory clearing for each vector store type
         cleared_count = 0
+        self.flush_writes()
         
-        if self.vector_store_type == "memory":
-            if memory_type:
-                # Filter by type
-                indices_to_remove = []
-                for i, metadata in enumerate(self.memory_store["metadata"]):
-                    if metadata.get("type") == memory_type:
-                        indices_to_remove.append(i)
-                
-                # Remove in reverse order to maintain indices
-                for i in reversed(indices_to_remove):
-                    del self.memory_store["documents"][i]
-                    del self.memory_store["embeddings"][i]
-                    del self.memory_store["metadata"][i]
-                    del self.memory_store["ids"][i]
-                    cleared_count += 1
+        with self._store_lock:
+            if self.vector_store_type == "chroma":
+                cleared_count = self._clear_chroma(memory_type)
+            
+            elif self.vector_store_type == "faiss":
+                cleared_count = self._clear_faiss(memory_type)
+            
+            elif self.vector_store_type == "pinecone":
+                cleared_count = self._clear_pinecone(memory_type)
+            
+            elif self.vector_store_type == "memory":
+                if memory_type:
+                    # Keep rows of other types and compact the embedding matrix
+                    keep = [
+                        i for i, metadata in enumerate(self.memory_store["metadata"])
+                        if metadata.get("type") != memory_type
+                    ]
+                    cleared_count = self._n - len(keep)
+                    
+                    self._emb[:len(keep)] = self._emb[keep]
+                    self._importance[:len(keep)] = self._importance[keep]
+                    self._created_s[:len(keep)] = self._created_s[keep]
+                    self._n = len(keep)
+                    for key in ("documents", "metadata", "ids"):
+                        self.memory_store[key] = ChunkedList(self.memory_store[key][i] for i in keep)
+                    
+                    # Row ids shifted, so rebuild the inverted index
+                    self._postings = defaultdict(set)
+                    self._doc_lower = []
+                    self._index_documents(0, self.memory_store["documents"])
+                else:
+                    # Clear all
+                    cleared_count = self._n
+                    self._initialize_fallback()
+        
+        return cleared_count
+    
+    def _clear_chroma(self, memory_type: Optional[str]) -> int:
+        """Remove ChromaDB memories, optionally only those of one type"""
+        try:
+            ids = self.collection.get(where=_metadata_filter(memory_type, 0.0), include=[])["ids"]
+            if ids:
+                self.collection.delete(ids=ids)
+            return len(ids)
+        except Exception as e:
+            print(f"ChromaDB clear error: {e}")
+            return 0
+    
+    def _clear_pinecone(self, memory_type: Optional[str]) -> int:
+        """Remove Pinecone memories, optionally only those of one type"""
+        filter_dict = _metadata_filter(memory_type, 0.0)
+        try:
+            # Delete calls report nothing, so count the matching vectors first
+            cleared_count = self.index.describe_index_stats(filter=filter_dict).get("total_vector_count", 0)
+            if filter_dict:
+                self.index.delete(filter=filter_dict)
             else:
-                # Clear all
-                cleared_count = len(self.memory_store["documents"])
-                self.memory_store = {
-                    "documents": [],
-                    "embeddings": [],
-                    "metadata": [],
-                    "ids": []
-                }
+                self.index.delete(delete_all=True)
+            return cleared_count
+        except Exception as e:
+            print(f"Pinecone clear error: {e}")
+            return 0
+    
+    def _clear_faiss(self, memory_type: Optional[str]) -> int:
+        """Remove FAISS memories, optionally only those of one type"""
+        if self.read_only:
+            print("FAISS clear error: memory was opened read-only")
+            return 0
         
-        return cleared_count 
\ No newline at end of file
+        records = self.metadata["records"]
+        keys = [
+            key for key, record in records.items()
+            if not memory_type or record["metadata"].get("type") == memory_type
+        ]
+        if not keys:
+            return 0
+        
+        faiss_ids = np.array([int(key) for key in keys], dtype=np.int64)
+        
+        try:
+            if not memory_type:
+                self.index = self._create_faiss_index()
+            else:
+                self._remove_faiss_ids(faiss_ids)
+        except Exception as e:
+            print(f"FAISS clear error: {e}")
+            return 0
+        
+        # Drop the same ids from the PQ training buffer and raw copies
+        pending_keep = ~np.isin(self._pending_ids, faiss_ids)
+        self._pending = self._pending[pending_keep]
+        self._pending_ids = self._pending_ids[pending_keep]
+        if self._raw_chunks:
+            raw = np.vstack(self._raw_chunks)
+            raw_ids = np.concatenate(self._raw_id_chunks)
+            raw_keep = ~np.isin(raw_ids, faiss_ids)
+            self._raw_chunks = [raw[raw_keep]] if raw_keep.any() else []
+            self._raw_id_chunks = [raw_ids[raw_keep]] if raw_keep.any() else []
+        
+        for key in keys:
+            del records[key]
+        
+        self._dirty = True
+        self.flush()
+        return len(keys)
+    
+    def _remove_faiss_ids(self, faiss_ids: np.ndarray) -> None:
+        """Remove ids from the index, rebuilding it when the index type cannot remove"""
+        if not self.index.ntotal:
+            return
+        
+        try:
+            self.index.remove_ids(faiss.IDSelectorBatch(faiss_ids))
+        except RuntimeError:
+            # HNSW graphs do not support removal; re-add the surviving vectors
+            remaining_ids = faiss.vector_to_array(self.index.id_map)
+            remaining_ids = remaining_ids[~np.isin(remaining_ids, faiss_ids)]
+            rebuilt = self._create_faiss_index()
+            if len(remaining_ids):
+                vectors = np.vstack([self.index.reconstruct(int(faiss_id)) for faiss_id in remaining_ids])
+                rebuilt.add_with_ids(vectors, remaining_ids)
+            self.index = rebuilt 
\ No newline at end of file
@@ -4,20 +4,95 @@ Short-term Memory Module - Manages conversation buffer and recent interactions
 
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
+from dataclasses import dataclass
+from collections import Counter, defaultdict, deque
+from itertools import islice
 import json
+import re
+
+# Topic words: runs of four or more letters, minus common stop words
+_TOKEN_RE = re.compile(r"[a-z]{4,}")
+_COMMON_WORDS = frozenset({
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by',
+    'is', 'are', 'was', 'were', 'be', 'been', 'have', 'has', 'had', 'do', 'does', 'did',
+    'will', 'would', 'could', 'should', 'may', 'might', 'can', 'this', 'that', 'these',
+    'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they', 'me', 'him', 'her', 'us', 'them'
+})
+
+def _trigrams(text: str) -> set:
+    """Distinct three-character substrings of text"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+@dataclass
+class Message:
+    """A buffered message plus the values derived from it once on insert"""
+    __slots__ = ("role", "content", "timestamp", "id", "extra", "ts", "content_lower", "topics", "grams", "tokens", "seq")
+    
+    role: str
+    content: str
+    timestamp: str
+    id: str
+    extra: Dict[str, Any]
+    ts: datetime
+    content_lower: str
+    topics: Counter
+    grams: set
+    tokens: int
+    seq: int
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Public dict form, without the derived fields"""
+        return {"role": self.role, "content": self.content, **self.extra,
+                "timestamp": self.timestamp, "id": self.id}
+
+_MESSAGE_KEYS = frozenset({"role", "content", "timestamp", "id"})
+
+# Generated message ids; older ids look like msg_<n>_<timestamp>
+_MESSAGE_ID_RE = re.compile(r"msg_(\d+)")
+
+# Token budget policy: summarize once the buffer passes this share of the budget
+TOKEN_BUDGET_TRIGGER = 0.8
+
+def _estimate_tokens(text: str) -> int:
+    """Rough token count, about four characters per token"""
+    return (len(text) + 3) // 4
+
+# Upper-cased labels for the common roles in conversation context
+_ROLE_LABELS = {"user": "USER", "assistant": "ASSISTANT", "system": "SYSTEM"}
 
 class ShortTermMemory:
-    def __init__(self, max_messages: int = 20, max_age_hours: int = 24):
+    def __init__(self, max_messages: int = 20, max_age_hours: int = 24,
+                 token_budget: Optional[int] = None, keep_recent: int = 4):
         """
         Initialize short-term memory
         
         Args:
             max_messages: Maximum number of messages to keep in buffer
             max_age_hours: Maximum age of messages in hours before auto-cleanup
+            token_budget: Estimated token budget for the buffer; past 80% of it the
+                          older messages are folded into one summary message
+            keep_recent: Number of most recent messages always kept verbatim
         """
         self.max_messages = max_messages
         self.max_age_hours = max_age_hours
-        self.messages = []
+        self.token_budget = token_budget
+        self.keep_recent = keep_recent
+        # Bounded buffer of Message records: appending past max_messages evicts the oldest
+        self.messages: deque = deque(maxlen=max_messages)
+        # Running role counts and user/assistant messages in order, kept in step
+        # with self.messages by _track/_untrack
+        self._role_counts: Counter = Counter()
+        self._user_msgs: deque = deque()
+        self._assistant_msgs: deque = deque()
+        # Running totals of per-message topic word counts and estimated tokens
+        self._topic_counts: Counter = Counter()
+        self._total_tokens = 0
+        # Character trigram -> message sequence numbers, used to shortlist search candidates
+        self._gram_postings: Dict[str, set] = defaultdict(set)
+        self._msg_by_seq: Dict[int, Message] = {}
+        self._next_seq = 0
+        # Counter behind generated message ids
+        self._next_id = 0
         self.session_id = None
         self.created_at = datetime.now()
     
@@ -38,12 +113,19 @@ class ShortTermMemory:
         
         # Add message ID if not present
         if 'id' not in message:
-            message['id'] = f"msg_{len(self.messages)}_{datetime.now().timestamp()}"
+            message['id'] = f"msg_{self._next_id}"
+            self._next_id += 1
         
-        self.messages.append(message)
+        # Evict the oldest message ourselves so the running statistics stay in step
+        if self.messages and len(self.messages) >= self.max_messages:
+            self._untrack(self.messages.popleft())
         
-        # Auto-trim if necessary
-        self._auto_trim()
+        record = self._make_message(message)
+        self.messages.append(record)
+        self._track(record)
+        
+        if self.token_budget and self._total_tokens > TOKEN_BUDGET_TRIGGER * self.token_budget:
+            self._summarize_and_evict()
     
     def get_messages(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """
@@ -59,27 +141,30 @@ class ShortTermMemory:
         self._cleanup_old_messages()
         
         if limit is None:
-            return self.messages.copy()
+            return [msg.to_dict() for msg in self.messages]
         
-        return self.messages[-limit:] if limit > 0 else []
+        if limit <= 0:
+            return []
+        return [msg.to_dict() for msg in islice(self.messages, max(0, len(self.messages) - limit), None)]
     
-    def get_conversation_context(self) -> str:
+    def get_conversation_context(self, limit: Optional[int] = None) -> str:
         """
         Get conversation context as formatted string
         
+        Args:
+            limit: Only include this many of the most recent messages
+        
         Returns:
             Formatted conversation context
         """
-        context_parts = []
-        
-        for msg in self.messages:
-            role = msg.get('role', 'unknown')
-            content = msg.get('content', '')
-            timestamp = msg.get('timestamp', '')
-            
-            context_parts.append(f"[{role.upper()}] {content}")
-        
-        return "\n".join(context_parts)
+        messages = self.messages
+        if limit is not None:
+            messages = islice(messages, max(0, len(messages) - limit), None)
+        
+        return "\n".join(
+            f"[{_ROLE_LABELS.get(msg.role) or (msg.role or 'unknown').upper()}] {msg.content}"
+            for msg in messages
+        )
     
     def summarize_conversation(self) -> Dict[str, Any]:
         """
@@ -99,13 +184,13 @@ class ShortTermMemory:
             }
         
         # Count message types
-        user_messages = len([m for m in self.messages if m.get('role') == 'user'])
-        assistant_messages = len([m for m in self.messages if m.get('role') == 'assistant'])
-        system_messages = len([m for m in self.messages if m.get('role') == 'system'])
+        user_messages = self._role_counts['user']
+        assistant_messages = self._role_counts['assistant']
+        system_messages = self._role_counts['system']
         
         # Calculate time span
-        first_msg_time = self._parse_timestamp(self.messages[0].get('timestamp'))
-        last_msg_time = self._parse_timestamp(self.messages[-1].get('timestamp'))
+        first_msg_time = self.messages[0].ts
+        last_msg_time = self.messages[-1].ts
         time_span = self._calculate_time_span(first_msg_time, last_msg_time)
         
         # Extract key topics (simple keyword extraction)
@@ -128,7 +213,8 @@ class ShortTermMemory:
     
     def clear_memory(self) -> None:
         """Clear all messages from short-term memory"""
-        self.messages = []
+        self.messages.clear()
+        self._reset_tracking()
     
     def trim_to_limit(self, new_limit: int) -> List[Dict[str, Any]]:
         """
@@ -143,10 +229,12 @@ class ShortTermMemory:
         if new_limit >= len(self.messages):
             return []
         
-        removed_messages = self.messages[:-new_limit]
-        self.messages = self.messages[-new_limit:]
+        split = len(self.messages) - new_limit
+        removed_messages = [self.messages.popleft() for _ in range(split)]
+        for message in removed_messages:
+            self._untrack(message)
         
-        return removed_messages
+        return [msg.to_dict() for msg in removed_messages]
     
     def search_messages(self, query: str, limit: int = 5) -> List[Dict[str, Any]]:
         """
@@ -160,35 +248,40 @@ class ShortTermMemory:
             List of matching messages
         """
         query_lower = query.lower()
-        matching_messages = []
-        
-        for msg in self.messages:
-            content = msg.get('content', '').lower()
-            if query_lower in content:
-                matching_messages.append(msg)
+        candidates = self.messages
+        
+        # Any substring match contains every trigram of the query
+        if len(query_lower) >= 3:
+            postings = [self._gram_postings.get(gram) for gram in _trigrams(query_lower)]
+            if not all(postings):
+                return []
+            msg_by_seq = self._msg_by_seq
+            candidates = [msg_by_seq[seq] for seq in sorted(set.intersection(*sorted(postings, key=len)))]
+        
+        matching_messages = [
+            msg.to_dict() for msg in candidates
+            if query_lower in msg.content_lower
+        ]
         
         return matching_messages[-limit:] if limit > 0 else matching_messages
     
-    def _auto_trim(self) -> None:
-        """Automatically trim messages if over limit"""
-        if len(self.messages) > self.max_messages:
-            # Keep the most recent messages
-            self.messages = self.messages[-self.max_messages:]
-    
     def _cleanup_old_messages(self) -> None:
         """Remove messages older than max_age_hours"""
         cutoff_time = datetime.now() - timedelta(hours=self.max_age_hours)
         
-        self.messages = [
-            msg for msg in self.messages
-            if self._parse_timestamp(msg.get('timestamp')) > cutoff_time
-        ]
+        # Messages arrive in time order, so expired ones are all at the front
+        messages = self.messages
+        while messages and messages[0].ts <= cutoff_time:
+            self._untrack(messages.popleft())
     
     def _parse_timestamp(self, timestamp_str: str) -> datetime:
         """Parse timestamp string to datetime object"""
         try:
             if timestamp_str:
-                return datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
+                # Only a trailing 'Z' needs rewriting for fromisoformat before Python 3.11
+                if timestamp_str.endswith('Z'):
+                    timestamp_str = timestamp_str[:-1] + '+00:00'
+                return datetime.fromisoformat(timestamp_str)
             return datetime.now()
         except (ValueError, TypeError):
             return datetime.now()
@@ -214,37 +307,22 @@ class ShortTermMemory:
     def _extract_key_topics(self) -> List[str]:
         """Extract key topics from conversation (simple keyword extraction)"""
         # TODO: Implement more sophisticated topic extraction using NLP
-        all_text = " ".join([msg.get('content', '') for msg in self.messages])
-        
-        # Simple keyword extraction
-        common_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should', 'may', 'might', 'can', 'this', 'that', 'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they', 'me', 'him', 'her', 'us', 'them'}
-        
-        words = all_text.lower().split()
-        word_freq = {}
-        
-        for word in words:
-            word = word.strip('.,!?;:"()[]{}')
-            if len(word) > 3 and word not in common_words:
-                word_freq[word] = word_freq.get(word, 0) + 1
-        
-        # Get top 5 most frequent words
-        top_words = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)[:5]
-        return [word for word, freq in top_words]
+        # Get top 5 most frequent words from the running counts
+        return [word for word, freq in self._topic_counts.most_common(5)]
     
     def _generate_summary_text(self) -> str:
         """Generate a text summary of the conversation"""
         if not self.messages:
             return "No conversation history available."
         
-        user_messages = [m for m in self.messages if m.get('role') == 'user']
-        assistant_messages = [m for m in self.messages if m.get('role') == 'assistant']
+        user_messages = self._user_msgs
         
         if not user_messages:
             return "Conversation contains only system messages."
         
         # Get first and last user messages for context
-        first_user_msg = user_messages[0].get('content', '')[:100] + "..."
-        last_user_msg = user_messages[-1].get('content', '')[:100] + "..."
+        first_user_msg = user_messages[0].content[:100] + "..."
+        last_user_msg = user_messages[-1].content[:100] + "..."
         
         summary = f"Conversation started with: {first_user_msg}"
         if len(user_messages) > 1:
@@ -252,21 +330,161 @@ class ShortTermMemory:
         
         return summary
     
+    def _make_message(self, message: Dict[str, Any]) -> Message:
+        """Build a Message record, lowercasing and tokenizing the content once"""
+        content = message.get('content', '')
+        content_lower = content.lower()
+        timestamp = message.get('timestamp', '')
+        return Message(
+            role=message.get('role'),
+            content=content,
+            timestamp=timestamp,
+            id=message.get('id', ''),
+            extra={key: value for key, value in message.items() if key not in _MESSAGE_KEYS},
+            ts=self._parse_timestamp(timestamp),
+            content_lower=content_lower,
+            topics=Counter(word for word in _TOKEN_RE.findall(content_lower) if word not in _COMMON_WORDS),
+            grams=_trigrams(content_lower),
+            tokens=_estimate_tokens(content),
+            seq=-1
+        )
+    
+    def _track(self, message: Message, seq: Optional[int] = None) -> None:
+        """Update running statistics for a message entering the buffer (at the back, unless seq is given)"""
+        role = message.role
+        self._role_counts[role] += 1
+        if role == 'user':
+            self._user_msgs.append(message)
+        elif role == 'assistant':
+            self._assistant_msgs.append(message)
+        
+        self._topic_counts.update(message.topics)
+        self._total_tokens += message.tokens
+        
+        if seq is None:
+            seq = self._next_seq
+            self._next_seq += 1
+        message.seq = seq
+        for gram in message.grams:
+            self._gram_postings[gram].add(seq)
+        self._msg_by_seq[seq] = message
+    
+    def _untrack(self, message: Message) -> None:
+        """Update running statistics for a message leaving the front of the buffer"""
+        role = message.role
+        self._role_counts[role] -= 1
+        if role == 'user':
+            self._user_msgs.popleft()
+        elif role == 'assistant':
+            self._assistant_msgs.popleft()
+        
+        topic_counts = self._topic_counts
+        topic_counts.subtract(message.topics)
+        for word in message.topics:
+            if topic_counts[word] <= 0:
+                del topic_counts[word]
+        self._total_tokens -= message.tokens
+        
+        seq = message.seq
+        for gram in message.grams:
+            posting = self._gram_postings[gram]
+            posting.discard(seq)
+            if not posting:
+                del self._gram_postings[gram]
+        del self._msg_by_seq[seq]
+    
+    def _summarize_and_evict(self) -> None:
+        """Fold all but the most recent messages into a single system summary"""
+        count = len(self.messages) - self.keep_recent
+        if count < 2:
+            return
+        
+        evicted = [self.messages.popleft() for _ in range(count)]
+        for message in evicted:
+            self._untrack(message)
+        
+        # An earlier summary is always the oldest message; merge it instead of stacking summaries
+        previous = evicted[0].extra if 'summarized_messages' in evicted[0].extra else {}
+        folded = evicted[1:] if previous else evicted
+        
+        topics = Counter(previous.get('key_topics', {}))
+        for message in folded:
+            topics.update(message.topics)
+        key_topics = dict(topics.most_common(5))
+        summarized = previous.get('summarized_messages', 0) + len(folded)
+        
+        started_with = previous.get('started_with')
+        if started_with is None:
+            first_user = next((message for message in folded if message.role == 'user'), None)
+            if first_user is not None:
+                started_with = first_user.content[:100]
+        
+        summary = f"Summary of {summarized} earlier messages."
+        if started_with is not None:
+            summary += f" Started with: {started_with}..."
+        if key_topics:
+            summary += f" Key topics: {', '.join(key_topics)}."
+        
+        fields = {
+            'role': 'system',
+            'content': summary,
+            'timestamp': evicted[0].timestamp,
+            'id': f"msg_{self._next_id}",
+            'summarized_messages': summarized,
+            'key_topics': key_topics
+        }
+        if started_with is not None:
+            fields['started_with'] = started_with
+        self._next_id += 1
+        
+        # The summary takes the oldest timestamp and sequence number, so age-based
+        # cleanup and search results stay in buffer order
+        record = self._make_message(fields)
+        self.messages.appendleft(record)
+        self._track(record, seq=evicted[0].seq)
+    
+    def _reset_tracking(self) -> None:
+        """Recompute running statistics from the current buffer"""
+        self._role_counts = Counter()
+        self._user_msgs = deque()
+        self._assistant_msgs = deque()
+        self._topic_counts = Counter()
+        self._total_tokens = 0
+        self._gram_postings = defaultdict(set)
+        self._msg_by_seq = {}
+        for message in self.messages:
+            self._track(message)
+    
     def to_dict(self) -> Dict[str, Any]:
         """Export memory state to dictionary"""
         return {
-            "messages": self.messages,
+            "messages": [msg.to_dict() for msg in self.messages],
             "max_messages": self.max_messages,
             "max_age_hours": self.max_age_hours,
+            "token_budget": self.token_budget,
+            "keep_recent": self.keep_recent,
             "created_at": self.created_at.isoformat(),
             "session_id": self.session_id
         }
     
     def from_dict(self, data: Dict[str, Any]) -> None:
         """Import memory state from dictionary"""
-        self.messages = data.get("messages", [])
         self.max_messages = data.get("max_messages", 20)
+        self.messages = deque(
+            (self._make_message(msg) for msg in data.get("messages", [])),
+            maxlen=self.max_messages
+        )
+        self._reset_tracking()
+        
+        # Continue numbering after the highest imported message id
+        numbers = [
+            int(match.group(1)) for match in
+            (_MESSAGE_ID_RE.match(str(msg.id)) for msg in self.messages) if match
+        ]
+        self._next_id = max(numbers, default=-1) + 1
         self.max_age_hours = data.get("max_age_hours", 24)
+        self.token_budget = data.get("token_budget")
+        self.keep_recent = data.get("keep_recent", 4)
         self.session_id = data.get("session_id")
         
         created_at_str = data.get("created_at")
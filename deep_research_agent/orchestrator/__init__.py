@@ -5,7 +5,7 @@ Contains agent coordination and workflow management
 
 from .manager import AgentManager
 from .planner import PlannerAgent, BaseAgent
-from .researcher import ResearcherAgent
+from .researcher import ResearcherAgent, ResearchResult
 from .writer import WriterAgent
 
 __all__ = [
@@ -13,5 +13,6 @@ __all__ = [
     'BaseAgent', 
     'PlannerAgent',
     'ResearcherAgent',
+    'ResearchResult',
     'WriterAgent'
 ] 
\ No newline at end of file
@@ -4,37 +4,63 @@ Agent Manager - Coordinates the flow between Planner, Researcher, and Writer age
 
 from typing import Dict, List, Any
 import json
+import re
 from datetime import datetime
 import time
 
 # Import the new chain-of-thought logging system
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from utils.chain_of_thought import ChainOfThoughtLogger, LogLevel, ToolCall
+from utils.chain_of_thought import LogLevel, ToolCall, get_logger
+
+# Static parameters of the placeholder tool calls
+WEB_SEARCH_PARAMETERS = {"num_results": 10}
+ACADEMIC_SEARCH_PARAMETERS = {"max_results": 5}
+
+# Whitespace-separated words, counted without building a token list
+_WORD_RE = re.compile(r"\S+")
 
 class AgentManager:
     def __init__(self):
-        self.cot_logger = ChainOfThoughtLogger()
+        # Managers of concurrent sessions share the one logger that writes the log file
+        self.cot_logger = get_logger()
         self.current_topic = None
         self.research_plan = None
         self.research_data = {}
         self.final_report = None
-        self.session_id = self.cot_logger.start_new_session()
+        self._session_id = None
+    
+    @property
+    def session_id(self) -> str:
+        """This manager's logging session, created when first needed (e.g. the first logged step)"""
+        if self._session_id is None:
+            # Steps are filed under this session without switching the shared logger's
+            self._session_id = self.cot_logger.new_session_id()
+        return self._session_id
+    
+    # Level gates checked before building log_step arguments; read per call so a
+    # change to cot_logger.min_level takes effect immediately
+    @property
+    def _log_info(self) -> bool:
+        return self.cot_logger.enabled_for(LogLevel.INFO)
+    
+    @property
+    def _log_error(self) -> bool:
+        return self.cot_logger.enabled_for(LogLevel.ERROR)
     
     def start_research(self, topic: str) -> Dict[str, Any]:
         """Main orchestration method - coordinates all agents"""
         self.current_topic = topic
         
         # Log the start of research
-        self.cot_logger.log_step(
-            agent="Manager",
-            input_prompt=f"Starting research on topic: {topic}",
-            reasoning="Initiating research workflow with topic analysis",
-            decision="Begin with planning phase",
-            confidence=1.0,
-            level=LogLevel.INFO
-        )
+        if self._log_info:
+            self.cot_logger.log_step(
+                agent="Manager",
+                session_id=self.session_id,
+                input_prompt=f"Starting research on topic: {topic}",
+                reasoning="Initiating research workflow with topic analysis",
+                decision="Begin with planning phase",
+                confidence=1.0,
+                level=LogLevel.INFO
+            )
         
         try:
             # Step 1: Planning
@@ -47,15 +73,17 @@ class AgentManager:
             self.final_report = self._run_writer(self.research_data)
             
             # Log successful completion
-            self.cot_logger.log_step(
-                agent="Manager",
-                input_prompt="Research workflow completed",
-                reasoning="All phases completed successfully",
-                decision="Return results to user",
-                confidence=1.0,
-                level=LogLevel.INFO,
-                metadata={"topic": topic, "success": True}
-            )
+            if self._log_info:
+                self.cot_logger.log_step(
+                    agent="Manager",
+                    session_id=self.session_id,
+                    input_prompt="Research workflow completed",
+                    reasoning="All phases completed successfully",
+                    decision="Return results to user",
+                    confidence=1.0,
+                    level=LogLevel.INFO,
+                    metadata={"topic": topic, "success": True}
+                )
             
             return {
                 "success": True,
@@ -68,15 +96,17 @@ class AgentManager:
         
         except Exception as e:
             # Log error
-            self.cot_logger.log_step(
-                agent="Manager",
-                input_prompt=f"Error in research process: {str(e)}",
-                reasoning="Exception occurred during research workflow",
-                decision="Abort research and return error",
-                confidence=0.0,
-                level=LogLevel.ERROR,
-                metadata={"error": str(e), "topic": topic}
-            )
+            if self._log_error:
+                self.cot_logger.log_step(
+                    agent="Manager",
+                    session_id=self.session_id,
+                    input_prompt=f"Error in research process: {str(e)}",
+                    reasoning="Exception occurred during research workflow",
+                    decision="Abort research and return error",
+                    confidence=0.0,
+                    level=LogLevel.ERROR,
+                    metadata={"error": str(e), "topic": topic}
+                )
             
             return {
                 "success": False,
@@ -90,14 +120,16 @@ class AgentManager:
         start_time = time.time()
         
         # Log planner start
-        step_id = self.cot_logger.log_step(
-            agent="Planner",
-            input_prompt=f"Plan research for topic: {topic}",
-            reasoning="Analyzing topic to create structured research plan",
-            decision="Generate research sections and approaches",
-            confidence=0.9,
-            level=LogLevel.INFO
-        )
+        if self._log_info:
+            self.cot_logger.log_step(
+                agent="Planner",
+                session_id=self.session_id,
+                input_prompt=f"Plan research for topic: {topic}",
+                reasoning="Analyzing topic to create structured research plan",
+                decision="Generate research sections and approaches",
+                confidence=0.9,
+                level=LogLevel.INFO
+            )
         
         try:
             # Placeholder - will be implemented when planner.py is ready
@@ -110,19 +142,21 @@ class AgentManager:
             execution_time = time.time() - start_time
             
             # Log successful planning
-            self.cot_logger.log_step(
-                agent="Planner",
-                input_prompt=f"Planning completed for: {topic}",
-                reasoning=f"Generated {len(plan['sections'])} research sections with multiple approaches",
-                decision="Plan approved and ready for research phase",
-                confidence=0.95,
-                level=LogLevel.INFO,
-                metadata={
-                    "execution_time": execution_time,
-                    "sections_count": len(plan['sections']),
-                    "approaches": plan['research_approaches']
-                }
-            )
+            if self._log_info:
+                self.cot_logger.log_step(
+                    agent="Planner",
+                    session_id=self.session_id,
+                    input_prompt=f"Planning completed for: {topic}",
+                    reasoning=f"Generated {len(plan['sections'])} research sections with multiple approaches",
+                    decision="Plan approved and ready for research phase",
+                    confidence=0.95,
+                    level=LogLevel.INFO,
+                    metadata={
+                        "execution_time": execution_time,
+                        "sections_count": len(plan['sections']),
+                        "approaches": plan['research_approaches']
+                    }
+                )
             
             return plan
             
@@ -130,15 +164,17 @@ class AgentManager:
             execution_time = time.time() - start_time
             
             # Log planning error
-            self.cot_logger.log_step(
-                agent="Planner",
-                input_prompt=f"Planning failed for: {topic}",
-                reasoning=f"Error during planning: {str(e)}",
-                decision="Use fallback planning approach",
-                confidence=0.3,
-                level=LogLevel.ERROR,
-                metadata={"error": str(e), "execution_time": execution_time}
-            )
+            if self._log_error:
+                self.cot_logger.log_step(
+                    agent="Planner",
+                    session_id=self.session_id,
+                    input_prompt=f"Planning failed for: {topic}",
+                    reasoning=f"Error during planning: {str(e)}",
+                    decision="Use fallback planning approach",
+                    confidence=0.3,
+                    level=LogLevel.ERROR,
+                    metadata={"error": str(e), "execution_time": execution_time}
+                )
             
             # Return fallback plan
             return {
@@ -150,49 +186,51 @@ class AgentManager:
     def _run_researchers(self, plan: Dict[str, Any]) -> Dict[str, Any]:
         """Run researcher agents for each section with detailed logging"""
         data = {}
+        topic = self.current_topic
         
         for section in plan.get("sections", []):
             start_time = time.time()
             
             # Log research start for section
-            self.cot_logger.log_step(
-                agent="Researcher",
-                input_prompt=f"Research section: {section}",
-                reasoning=f"Gathering information for {section} using available tools",
-                decision="Execute search queries and collect data",
-                confidence=0.8,
-                level=LogLevel.INFO
-            )
+            if self._log_info:
+                self.cot_logger.log_step(
+                    agent="Researcher",
+                    session_id=self.session_id,
+                    input_prompt=f"Research section: {section}",
+                    reasoning=f"Gathering information for {section} using available tools",
+                    decision="Execute search queries and collect data",
+                    confidence=0.8,
+                    level=LogLevel.INFO
+                )
             
             try:
                 # Simulate tool calls
                 tool_calls = []
-                
-                # Simulate web search
-                web_start = time.time()
-                web_results = f"Web search results for {section}"
-                web_tool_call = ToolCall(
-                    tool_name="web_search",
-                    query=f"{section} {self.current_topic}",
-                    parameters={"num_results": 10},
-                    results=web_results,
-                    execution_time=time.time() - web_start,
-                    success=True
-                )
-                tool_calls.append(web_tool_call)
-                
-                # Simulate academic search
-                acad_start = time.time()
-                acad_results = f"Academic search results for {section}"
-                acad_tool_call = ToolCall(
-                    tool_name="academic_search",
-                    query=f"{section} {self.current_topic}",
-                    parameters={"max_results": 5},
-                    results=acad_results,
-                    execution_time=time.time() - acad_start,
-                    success=True
-                )
-                tool_calls.append(acad_tool_call)
+                # Tool call records are only built when the logger will keep them
+                if self._log_info:
+                    query = f"{section} {topic}"
+                    
+                    # Simulate web search
+                    web_start = time.time()
+                    tool_calls.append(ToolCall(
+                        tool_name="web_search",
+                        query=query,
+                        parameters=WEB_SEARCH_PARAMETERS,
+                        results=f"Web search results for {section}",
+                        execution_time=time.time() - web_start,
+                        success=True
+                    ))
+                    
+                    # Simulate academic search
+                    acad_start = time.time()
+                    tool_calls.append(ToolCall(
+                        tool_name="academic_search",
+                        query=query,
+                        parameters=ACADEMIC_SEARCH_PARAMETERS,
+                        results=f"Academic search results for {section}",
+                        execution_time=time.time() - acad_start,
+                        success=True
+                    ))
                 
                 # Compile section data
                 section_data = {
@@ -205,34 +243,38 @@ class AgentManager:
                 execution_time = time.time() - start_time
                 
                 # Log successful research
-                self.cot_logger.log_step(
-                    agent="Researcher",
-                    input_prompt=f"Research completed for: {section}",
-                    tool_calls=tool_calls,
-                    reasoning=f"Successfully collected data from {len(tool_calls)} sources",
-                    decision=f"Data quality sufficient for {section}",
-                    confidence=0.85,
-                    level=LogLevel.INFO,
-                    metadata={
-                        "execution_time": execution_time,
-                        "sources_count": len(section_data["sources"]),
-                        "section": section
-                    }
-                )
+                if self._log_info:
+                    self.cot_logger.log_step(
+                        agent="Researcher",
+                        session_id=self.session_id,
+                        input_prompt=f"Research completed for: {section}",
+                        tool_calls=tool_calls,
+                        reasoning=f"Successfully collected data from {len(tool_calls)} sources",
+                        decision=f"Data quality sufficient for {section}",
+                        confidence=0.85,
+                        level=LogLevel.INFO,
+                        metadata={
+                            "execution_time": execution_time,
+                            "sources_count": len(section_data["sources"]),
+                            "section": section
+                        }
+                    )
                 
             except Exception as e:
                 execution_time = time.time() - start_time
                 
                 # Log research error
-                self.cot_logger.log_step(
-                    agent="Researcher",
-                    input_prompt=f"Research failed for: {section}",
-                    reasoning=f"Error during research: {str(e)}",
-                    decision="Use fallback content for section",
-                    confidence=0.3,
-                    level=LogLevel.ERROR,
-                    metadata={"error": str(e), "execution_time": execution_time, "section": section}
-                )
+                if self._log_error:
+                    self.cot_logger.log_step(
+                        agent="Researcher",
+                        session_id=self.session_id,
+                        input_prompt=f"Research failed for: {section}",
+                        reasoning=f"Error during research: {str(e)}",
+                        decision="Use fallback content for section",
+                        confidence=0.3,
+                        level=LogLevel.ERROR,
+                        metadata={"error": str(e), "execution_time": execution_time, "section": section}
+                    )
                 
                 # Fallback data
                 data[section] = {
@@ -248,46 +290,54 @@ class AgentManager:
         start_time = time.time()
         
         # Log writer start
-        self.cot_logger.log_step(
-            agent="Writer",
-            input_prompt="Compile final report from research data",
-            reasoning=f"Structuring report from {len(data)} research sections",
-            decision="Generate comprehensive markdown report",
-            confidence=0.9,
-            level=LogLevel.INFO
-        )
+        if self._log_info:
+            self.cot_logger.log_step(
+                agent="Writer",
+                session_id=self.session_id,
+                input_prompt="Compile final report from research data",
+                reasoning=f"Structuring report from {len(data)} research sections",
+                decision="Generate comprehensive markdown report",
+                confidence=0.9,
+                level=LogLevel.INFO
+            )
         
         try:
-            # Generate report
-            report = f"# Research Report: {self.current_topic}\n\n"
-            report += f"*Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*\n\n"
+            # Generate report; parts are joined once at the end
+            parts = [
+                f"# Research Report: {self.current_topic}\n\n",
+                f"*Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*\n\n"
+            ]
             
             for section, content in data.items():
-                report += f"## {section}\n\n"
-                report += f"{content.get('content', 'No content available')}\n\n"
+                parts.append(f"## {section}\n\n")
+                parts.append(f"{content.get('content', 'No content available')}\n\n")
                 
                 if content.get('sources'):
-                    report += "### Sources:\n"
-                    for i, source in enumerate(content['sources'], 1):
-                        report += f"{i}. {source}\n"
-                    report += "\n"
+                    parts.append("### Sources:\n")
+                    parts.extend(f"{i}. {source}\n" for i, source in enumerate(content['sources'], 1))
+                    parts.append("\n")
+            
+            report = "".join(parts)
             
             execution_time = time.time() - start_time
             
-            # Log successful writing
-            self.cot_logger.log_step(
-                agent="Writer",
-                input_prompt="Report compilation completed",
-                reasoning=f"Generated {len(report.split())} word report with {len(data)} sections",
-                decision="Report quality meets standards",
-                confidence=0.95,
-                level=LogLevel.INFO,
-                metadata={
-                    "execution_time": execution_time,
-                    "word_count": len(report.split()),
-                    "sections_count": len(data)
-                }
-            )
+            # Log successful writing; the word count is only needed for the log
+            if self._log_info:
+                word_count = sum(1 for _ in _WORD_RE.finditer(report))
+                self.cot_logger.log_step(
+                    agent="Writer",
+                    session_id=self.session_id,
+                    input_prompt="Report compilation completed",
+                    reasoning=f"Generated {word_count} word report with {len(data)} sections",
+                    decision="Report quality meets standards",
+                    confidence=0.95,
+                    level=LogLevel.INFO,
+                    metadata={
+                        "execution_time": execution_time,
+                        "word_count": word_count,
+                        "sections_count": len(data)
+                    }
+                )
             
             return report
             
@@ -295,15 +345,17 @@ class AgentManager:
             execution_time = time.time() - start_time
             
             # Log writing error
-            self.cot_logger.log_step(
-                agent="Writer",
-                input_prompt="Report compilation failed",
-                reasoning=f"Error during writing: {str(e)}",
-                decision="Generate minimal fallback report",
-                confidence=0.2,
-                level=LogLevel.ERROR,
-                metadata={"error": str(e), "execution_time": execution_time}
-            )
+            if self._log_error:
+                self.cot_logger.log_step(
+                    agent="Writer",
+                    session_id=self.session_id,
+                    input_prompt="Report compilation failed",
+                    reasoning=f"Error during writing: {str(e)}",
+                    decision="Generate minimal fallback report",
+                    confidence=0.2,
+                    level=LogLevel.ERROR,
+                    metadata={"error": str(e), "execution_time": execution_time}
+                )
             
             # Fallback report
             return f"# Research Report: {self.current_topic}\n\nError generating full report: {str(e)}"
@@ -2,19 +2,83 @@
 Planner Agent - Analyzes research topics and creates structured research plans
 """
 
-from typing import Dict, List, Any
+import os
+import re
+import copy
+import json
+import numpy as np
+from typing import Dict, List, Any, Optional
 from abc import ABC, abstractmethod
 
+try:
+    from sentence_transformers import SentenceTransformer
+    SENTENCE_TRANSFORMERS_AVAILABLE = True
+except ImportError:
+    SENTENCE_TRANSFORMERS_AVAILABLE = False
+
+# Plan cache: topics whose embeddings are at least this similar share a plan.
+# It is in-memory unless a cache_path is given; PLAN_CACHE_PATH is the suggested
+# location (plans as JSON, topic embeddings in a .npy file beside it)
+PLAN_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".deep_research", "plan_cache.json")
+PLAN_CACHE_EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+PLAN_CACHE_SIMILARITY = 0.92
+# Bump when plan generation changes so persisted plans are discarded
+PLAN_CACHE_VERSION = 1
+
+# Sections every generated plan starts from
+DEFAULT_SECTIONS = ("Introduction", "Background", "Current State", "Analysis", "Conclusion")
+
+# Stored with a persisted cache; a cache written under any other schema is ignored
+_PLAN_CACHE_SCHEMA = {
+    "version": PLAN_CACHE_VERSION,
+    "embedding_model": PLAN_CACHE_EMBEDDING_MODEL,
+    "default_sections": list(DEFAULT_SECTIONS)
+}
+
+# Keys every valid research plan must contain
+_REQUIRED_PLAN_KEYS = frozenset({"topic", "sections", "research_approaches"})
+
+_PUNCTUATION_RE = re.compile(r"[^\w\s]")
+
+def _normalize_topic(topic: str) -> str:
+    """Lowercase a topic and strip punctuation and extra whitespace"""
+    return " ".join(_PUNCTUATION_RE.sub(" ", topic.lower()).split())
+
 class BaseAgent(ABC):
     """Base class for all agents"""
+    # Empty slots so subclasses that declare __slots__ carry no per-instance __dict__
+    __slots__ = ()
     
     @abstractmethod
     def execute(self, input_data: Any) -> Dict[str, Any]:
         pass
 
 class PlannerAgent(BaseAgent):
-    def __init__(self):
+    __slots__ = ("agent_name", "cache_path", "similarity_threshold",
+                 "_plan_cache", "_vector_topics", "_plan_vectors", "_encoder")
+    
+    def __init__(self,
+                 cache_path: Optional[str] = None,
+                 similarity_threshold: float = PLAN_CACHE_SIMILARITY):
+        """
+        Initialize the planner
+        
+        Args:
+            cache_path: File the plan cache is persisted to, e.g. PLAN_CACHE_PATH
+                        (None keeps it in memory)
+            similarity_threshold: Minimum cosine similarity for reusing a cached plan
+        """
         self.agent_name = "Planner"
+        self.cache_path = cache_path
+        self.similarity_threshold = similarity_threshold
+        
+        # Normalized topic -> plan, plus unit topic embeddings aligned with the
+        # normalized topics in _vector_topics
+        self._plan_cache: Dict[str, Dict[str, Any]] = {}
+        self._vector_topics: List[str] = []
+        self._plan_vectors: Optional[np.ndarray] = None
+        self._encoder = None
+        self._load_plan_cache()
     
     def execute(self, topic: str) -> Dict[str, Any]:
         """
@@ -26,6 +90,22 @@ class PlannerAgent(BaseAgent):
         Returns:
             Dict containing the research plan with sections and approaches
         """
+        normalized = _normalize_topic(topic)
+        # Exact topic matches skip the encoder entirely
+        cached = self._plan_cache.get(normalized)
+        vector = None
+        if cached is None:
+            vector = self._embed_topic(normalized)
+            cached = self._lookup_plan(vector)
+        if cached is not None:
+            plan = copy.deepcopy(cached)
+            plan["topic"] = topic
+            return {
+                "success": True,
+                "plan": plan,
+                "reasoning": f"Reused cached research plan for '{topic}' with {len(plan['sections'])} sections"
+            }
+        
         # TODO: Implement LLM-based planning logic
         # For now, return a basic structure
         
@@ -36,6 +116,7 @@ class PlannerAgent(BaseAgent):
             "estimated_time": "30 minutes",
             "priority_sources": ["web", "academic"]
         }
+        self._store_plan(normalized, vector, plan)
         
         return {
             "success": True,
@@ -43,10 +124,94 @@ class PlannerAgent(BaseAgent):
             "reasoning": f"Created research plan for '{topic}' with {len(plan['sections'])} sections"
         }
     
+    def _get_encoder(self):
+        """Load the topic encoder once, on first use"""
+        if self._encoder is None and SENTENCE_TRANSFORMERS_AVAILABLE:
+            try:
+                self._encoder = SentenceTransformer(PLAN_CACHE_EMBEDDING_MODEL)
+            except Exception as e:
+                print(f"Plan cache encoder error: {e}")
+        return self._encoder
+    
+    def _embed_topic(self, normalized: str) -> Optional[np.ndarray]:
+        """Unit-length topic embedding, or None when no encoder is available"""
+        encoder = self._get_encoder()
+        if encoder is None:
+            return None
+        return encoder.encode([normalized], normalize_embeddings=True)[0].astype(np.float32)
+    
+    def _lookup_plan(self, vector: Optional[np.ndarray]) -> Optional[Dict[str, Any]]:
+        """Find a cached plan for a semantically close topic"""
+        if vector is None or self._plan_vectors is None or not len(self._plan_vectors):
+            return None
+        
+        scores = self._plan_vectors @ vector
+        best = int(np.argmax(scores))
+        if scores[best] >= self.similarity_threshold:
+            return self._plan_cache[self._vector_topics[best]]
+        return None
+    
+    def _store_plan(self, normalized: str, vector: Optional[np.ndarray], plan: Dict[str, Any]) -> None:
+        """Add a plan to the cache and persist it"""
+        plan = copy.deepcopy(plan)
+        self._plan_cache[normalized] = plan
+        if vector is not None:
+            self._vector_topics.append(normalized)
+            vector = vector[None, :]
+            self._plan_vectors = vector if self._plan_vectors is None else np.vstack([self._plan_vectors, vector])
+        self._save_plan_cache()
+    
+    def _vectors_path(self) -> str:
+        """Path of the .npy file holding the cached topic embeddings"""
+        return os.path.splitext(self.cache_path)[0] + ".npy"
+    
+    def _load_plan_cache(self) -> None:
+        """Load a persisted plan cache, if any"""
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("schema") != _PLAN_CACHE_SCHEMA:
+                # Written by another version of the planner; start over
+                return
+            vectors = None
+            if data["vector_topics"]:
+                vectors = np.load(self._vectors_path(), allow_pickle=False)
+                if len(vectors) != len(data["vector_topics"]):
+                    raise ValueError("topic embeddings do not match the cached plans")
+            self._plan_cache = data["plans"]
+            self._vector_topics = data["vector_topics"]
+            self._plan_vectors = vectors
+        except Exception as e:
+            print(f"Plan cache load error: {e}")
+    
+    def _save_plan_cache(self) -> None:
+        """Persist the plan cache atomically"""
+        if not self.cache_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+            # Embeddings first, so the JSON never names topics missing from the .npy file
+            if self._plan_vectors is not None:
+                vectors_path = self._vectors_path()
+                with open(f"{vectors_path}.tmp", 'wb') as f:
+                    np.save(f, self._plan_vectors, allow_pickle=False)
+                os.replace(f"{vectors_path}.tmp", vectors_path)
+            with open(f"{self.cache_path}.tmp", 'w', encoding='utf-8') as f:
+                json.dump({
+                    "schema": _PLAN_CACHE_SCHEMA,
+                    "plans": self._plan_cache,
+                    "vector_topics": self._vector_topics
+                }, f)
+            os.replace(f"{self.cache_path}.tmp", self.cache_path)
+        except Exception as e:
+            print(f"Plan cache save error: {e}")
+    
     def _generate_sections(self, topic: str) -> List[str]:
         """Generate research sections based on topic"""
         # Basic section generation logic
-        base_sections = ["Introduction", "Background", "Current State", "Analysis", "Conclusion"]
+        base_sections = list(DEFAULT_SECTIONS)
         
         # TODO: Use LLM to generate topic-specific sections
         return base_sections
@@ -58,5 +223,4 @@ class PlannerAgent(BaseAgent):
     
     def validate_plan(self, plan: Dict[str, Any]) -> bool:
         """Validate if the research plan is comprehensive"""
-        required_keys = ["topic", "sections", "research_approaches"]
-        return all(key in plan for key in required_keys) 
\ No newline at end of file
+        return _REQUIRED_PLAN_KEYS <= plan.keys() 
\ No newline at end of file
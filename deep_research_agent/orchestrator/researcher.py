@@ -2,13 +2,71 @@
 Researcher Agent - Collects data from various sources based on research plan
 """
 
-from typing import Dict, List, Any
+import copy
+import time
+import asyncio
+import threading
+import numpy as np
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Any, Tuple
 from .planner import BaseAgent
 
+# Maximum number of tool calls in flight at once, to respect provider rate limits
+RESEARCH_MAX_CONCURRENCY = 8
+
+# Tool results are reused for repeated (tool, query) pairs until they expire
+TOOL_CACHE_SIZE = 1024
+TOOL_CACHE_TTL_S = 3600.0
+
+@dataclass
+class ResearchResult:
+    """Research data stored column-wise: entry i of every field belongs to section i"""
+    __slots__ = ("section_names", "contents", "sources", "confidences", "last_updated")
+    
+    section_names: List[str]
+    contents: List[str]
+    sources: List[List[str]]
+    confidences: np.ndarray   # float32
+    last_updated: np.ndarray  # int64 epoch seconds
+    
+    def __len__(self) -> int:
+        return len(self.section_names)
+    
+    def confident(self, threshold: float) -> np.ndarray:
+        """Boolean mask of sections whose confidence meets the threshold"""
+        return self.confidences >= threshold
+    
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        """Per-section dict layout used by the rest of the app"""
+        return {
+            name: {
+                "content": content,
+                "sources": sources,
+                "confidence": float(confidence),
+                "last_updated": int(updated)
+            }
+            for name, content, sources, confidence, updated in zip(
+                self.section_names, self.contents, self.sources,
+                self.confidences, self.last_updated
+            )
+        }
+
 class ResearcherAgent(BaseAgent):
-    def __init__(self):
+    __slots__ = ("agent_name", "available_tools", "max_concurrency",
+                 "tool_cache_ttl_s", "_tool_cache", "_tool_cache_lock")
+    
+    def __init__(self, max_concurrency: int = RESEARCH_MAX_CONCURRENCY,
+                 tool_cache_ttl_s: float = TOOL_CACHE_TTL_S):
         self.agent_name = "Researcher"
-        self.available_tools = ["web_search", "academic_search", "expert_analysis"]
+        self.available_tools = frozenset({"web_search", "academic_search", "expert_analysis"})
+        self.max_concurrency = max_concurrency
+        
+        # (tool, normalized query) -> (expiry time, result); tools run in worker threads
+        self.tool_cache_ttl_s = tool_cache_ttl_s
+        self._tool_cache: "OrderedDict[Tuple[str, str], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._tool_cache_lock = threading.Lock()
     
     def execute(self, research_plan: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -18,13 +76,52 @@ class ResearcherAgent(BaseAgent):
             research_plan: Plan from PlannerAgent containing sections and approaches
             
         Returns:
-            Dict containing collected research data for each section
+            Dict whose "data" is a ResearchResult with one entry per section
         """
-        research_data = {}
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.aexecute(research_plan))
         
-        for section in research_plan.get("sections", []):
-            section_data = self._research_section(section, research_plan)
-            research_data[section] = section_data
+        # Called from async code (or a notebook): asyncio.run cannot nest in the
+        # running loop, so run on a worker thread; async callers should await aexecute
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, self.aexecute(research_plan)).result()
+    
+    async def aexecute(self, research_plan: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Async version of execute; sections and their tool calls run concurrently
+        
+        Args:
+            research_plan: Plan from PlannerAgent containing sections and approaches
+            
+        Returns:
+            Dict whose "data" is a ResearchResult with one entry per section
+        """
+        sections = research_plan.get("sections", [])
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        # A failing section falls back instead of aborting the whole plan
+        results = await asyncio.gather(
+            *[self._research_section(section, research_plan, semaphore) for section in sections],
+            return_exceptions=True
+        )
+        
+        # Sections are appended column by column into a ResearchResult
+        contents = []
+        sources = []
+        confidences = np.empty(len(sections), dtype=np.float32)
+        last_updated = np.empty(len(sections), dtype=np.int64)
+        for i, (section, section_data) in enumerate(zip(sections, results)):
+            if isinstance(section_data, Exception):
+                print(f"Research error for {section}: {section_data}")
+                section_data = (f"Fallback content for {section}", [], 0.3, int(time.time()))
+            contents.append(section_data[0])
+            sources.append(section_data[1])
+            confidences[i] = section_data[2]
+            last_updated[i] = section_data[3]
+        
+        research_data = ResearchResult(list(sections), contents, sources, confidences, last_updated)
         
         return {
             "success": True,
@@ -33,27 +130,62 @@ class ResearcherAgent(BaseAgent):
             "reasoning": f"Collected data for {len(research_data)} sections"
         }
     
-    def _research_section(self, section: str, plan: Dict[str, Any]) -> Dict[str, Any]:
-        """Research a specific section using available tools"""
+    async def _research_section(self, section: str, plan: Dict[str, Any],
+                                semaphore: asyncio.Semaphore) -> Tuple[str, List[str], float, int]:
+        """Research a specific section; returns (content, sources, confidence, last_updated)"""
         # TODO: Implement actual research logic with tools
+        content = f"Research content for {section}"
+        sources = []
+        confidence = 0.8
         
-        section_data = {
-            "content": f"Research content for {section}",
-            "sources": [],
-            "confidence": 0.8,
-            "last_updated": "2024-01-01"
-        }
+        # Simulate tool usage based on research approaches; tools run concurrently.
+        # Each available approach runs once, in plan order so sources stay stable
+        available_tools = self.available_tools
+        approaches = [
+            approach for approach in dict.fromkeys(plan.get("research_approaches", ()))
+            if approach in available_tools
+        ]
+        tool_results = await asyncio.gather(
+            *[self._run_tool(approach, section, semaphore) for approach in approaches],
+            return_exceptions=True
+        )
         
-        # Simulate tool usage based on research approaches
-        for approach in plan.get("research_approaches", []):
-            if approach in self.available_tools:
-                tool_result = self._use_tool(approach, section)
-                section_data["sources"].extend(tool_result.get("sources", []))
+        for approach, tool_result in zip(approaches, tool_results):
+            if isinstance(tool_result, Exception):
+                print(f"{approach} error for {section}: {tool_result}")
+                continue
+            sources.extend(tool_result.get("sources", []))
         
-        return section_data
+        return content, sources, confidence, int(time.time())
+    
+    async def _run_tool(self, tool_name: str, query: str, semaphore: asyncio.Semaphore) -> Dict[str, Any]:
+        """Run a blocking tool call in a worker thread, bounded by the semaphore"""
+        async with semaphore:
+            return await asyncio.to_thread(self._use_tool, tool_name, query)
     
     def _use_tool(self, tool_name: str, query: str) -> Dict[str, Any]:
-        """Use a specific research tool"""
+        """Use a specific research tool, reusing a cached result for a repeated query"""
+        key = (tool_name, " ".join(query.lower().split()))
+        now = time.monotonic()
+        
+        with self._tool_cache_lock:
+            cached = self._tool_cache.get(key)
+            if cached is not None and cached[0] > now:
+                self._tool_cache.move_to_end(key)
+                return copy.deepcopy(cached[1])
+        
+        result = self._call_tool(tool_name, query)
+        
+        with self._tool_cache_lock:
+            self._tool_cache[key] = (now + self.tool_cache_ttl_s, result)
+            self._tool_cache.move_to_end(key)
+            while len(self._tool_cache) > TOOL_CACHE_SIZE:
+                self._tool_cache.popitem(last=False)
+        
+        return copy.deepcopy(result)
+    
+    def _call_tool(self, tool_name: str, query: str) -> Dict[str, Any]:
+        """Run a research tool without caching"""
         # TODO: Implement actual tool usage
         return {
             "tool": tool_name,
@@ -67,10 +199,12 @@ class ResearcherAgent(BaseAgent):
         # TODO: Track and return actual sources
         return ["web", "academic", "expert"]
     
-    def validate_research_quality(self, data: Dict[str, Any]) -> bool:
-        """Validate the quality of research data"""
+    def validate_research_quality(self, data) -> bool:
+        """Validate the quality of research data (a ResearchResult or per-section dict)"""
         # Check if all sections have content and sources
-        for section, content in data.items():
-            if not content.get("content") or not content.get("sources"):
-                return False
-        return True 
\ No newline at end of file
+        if isinstance(data, ResearchResult):
+            return all(data.contents) and all(data.sources)
+        return not any(
+            not content.get("content") or not content.get("sources")
+            for content in data.values()
+        ) 
\ No newline at end of file
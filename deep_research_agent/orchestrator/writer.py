@@ -2,29 +2,62 @@
 Writer Agent - Compiles research data into structured reports
 """
 
-from typing import Dict, List, Any
-from .planner import BaseAgent
+import re
+import numpy as np
+from functools import lru_cache
+from typing import Dict, List, Any, Union
+from datetime import datetime
+from .planner import BaseAgent, DEFAULT_SECTIONS
+from .researcher import ResearchResult
+
+# Whitespace-separated words, counted without building a token list
+_WORD_RE = re.compile(r"\S+")
+
+# Heading anchors drop punctuation and join words with hyphens
+_SLUG_RE = re.compile(r"[^\w\s-]")
+_WS_RE = re.compile(r"\s+")
+
+@lru_cache(maxsize=256)
+def _section_slug(section_name: str) -> str:
+    """Markdown anchor for a section heading"""
+    return _WS_RE.sub("-", _SLUG_RE.sub("", section_name.lower())).strip("-")
+
+# Table of contents for the planner's default section list, built once
+_DEFAULT_TOC = "".join(f"- [{name}](#{_section_slug(name)})\n" for name in DEFAULT_SECTIONS)
 
 class WriterAgent(BaseAgent):
+    __slots__ = ("agent_name", "report_formats")
+    
     def __init__(self):
         self.agent_name = "Writer"
         self.report_formats = ["markdown", "html", "pdf"]
     
-    def execute(self, research_data: Dict[str, Any]) -> Dict[str, Any]:
+    def execute(self, research_data: Union[ResearchResult, Dict[str, Any]],
+                topic: str = None, min_confidence: float = 0.0) -> Dict[str, Any]:
         """
         Compile research data into a structured report
         
         Args:
-            research_data: Data collected by ResearcherAgent
+            research_data: ResearchResult from ResearcherAgent, or per-section dict
+            topic: Report topic (defaults to research_data["topic"] for dict input)
+            min_confidence: Sections of a ResearchResult below this confidence are left out
             
         Returns:
             Dict containing the compiled report and metadata
         """
+        columnar = isinstance(research_data, ResearchResult)
+        
         # Extract topic from research data if available
-        topic = research_data.get("topic", "Research Topic")
+        if topic is None:
+            topic = "Research Topic"
+            if not columnar:
+                topic = research_data.get("topic", topic)
         
         # Generate report sections
-        report_sections = self._generate_report_sections(research_data)
+        if columnar:
+            report_sections = self._generate_result_sections(research_data, min_confidence)
+        else:
+            report_sections = self._generate_report_sections(research_data)
         
         # Compile final report
         final_report = self._compile_report(topic, report_sections)
@@ -33,7 +66,7 @@ class WriterAgent(BaseAgent):
             "success": True,
             "report": final_report,
             "format": "markdown",
-            "word_count": len(final_report.split()),
+            "word_count": sum(1 for _ in _WORD_RE.finditer(final_report)),
             "sections_count": len(report_sections),
             "reasoning": f"Compiled report with {len(report_sections)} sections"
         }
@@ -41,54 +74,78 @@ class WriterAgent(BaseAgent):
     def _generate_report_sections(self, data: Dict[str, Any]) -> Dict[str, str]:
         """Generate report sections from research data"""
         sections = {}
+        write_section = self._write_section
         
         # TODO: Implement LLM-based content generation
         for section_name, section_data in data.items():
             if isinstance(section_data, dict) and "content" in section_data:
-                sections[section_name] = self._write_section(section_name, section_data)
+                sections[section_name] = write_section(section_name, section_data)
             else:
                 # Handle simple string data
                 sections[section_name] = f"## {section_name}\n\n{section_data}\n"
         
         return sections
     
+    def _generate_result_sections(self, result: ResearchResult, min_confidence: float) -> Dict[str, str]:
+        """Generate report sections from columnar research data in one pass"""
+        names, contents, sources_list = result.section_names, result.contents, result.sources
+        if min_confidence > 0:
+            keep = np.flatnonzero(result.confident(min_confidence))
+            names = [names[i] for i in keep]
+            contents = [contents[i] for i in keep]
+            sources_list = [sources_list[i] for i in keep]
+        
+        return {
+            section_name: self._format_section(section_name, content, sources)
+            for section_name, content, sources in zip(names, contents, sources_list)
+        }
+    
     def _write_section(self, section_name: str, section_data: Dict[str, Any]) -> str:
         """Write a single section of the report"""
         # TODO: Use LLM to generate well-structured content
-        content = section_data.get("content", "No content available")
-        sources = section_data.get("sources", [])
-        
-        section_text = f"## {section_name}\n\n"
-        section_text += f"{content}\n\n"
+        return self._format_section(
+            section_name,
+            section_data.get("content", "No content available"),
+            section_data.get("sources", [])
+        )
+    
+    def _format_section(self, section_name: str, content: str, sources: List[str]) -> str:
+        """Format a section heading, its content and numbered sources"""
+        parts = [f"## {section_name}\n\n", f"{content}\n\n"]
         
         if sources:
-            section_text += "### Sources:\n"
-            for i, source in enumerate(sources, 1):
-                section_text += f"{i}. {source}\n"
-            section_text += "\n"
+            parts.append("### Sources:\n")
+            parts.extend(f"{i}. {source}\n" for i, source in enumerate(sources, 1))
+            parts.append("\n")
         
-        return section_text
+        return "".join(parts)
     
     def _compile_report(self, topic: str, sections: Dict[str, str]) -> str:
         """Compile all sections into final report"""
-        report = f"# Research Report: {topic}\n\n"
-        report += f"*Generated on: {self._get_current_date()}*\n\n"
-        
-        # Add table of contents
-        report += "## Table of Contents\n\n"
-        for section_name in sections.keys():
-            report += f"- [{section_name}](#{section_name.lower().replace(' ', '-')})\n"
-        report += "\n---\n\n"
+        parts = [
+            f"# Research Report: {topic}\n\n",
+            f"*Generated on: {self._get_current_date()}*\n\n",
+            # Add table of contents
+            "## Table of Contents\n\n"
+        ]
+        if tuple(sections) == DEFAULT_SECTIONS:
+            parts.append(_DEFAULT_TOC)
+        else:
+            parts.extend(
+                f"- [{section_name}](#{_section_slug(section_name)})\n"
+                for section_name in sections
+            )
+        parts.append("\n---\n\n")
         
         # Add all sections
         for section_content in sections.values():
-            report += section_content + "\n"
+            parts.append(section_content)
+            parts.append("\n")
         
-        return report
+        return "".join(parts)
     
     def _get_current_date(self) -> str:
         """Get current date for report metadata"""
-        from datetime import datetime
         return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     
     def validate_report(self, report: str) -> bool:
@@ -1,25 +1,67 @@
 import streamlit as st
-import json
-import time
+from collections import deque
+from itertools import islice
 from datetime import datetime
 from typing import Dict, Any, List
 
-# Import backend modules
-from orchestrator.manager import AgentManager
-from memory import MemoryManager
-from utils.chain_of_thought import LogLevel
+# Backend modules (numpy, vector stores, encoders) are imported on first use
+# so the page renders before they load
 
 st.set_page_config(page_title="Deep Research Agent", layout="wide")
 
-# Initialize session state
-if 'agent_manager' not in st.session_state:
-    st.session_state.agent_manager = AgentManager()
-if 'memory_manager' not in st.session_state:
-    st.session_state.memory_manager = MemoryManager()
+# Chat messages kept per session, and how many of the latest are shown
+CHAT_HISTORY_MAX = 200
+CHAT_DISPLAY_COUNT = 10
+
+_CHAT_ROLE_LABELS = {"user": "👤 You"}
+
+@st.cache_resource
+def get_long_term_memory():
+    """Vector store and encoder, created once and shared by all sessions"""
+    from memory import create_long_term_memory
+    return create_long_term_memory()
+
+@st.cache_data(ttl=30)
+def get_long_term_stats(_long_term) -> Dict[str, Any]:
+    """Long-term memory stats, refreshed at most every 30 seconds"""
+    return _long_term.get_memory_stats()
+
+@st.cache_data(ttl=60)
+def get_detailed_logs(_agent_manager, session_id: str, log_revision: int) -> List[Dict[str, Any]]:
+    """Detailed logs for a session, recomputed only when new entries arrive"""
+    return _agent_manager.get_detailed_logs()
+
+# Fragments rerun on their own widget events instead of the whole script
+# (Streamlit >= 1.37); older versions render them as plain functions
+FRAGMENTS_AVAILABLE = hasattr(st, "fragment")
+fragment = st.fragment if FRAGMENTS_AVAILABLE else (lambda func: func)
+
+def rerun_fragment():
+    """Rerun only the calling fragment when fragments are supported"""
+    if FRAGMENTS_AVAILABLE:
+        st.rerun(scope="fragment")
+    else:
+        st.rerun()
+
+def get_agent_manager():
+    """This session's agent manager, created on first use"""
+    if 'agent_manager' not in st.session_state:
+        from orchestrator.manager import AgentManager
+        st.session_state.agent_manager = AgentManager()
+    return st.session_state.agent_manager
+
+def get_memory_manager():
+    """This session's memory manager, created on first use"""
+    if 'memory_manager' not in st.session_state:
+        from memory import MemoryManager
+        st.session_state.memory_manager = MemoryManager(long_term=get_long_term_memory())
+    return st.session_state.memory_manager
+
+# Initialize session state; conversation state stays per session
 if 'research_results' not in st.session_state:
     st.session_state.research_results = None
 if 'chat_history' not in st.session_state:
-    st.session_state.chat_history = []
+    st.session_state.chat_history = deque(maxlen=CHAT_HISTORY_MAX)
 if 'research_in_progress' not in st.session_state:
     st.session_state.research_in_progress = False
 
@@ -52,13 +94,12 @@ with st.sidebar:
     # Memory controls
     st.subheader("🧠 Memory Controls")
     if st.button("Clear Short-term Memory"):
-        st.session_state.memory_manager.short_term.clear_memory()
+        get_memory_manager().short_term.clear_memory()
         st.success("Short-term memory cleared!")
     
     if st.button("Clear Session Logs"):
-        cleared = st.session_state.agent_manager.cot_logger.clear_logs(
-            st.session_state.agent_manager.session_id
-        )
+        agent_manager = get_agent_manager()
+        cleared = agent_manager.cot_logger.clear_logs(agent_manager.session_id)
         st.success(f"Cleared {cleared} log entries!")
     
     # Display API status
@@ -92,24 +133,27 @@ if start_btn and topic:
     st.session_state.research_in_progress = True
     st.session_state.research_results = None
     
+    # One timestamp for the request, shared by chat history and memory
+    now_iso = datetime.now().isoformat()
+    
     # Add to chat history
     st.session_state.chat_history.append({
         "role": "user",
         "content": f"Research topic: {topic}",
-        "timestamp": datetime.now().isoformat()
+        "timestamp": now_iso
     })
     
     # Add to memory
-    st.session_state.memory_manager.add_conversation_message({
+    get_memory_manager().add_conversation_message({
         "role": "user",
         "content": f"Research request: {topic}",
-        "timestamp": datetime.now().isoformat()
+        "timestamp": now_iso
     })
     
     # Start research
     with st.spinner("🔍 Conducting research... This may take a few minutes."):
         try:
-            results = st.session_state.agent_manager.start_research(topic)
+            results = get_agent_manager().start_research(topic)
             st.session_state.research_results = results
             
             # Add results to chat history
@@ -121,11 +165,12 @@ if start_btn and topic:
             
             # Store important findings in long-term memory
             if results.get('success'):
-                st.session_state.memory_manager.store_important_memory(
+                get_memory_manager().store_important_memory(
                     content=f"Research on {topic}: {results.get('report', '')[:500]}...",
                     metadata={"topic": topic, "session_id": results.get('session_id')},
                     importance=0.9
                 )
+                get_long_term_stats.clear()
             
         except Exception as e:
             st.error(f"Research failed: {str(e)}")
@@ -139,28 +184,23 @@ if start_btn and topic:
 
 st.markdown("---")
 
-# Layout: 3 columns for main panels
-col1, col2, col3 = st.columns([1, 2, 1])
-
-with col1:
+@fragment
+def chat_panel():
+    """Chat history and question input"""
     st.subheader("💬 Chat Panel")
     
     # Display chat history
     chat_container = st.container()
     with chat_container:
-        if st.session_state.chat_history:
-            for i, msg in enumerate(st.session_state.chat_history[-10:]):  # Show last 10 messages
-                role = msg.get('role', 'unknown')
-                content = msg.get('content', '')
-                timestamp = msg.get('timestamp', '')
-                
-                if role == 'user':
-                    st.markdown(f"**👤 You** ({timestamp[:16]})")
-                    st.markdown(f"> {content}")
-                else:
-                    st.markdown(f"**🤖 Agent** ({timestamp[:16]})")
-                    st.markdown(f"> {content}")
-                st.markdown("---")
+        chat_history = st.session_state.chat_history
+        if chat_history:
+            # Render the latest messages with a single markdown call
+            recent = islice(chat_history, max(len(chat_history) - CHAT_DISPLAY_COUNT, 0), None)
+            st.markdown("\n".join(
+                f"**{_CHAT_ROLE_LABELS.get(msg.get('role'), '🤖 Agent')}** ({msg.get('timestamp', '')[:16]})\n\n"
+                f"> {msg.get('content', '')}\n\n---\n"
+                for msg in recent
+            ))
         else:
             st.info("No conversation history yet. Start a research to begin!")
     
@@ -169,15 +209,17 @@ with col1:
                               placeholder="e.g., 'Can you explain the methodology?'")
     
     if user_input and st.session_state.research_results:
+        now_iso = datetime.now().isoformat()
+        
         # Add user message
         st.session_state.chat_history.append({
             "role": "user",
             "content": user_input,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": now_iso
         })
         
         # Get relevant context from memory
-        context = st.session_state.memory_manager.get_relevant_context(user_input)
+        context = get_memory_manager().get_relevant_context(user_input)
         
         # Simple response based on context
         response = f"Based on the research, here's what I found: {user_input}"
@@ -185,61 +227,14 @@ with col1:
         st.session_state.chat_history.append({
             "role": "assistant",
             "content": response,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": now_iso
         })
         
-        st.rerun()
+        rerun_fragment()
 
-with col2:
-    st.subheader("📊 Report Panel")
-    
-    if st.session_state.research_results:
-        results = st.session_state.research_results
-        
-        # Display success/failure status
-        if results.get('success'):
-            st.success("✅ Research completed successfully!")
-            
-            # Display research plan
-            if results.get('plan'):
-                with st.expander("📋 Research Plan"):
-                    plan = results['plan']
-                    st.write(f"**Sections:** {', '.join(plan.get('sections', []))}")
-                    st.write(f"**Approaches:** {', '.join(plan.get('research_approaches', []))}")
-                    st.write(f"**Estimated Time:** {plan.get('estimated_time', 'Unknown')}")
-            
-            # Display final report
-            if results.get('report'):
-                st.markdown("### 📄 Final Report")
-                st.markdown(results['report'])
-            
-            # Display research data summary
-            if results.get('data'):
-                with st.expander("🔍 Research Data Summary"):
-                    data = results['data']
-                    for section, content in data.items():
-                        st.write(f"**{section}:**")
-                        if isinstance(content, dict):
-                            st.write(f"- Content: {content.get('content', 'N/A')[:100]}...")
-                            st.write(f"- Sources: {len(content.get('sources', []))}")
-                            st.write(f"- Confidence: {content.get('confidence', 0):.2f}")
-                        else:
-                            st.write(f"- {str(content)[:100]}...")
-                        st.write("---")
-        else:
-            st.error("❌ Research failed!")
-            st.error(results.get('error', 'Unknown error'))
-    else:
-        st.info("📝 Research report will appear here after you start a research.")
-        st.markdown("""
-        **What you'll see here:**
-        - Research plan and sections
-        - Final compiled report
-        - Source summaries
-        - Data confidence scores
-        """)
-
-with col3:
+@fragment
+def cot_panel():
+    """Chain-of-thought summary and detailed logs"""
     st.subheader("🧠 Chain-of-Thought")
     
     if st.session_state.research_results:
@@ -274,20 +269,27 @@ with col3:
         
         # Detailed logs
         if st.button("📋 Show Detailed Logs"):
-            detailed_logs = st.session_state.agent_manager.get_detailed_logs()
+            agent_manager = get_agent_manager()
+            detailed_logs = get_detailed_logs(
+                agent_manager, agent_manager.session_id, agent_manager.cot_logger.revision
+            )
             
             for log in detailed_logs:
                 with st.expander(f"{log.get('agent')} - {log.get('timestamp', '')[:16]}"):
                     st.json(log)
     else:
         st.info("🤔 Agent reasoning will be shown here during research.")
-    
-    st.markdown("---")
+
+@fragment
+def memory_panel():
+    """Short-term summary and long-term memory search"""
     st.subheader("💾 Memory Panel")
     
+    memory_manager = get_memory_manager()
+    
     # Short-term memory
     with st.expander("📝 Short-term Memory"):
-        memory_summary = st.session_state.memory_manager.short_term.summarize_conversation()
+        memory_summary = memory_manager.short_term.summarize_conversation()
         st.write(f"**Total Messages:** {memory_summary.get('total_messages', 0)}")
         st.write(f"**Time Span:** {memory_summary.get('time_span', 'N/A')}")
         
@@ -296,7 +298,7 @@ with col3:
             st.write(f"**Key Topics:** {', '.join(key_topics)}")
         
         # Recent messages
-        recent_messages = st.session_state.memory_manager.short_term.get_messages(5)
+        recent_messages = memory_manager.short_term.get_messages(5)
         if recent_messages:
             st.write("**Recent Messages:**")
             for msg in recent_messages[-3:]:  # Show last 3
@@ -304,14 +306,16 @@ with col3:
     
     # Long-term memory
     with st.expander("🗄️ Long-term Memory"):
-        lt_stats = st.session_state.memory_manager.long_term.get_memory_stats()
+        # Store buffered memories so stats and search include them
+        memory_manager.sync()
+        lt_stats = get_long_term_stats(memory_manager.long_term)
         st.write(f"**Total Memories:** {lt_stats.get('total_memories', 0)}")
         st.write(f"**Vector Store:** {lt_stats.get('vector_store', 'Unknown')}")
         
         # Memory search
         search_query = st.text_input("Search memories:", placeholder="Enter search terms...")
         if search_query:
-            memories = st.session_state.memory_manager.long_term.retrieve_memories(search_query, limit=3)
+            memories = memory_manager.long_term.retrieve_memories(search_query, limit=3)
             if memories:
                 st.write("**Search Results:**")
                 for memory in memories:
@@ -319,6 +323,66 @@ with col3:
             else:
                 st.write("No matching memories found.")
 
+# Layout: 3 columns for main panels
+col1, col2, col3 = st.columns([1, 2, 1])
+
+with col1:
+    chat_panel()
+
+with col2:
+    st.subheader("📊 Report Panel")
+    
+    if st.session_state.research_results:
+        results = st.session_state.research_results
+        
+        # Display success/failure status
+        if results.get('success'):
+            st.success("✅ Research completed successfully!")
+            
+            # Display research plan
+            if results.get('plan'):
+                with st.expander("📋 Research Plan"):
+                    plan = results['plan']
+                    st.write(f"**Sections:** {', '.join(plan.get('sections', []))}")
+                    st.write(f"**Approaches:** {', '.join(plan.get('research_approaches', []))}")
+                    st.write(f"**Estimated Time:** {plan.get('estimated_time', 'Unknown')}")
+            
+            # Display final report
+            if results.get('report'):
+                st.markdown("### 📄 Final Report")
+                st.markdown(results['report'])
+            
+            # Display research data summary
+            if results.get('data'):
+                with st.expander("🔍 Research Data Summary"):
+                    data = results['data']
+                    for section, content in data.items():
+                        st.write(f"**{section}:**")
+                        if isinstance(content, dict):
+                            st.write(f"- Content: {content.get('content', 'N/A')[:100]}...")
+                            st.write(f"- Sources: {len(content.get('sources', []))}")
+                            st.write(f"- Confidence: {content.get('confidence', 0):.2f}")
+                        else:
+                            st.write(f"- {str(content)[:100]}...")
+                        st.write("---")
+        else:
+            st.error("❌ Research failed!")
+            st.error(results.get('error', 'Unknown error'))
+    else:
+        st.info("📝 Research report will appear here after you start a research.")
+        st.markdown("""
+        **What you'll see here:**
+        - Research plan and sections
+        - Final compiled report
+        - Source summaries
+        - Data confidence scores
+        """)
+
+with col3:
+    cot_panel()
+    st.markdown("---")
+    memory_panel()
+
 # Footer
 st.markdown("---")
 st.markdown("*Deep Research Agent - Powered by AI and Chain-of-Thought Reasoning*") 
\ No newline at end of file
@@ -0,0 +1,53 @@
+"""
+Shared helpers for the test suite: import path setup and offline stand-ins
+for the sentence encoder
+"""
+
+import os
+import sys
+import hashlib
+import numpy as np
+
+# Numba's TBB threading layer keeps the interpreter from exiting once a parallel
+# kernel has run on a non-main thread, as the concurrency tests do. Kernel
+# launches are serialized by the stores' locks, so the always-available
+# workqueue layer is safe here
+os.environ.setdefault("NUMBA_THREADING_LAYER", "workqueue")
+
+# Modules import each other as top-level packages (utils, memory, ...)
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PACKAGE_DIR not in sys.path:
+    sys.path.insert(0, PACKAGE_DIR)
+
+from memory.long_term import EMBEDDING_DIM, LongTermMemory
+
+class FakeEncoder:
+    """Deterministic SentenceTransformer stand-in: equal texts get equal vectors"""
+    
+    def __init__(self):
+        self.calls = 0
+    
+    def encode(self, texts, batch_size=32, convert_to_numpy=True,
+               normalize_embeddings=False, show_progress_bar=False):
+        self.calls += 1
+        vectors = np.empty((len(texts), EMBEDDING_DIM), dtype=np.float32)
+        for i, text in enumerate(texts):
+            seed = int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), "little")
+            vectors[i] = np.random.default_rng(seed).standard_normal(EMBEDDING_DIM)
+        if normalize_embeddings:
+            vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors
+
+class OfflineMemory(LongTermMemory):
+    """LongTermMemory that embeds with a FakeEncoder instead of downloading a model"""
+    
+    def _get_encoder(self):
+        if self._encoder is None:
+            self._encoder = FakeEncoder()
+        return self._encoder
+
+class FallbackMemory(OfflineMemory):
+    """OfflineMemory on the in-memory fallback store"""
+    
+    def _initialize_vector_store(self) -> None:
+        self._initialize_fallback()
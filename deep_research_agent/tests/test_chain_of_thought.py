@@ -0,0 +1,172 @@
+"""
+Tests for ChainOfThoughtLogger: the background writer, compaction, legacy log
+migration, concurrent logging and topic searches
+"""
+
+import io
+import json
+import os
+import tempfile
+import threading
+import unittest
+from contextlib import redirect_stderr
+from datetime import datetime
+from unittest import mock
+
+import support  # noqa: F401  (import path setup)
+
+from utils import chain_of_thought
+from utils.chain_of_thought import ChainOfThoughtLogger, get_logger
+
+def _read_lines(log_file):
+    with open(log_file) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+class LoggerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.log_file = os.path.join(tempfile.mkdtemp(), "logs", "cot.jsonl")
+    
+    def open(self, **kwargs):
+        logger = ChainOfThoughtLogger(self.log_file, **kwargs)
+        self.addCleanup(logger.close)
+        return logger
+
+class WriterTest(LoggerTestCase):
+    def test_entries_are_appended_as_json_lines(self):
+        logger = self.open()
+        step_ids = [logger.log_step("researcher", f"prompt {i}") for i in range(3)]
+        
+        logger.flush()
+        
+        self.assertEqual([line["step_id"] for line in _read_lines(self.log_file)], step_ids)
+    
+    def test_writer_survives_an_unserializable_entry(self):
+        logger = self.open()
+        with redirect_stderr(io.StringIO()) as stderr:
+            logger.log_step("researcher", "bad", metadata={"handle": object()})
+            logger.flush()
+        good = logger.log_step("researcher", "good")
+        
+        logger.flush()
+        
+        self.assertIn("Error saving logs", stderr.getvalue())
+        self.assertTrue(logger._writer.is_alive())
+        self.assertEqual([line["step_id"] for line in _read_lines(self.log_file)], [good])
+        # Drop the unserializable entry so close() can compact the file
+        logger.clear_logs()
+    
+    def test_logging_after_close_writes_directly(self):
+        logger = self.open()
+        logger.close()
+        
+        step_id = logger.log_step("researcher", "after close")
+        
+        self.assertEqual(_read_lines(self.log_file)[-1]["step_id"], step_id)
+    
+    def test_concurrent_logging(self):
+        logger = self.open(max_entries=10000)
+        
+        def worker(n):
+            for i in range(200):
+                logger.log_step(f"agent_{n}", f"prompt {i}")
+        
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        logger.flush()
+        
+        self.assertEqual(logger.revision, 800)
+        self.assertEqual(len(logger.entries), 800)
+        self.assertEqual(len(_read_lines(self.log_file)), 800)
+        self.assertEqual(len(logger.get_entries("agent_2")), 200)
+
+class PersistenceTest(LoggerTestCase):
+    def test_compaction_keeps_only_the_kept_entries(self):
+        logger = self.open(max_entries=5)
+        step_ids = [logger.log_step("researcher", f"prompt {i}") for i in range(8)]
+        
+        logger.compact()
+        
+        self.assertEqual([line["step_id"] for line in _read_lines(self.log_file)], step_ids[-5:])
+    
+    def test_reload_restores_entries_and_indexes(self):
+        logger = self.open()
+        session_id = logger.new_session_id()
+        logger.log_step("planner", "plan", session_id=session_id)
+        logger.log_step("researcher", "research")
+        logger.close()
+        
+        reloaded = self.open()
+        
+        self.assertEqual([e.agent for e in reloaded.entries], ["planner", "researcher"])
+        self.assertEqual([e.input_prompt for e in reloaded.get_session_entries(session_id)], ["plan"])
+    
+    def test_legacy_json_log_is_migrated(self):
+        source = self.open()
+        source.log_step("planner", "legacy prompt")
+        entries = [entry.to_dict() for entry in source.entries]
+        source.clear_logs()
+        source.close()
+        os.remove(self.log_file)
+        legacy_file = os.path.splitext(self.log_file)[0] + ".json"
+        with open(legacy_file, "w") as f:
+            json.dump({"entries": entries}, f, indent=2)
+        
+        logger = self.open()
+        
+        self.assertFalse(os.path.exists(legacy_file))
+        self.assertEqual([e.input_prompt for e in logger.entries], ["legacy prompt"])
+        self.assertEqual([line["input_prompt"] for line in _read_lines(self.log_file)], ["legacy prompt"])
+    
+    def test_clear_session_keeps_other_sessions(self):
+        logger = self.open()
+        session_id = logger.new_session_id()
+        logger.log_step("planner", "dropped", session_id=session_id)
+        logger.log_step("planner", "kept")
+        
+        self.assertEqual(logger.clear_logs(session_id), 1)
+        
+        self.assertEqual([e.input_prompt for e in logger.get_entries("planner")], ["kept"])
+        self.assertEqual([line["input_prompt"] for line in _read_lines(self.log_file)], ["kept"])
+    
+    def test_get_logger_shares_one_logger_per_file(self):
+        logger = get_logger(self.log_file)
+        self.addCleanup(chain_of_thought._loggers.pop, os.path.abspath(self.log_file))
+        self.addCleanup(logger.close)
+        
+        self.assertIs(get_logger(os.path.join(os.path.dirname(self.log_file), ".", "cot.jsonl")), logger)
+
+class SearchTest(LoggerTestCase):
+    def setUp(self):
+        super().setUp()
+        self.logger = self.open()
+        self.logger.log_step("researcher", "Quantum computing overview", decision="search arxiv")
+        self.logger.log_step("writer", "draft", reasoning="cover QUANTUM error correction")
+        self.logger.log_step("writer", "draft", reasoning="protein folding")
+    
+    def test_topic_search_matches_prompt_decision_and_reasoning(self):
+        chain = self.logger.get_reasoning_chain("quantum")
+        
+        self.assertEqual([e.agent for e in chain], ["researcher", "writer"])
+    
+    @unittest.skipUnless(chain_of_thought.NUMBA_AVAILABLE, "numba is not installed")
+    def test_compiled_scan_matches_the_python_scan(self):
+        expected = self.logger.get_reasoning_chain("quantum")
+        
+        with mock.patch.object(chain_of_thought, "REASONING_SCAN_NUMBA_MIN", 0):
+            self.assertEqual(self.logger.get_reasoning_chain("quantum"), expected)
+            self.assertEqual(self.logger.get_reasoning_chain("arxiv"), expected[:1])
+            self.assertEqual(self.logger.get_reasoning_chain("absent"), [])
+    
+    def test_timestamps_match_datetime(self):
+        timestamp_ns = 1_700_000_000_123_456_789
+        
+        for ns in (timestamp_ns, timestamp_ns + 500_000_000, timestamp_ns + 1_000_000_000):
+            second, remainder_ns = divmod(ns, 1_000_000_000)
+            expected = datetime.fromtimestamp(second).replace(microsecond=remainder_ns // 1000)
+            self.assertEqual(self.logger._isoformat_ns(ns), expected.isoformat(timespec="microseconds"))
+
+if __name__ == "__main__":
+    unittest.main()
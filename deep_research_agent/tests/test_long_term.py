@@ -0,0 +1,174 @@
+"""
+Tests for LongTermMemory: FAISS persistence and quantization, legacy index
+migration, write-behind flushing, the fallback store and concurrent access
+"""
+
+import json
+import tempfile
+import threading
+import unittest
+import numpy as np
+
+from support import FallbackMemory, OfflineMemory
+
+from memory.long_term import EMBEDDING_DIM, FAISS_AVAILABLE
+
+if FAISS_AVAILABLE:
+    import faiss
+
+def _items(contents, memory_type="research"):
+    return [{"content": content, "memory_type": memory_type} for content in contents]
+
+class EmbeddingTest(unittest.TestCase):
+    def test_embeddings_are_unit_length_in_input_order(self):
+        memory = FallbackMemory(persist_directory=tempfile.mkdtemp())
+        texts = ["a much longer text than the others here", "short", "medium length text"]
+        
+        embeddings = memory._generate_embeddings(texts)
+        
+        self.assertEqual(embeddings.shape, (3, EMBEDDING_DIM))
+        np.testing.assert_allclose(np.linalg.norm(embeddings, axis=1), 1.0, atol=1e-5)
+        np.testing.assert_array_equal(embeddings[1], memory._generate_embeddings(["short"])[0])
+    
+    def test_repeated_queries_reuse_cached_embeddings(self):
+        memory = FallbackMemory(persist_directory=tempfile.mkdtemp())
+        memory._embed_queries(["alpha", "beta"])
+        calls = memory._get_encoder().calls
+        
+        memory._embed_queries(["beta", "alpha"])
+        
+        self.assertEqual(memory._get_encoder().calls, calls)
+
+class FallbackStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.memory = FallbackMemory(persist_directory=tempfile.mkdtemp())
+    
+    def test_store_and_retrieve(self):
+        ids = self.memory.store_memories_batch(_items(["quantum computing basics", "protein folding"]))
+        
+        results = self.memory.retrieve_memories("protein folding", limit=1)
+        
+        self.assertEqual([result["id"] for result in results], [ids[1]])
+    
+    def test_clear_by_type_rebuilds_the_inverted_index(self):
+        self.memory.store_memories_batch(_items(["alpha beta"], "a") + _items(["beta gamma"], "b"))
+        
+        self.assertEqual(self.memory.clear_memories("a"), 1)
+        
+        self.assertEqual(dict(self.memory._postings), {"beta": {0}, "gamma": {0}})
+        self.assertEqual(self.memory._doc_lower, ["beta gamma"])
+        self.assertEqual(self.memory.get_memory_stats()["total_memories"], 1)
+    
+    def test_reserved_ids_are_kept(self):
+        reserved = self.memory.new_memory_ids(2)
+        items = [{"id": memory_id, "content": f"memory {i}"} for i, memory_id in enumerate(reserved)]
+        
+        self.assertEqual(self.memory.store_memories_batch(items), reserved)
+        self.assertEqual(list(self.memory.memory_store["ids"]), reserved)
+    
+    def test_concurrent_stores_and_searches(self):
+        errors = []
+        
+        def worker(n):
+            try:
+                for i in range(20):
+                    self.memory.store_memory(f"worker {n} memory {i}")
+                    self.memory.retrieve_memories(f"worker {n} memory {i}", limit=3)
+            except Exception as e:
+                errors.append(e)
+        
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(errors, [])
+        self.assertEqual(self.memory._n, 120)
+        self.assertEqual(len(self.memory.memory_store["ids"]), 120)
+        self.assertEqual(len(set(self.memory.memory_store["ids"])), 120)
+
+class WriteBehindTest(unittest.TestCase):
+    def test_queued_memories_are_visible_to_searches(self):
+        memory = FallbackMemory(persist_directory=tempfile.mkdtemp(), write_behind=True,
+                                flush_threshold=1000, flush_interval_s=3600)
+        memory_id = memory.store_memory("queued memory about tides")
+        
+        results = memory.retrieve_memories("queued memory about tides", limit=1)
+        
+        self.assertEqual(results[0]["id"], memory_id)
+    
+    def test_flush_writes_drains_every_bucket(self):
+        memory = FallbackMemory(persist_directory=tempfile.mkdtemp(), write_behind=True,
+                                flush_threshold=1000, flush_interval_s=3600)
+        memory.store_memories_batch(_items(["one", "two"], "a") + _items(["three"], "b"))
+        self.assertEqual(memory._n, 0)
+        
+        memory.flush_writes()
+        
+        self.assertEqual(memory._n, 3)
+        self.assertFalse(memory._write_buckets)
+
+@unittest.skipUnless(FAISS_AVAILABLE, "faiss is not installed")
+class FaissTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+    
+    def open(self, **kwargs):
+        return OfflineMemory("faiss", "test", self.directory, **kwargs)
+    
+    def test_flush_and_reload(self):
+        memory = self.open()
+        ids = memory.store_memories_batch(_items(["first memory", "second memory"]))
+        memory.flush()
+        
+        reloaded = self.open()
+        
+        self.assertEqual(reloaded.get_memory_stats()["total_memories"], 2)
+        self.assertEqual(reloaded.retrieve_memories("second memory", limit=1)[0]["id"], ids[1])
+    
+    def test_sq8_store_retrieve_and_reload(self):
+        memory = self.open(quantization="sq8")
+        ids = memory.store_memories_batch(_items([f"sq8 memory {i}" for i in range(10)]))
+        memory.flush()
+        
+        reloaded = self.open(quantization="sq8")
+        
+        self.assertEqual(reloaded.index.ntotal, 10)
+        self.assertEqual(reloaded.retrieve_memories("sq8 memory 7", limit=1)[0]["id"], ids[7])
+    
+    def test_pq_buffers_untrained_vectors_across_reloads(self):
+        memory = self.open(quantization="pq")
+        ids = memory.store_memories_batch(_items(["pq memory one", "pq memory two"]))
+        self.assertFalse(memory.index.is_trained)
+        memory.flush()
+        
+        reloaded = self.open(quantization="pq")
+        
+        self.assertEqual(len(reloaded._pending), 2)
+        self.assertEqual(reloaded.retrieve_memories("pq memory two", limit=1)[0]["id"], ids[1])
+    
+    def test_clear_by_type(self):
+        memory = self.open()
+        memory.store_memories_batch(_items(["keep me"], "a") + _items(["drop me", "drop me too"], "b"))
+        
+        self.assertEqual(memory.clear_memories("b"), 2)
+        
+        self.assertEqual(memory.index.ntotal, 1)
+        self.assertEqual(memory.retrieve_memories("keep me", limit=3)[0]["content"], "keep me")
+    
+    def test_legacy_index_is_migrated_by_re_embedding(self):
+        legacy = faiss.IndexFlatL2(EMBEDDING_DIM)
+        legacy.add(np.ones((2, EMBEDDING_DIM), dtype=np.float32))
+        faiss.write_index(legacy, f"{self.directory}/test.index")
+        with open(f"{self.directory}/test_metadata.json", "w") as f:
+            json.dump({"documents": ["legacy alpha", "legacy beta"], "ids": ["old_a", "old_b"]}, f)
+        
+        memory = self.open()
+        
+        self.assertIn("records", memory.metadata)
+        self.assertEqual(memory.index.ntotal, 2)
+        self.assertEqual(memory.retrieve_memories("legacy beta", limit=1)[0]["id"], "old_b")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+"""
+Tests for MemoryManager: single and bulk important-memory stores, queue flushing
+"""
+
+import asyncio
+import tempfile
+import unittest
+
+from support import FallbackMemory
+
+from memory import MemoryManager
+
+class MemoryManagerTest(unittest.TestCase):
+    def setUp(self):
+        self.long_term = FallbackMemory(persist_directory=tempfile.mkdtemp())
+        self.manager = MemoryManager(long_term=self.long_term, batch_size=3)
+    
+    def stored_ids(self):
+        return list(self.long_term.memory_store["ids"])
+    
+    def test_single_memory_is_stored_immediately(self):
+        memory_id = self.manager.store_important_memory("single finding")
+        
+        self.assertIsInstance(memory_id, str)
+        self.assertEqual(self.stored_ids(), [memory_id])
+    
+    def test_shared_store_sees_single_memories_from_other_managers(self):
+        other = MemoryManager(long_term=self.long_term)
+        memory_id = self.manager.store_important_memory("shared finding")
+        
+        results = other.get_relevant_context("shared finding", include_short_term=False)["long_term"]
+        
+        self.assertEqual(results[0]["id"], memory_id)
+    
+    def test_bulk_memories_are_queued_until_the_batch_fills(self):
+        first = self.manager.store_important_memory(["one", "two"])
+        self.assertEqual(self.stored_ids(), [])
+        
+        second = self.manager.store_important_memory(["three"])
+        
+        self.assertEqual(self.stored_ids(), first + second)
+    
+    def test_single_store_keeps_queued_memories_first(self):
+        queued = self.manager.store_important_memory(["queued"])
+        single = self.manager.store_important_memory("single")
+        
+        self.assertEqual(self.stored_ids(), queued + [single])
+    
+    def test_close_stores_pending_memories(self):
+        ids = self.manager.store_important_memory(["pending"])
+        
+        self.manager.close()
+        
+        self.assertEqual(self.stored_ids(), ids)
+    
+    def test_async_context_lookup_flushes_the_queue(self):
+        ids = self.manager.store_important_memory(["async pending"])
+        
+        context = asyncio.run(self.manager.aget_relevant_context("async pending", include_short_term=False))
+        
+        self.assertEqual(context["long_term"][0]["id"], ids[0])
+
+if __name__ == "__main__":
+    unittest.main()
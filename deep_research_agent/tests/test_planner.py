@@ -0,0 +1,85 @@
+"""
+Tests for PlannerAgent's plan cache: exact and semantic reuse, opt-in
+persistence and schema checks
+"""
+
+import json
+import os
+import tempfile
+import unittest
+
+from support import FakeEncoder
+
+from orchestrator import planner
+from orchestrator.planner import PlannerAgent
+
+class OfflinePlanner(PlannerAgent):
+    """PlannerAgent that embeds topics with a FakeEncoder"""
+    
+    def _get_encoder(self):
+        if self._encoder is None:
+            self._encoder = FakeEncoder()
+        return self._encoder
+
+class PlanCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache_path = os.path.join(self.directory, "cache", "plans.json")
+    
+    def test_cache_is_in_memory_by_default(self):
+        agent = OfflinePlanner()
+        agent.execute("Quantum computing")
+        
+        self.assertIsNone(agent.cache_path)
+        self.assertEqual(os.listdir(self.directory), [])
+    
+    def test_exact_topics_skip_the_encoder(self):
+        agent = OfflinePlanner()
+        agent.execute("Quantum computing")
+        calls = agent._get_encoder().calls
+        
+        result = agent.execute("quantum   computing?")
+        
+        self.assertEqual(agent._get_encoder().calls, calls)
+        self.assertTrue(result["reasoning"].startswith("Reused cached research plan"))
+        self.assertEqual(result["plan"]["topic"], "quantum   computing?")
+    
+    def test_similar_topics_share_a_plan(self):
+        agent = OfflinePlanner(similarity_threshold=-1.0)
+        agent.execute("Quantum computing")
+        
+        result = agent.execute("Protein folding")
+        
+        self.assertTrue(result["reasoning"].startswith("Reused cached research plan"))
+    
+    def test_returned_plans_do_not_alias_the_cache(self):
+        agent = OfflinePlanner()
+        agent.execute("Quantum computing")["plan"]["sections"].append("Mutated")
+        
+        self.assertNotIn("Mutated", agent.execute("Quantum computing")["plan"]["sections"])
+    
+    def test_persisted_cache_round_trip(self):
+        OfflinePlanner(cache_path=self.cache_path).execute("Quantum computing")
+        
+        reloaded = OfflinePlanner(cache_path=self.cache_path)
+        
+        self.assertTrue(os.path.exists(os.path.splitext(self.cache_path)[0] + ".npy"))
+        self.assertEqual(reloaded._vector_topics, ["quantum computing"])
+        self.assertEqual(reloaded._plan_vectors.shape[0], 1)
+        self.assertTrue(reloaded.execute("Quantum Computing")["reasoning"].startswith("Reused"))
+    
+    def test_cache_from_another_schema_is_ignored(self):
+        OfflinePlanner(cache_path=self.cache_path).execute("Quantum computing")
+        with open(self.cache_path) as f:
+            data = json.load(f)
+        data["schema"] = {**data["schema"], "version": planner.PLAN_CACHE_VERSION + 1}
+        with open(self.cache_path, "w") as f:
+            json.dump(data, f)
+        
+        reloaded = OfflinePlanner(cache_path=self.cache_path)
+        
+        self.assertEqual(reloaded._plan_cache, {})
+        self.assertIsNone(reloaded._plan_vectors)
+
+if __name__ == "__main__":
+    unittest.main()
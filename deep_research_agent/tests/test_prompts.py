@@ -0,0 +1,88 @@
+"""
+Tests for PromptManager: compiled and partial renderers, the prompt cache and
+template validation
+"""
+
+import unittest
+
+import support  # noqa: F401  (import path setup)
+
+from utils.prompts import PromptManager, PromptTemplate, PromptType, TemplateNotFoundError
+
+def _values(template):
+    return {name: f"<{name}>" for name in template.variables}
+
+class RenderTest(unittest.TestCase):
+    def setUp(self):
+        self.manager = PromptManager()
+    
+    def test_compiled_renderers_match_generate_prompt(self):
+        for name in self.manager.list_templates():
+            values = _values(self.manager.templates[name])
+            expected = self.manager.generate_prompt(name, **values)
+            
+            with self.subTest(template=name):
+                self.assertEqual(self.manager.compile(name)(**values), expected)
+                self.assertEqual("".join(self.manager.generate_prompt_parts(name, **values)), expected)
+    
+    def test_partial_renderers_match_generate_prompt(self):
+        for name in self.manager.list_templates():
+            values = _values(self.manager.templates[name])
+            fixed_name = self.manager.templates[name].variables[0]
+            rest = {key: value for key, value in values.items() if key != fixed_name}
+            
+            render = self.manager.partial(name, **{fixed_name: values[fixed_name]})
+            
+            with self.subTest(template=name):
+                self.assertEqual(render(**rest), self.manager.generate_prompt(name, **values))
+    
+    def test_repeated_prompts_are_served_from_the_cache(self):
+        values = _values(self.manager.templates["research_planner"])
+        self.manager.generate_prompt("research_planner", **values)
+        
+        self.manager.generate_prompt("research_planner", **values)
+        
+        self.assertEqual(self.manager.cache_info().hits, 1)
+    
+    def test_unhashable_values_bypass_the_cache(self):
+        values = {**_values(self.manager.templates["research_planner"]), "sources": ["web", "arxiv"]}
+        
+        prompt = self.manager.generate_prompt("research_planner", **values)
+        
+        self.assertIn("['web', 'arxiv']", prompt)
+        self.assertEqual(self.manager.cache_info().currsize, 0)
+    
+    def test_replacing_a_template_clears_cached_prompts(self):
+        values = _values(self.manager.templates["research_planner"])
+        self.manager.generate_prompt("research_planner", **values)
+        custom = PromptTemplate("research_planner", PromptType.PLANNER, "Plan {topic}", ["topic"], "custom")
+        
+        self.manager.add_custom_template(custom)
+        
+        self.assertEqual(self.manager.generate_prompt("research_planner", **values), "Plan <topic>")
+
+class ValidationTest(unittest.TestCase):
+    def setUp(self):
+        self.manager = PromptManager()
+    
+    def test_missing_variables_raise(self):
+        with self.assertRaisesRegex(ValueError, "'depth'"):
+            self.manager.compile("research_planner")(topic="AI")
+    
+    def test_unknown_template_raises(self):
+        with self.assertRaises(TemplateNotFoundError):
+            self.manager.generate_prompt("missing")
+        self.assertIsNone(self.manager.get_template("missing"))
+    
+    def test_template_fields_must_match_variables(self):
+        with self.assertRaises(ValueError):
+            PromptTemplate("bad", PromptType.WRITER, "Write about {topic} for {audience}", ["topic"], "bad")
+    
+    def test_templates_are_hashable(self):
+        template = PromptTemplate("t", PromptType.WRITER, "{a} {{literal}}", ["a"], "t")
+        
+        self.assertEqual(len({template, PromptTemplate("t", PromptType.WRITER, "{a} {{literal}}", ("a",), "t")}), 1)
+        self.assertEqual(template.render({"a": "x"}), "x {literal}")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+"""
+Tests for ResearcherAgent: the column-wise ResearchResult, running inside an
+event loop and the tool-result cache
+"""
+
+import asyncio
+import unittest
+import numpy as np
+
+import support  # noqa: F401  (import path setup)
+
+from orchestrator.researcher import ResearcherAgent, ResearchResult
+
+PLAN = {
+    "topic": "Quantum computing",
+    "sections": ["Introduction", "Analysis"],
+    "research_approaches": ["web_search", "academic_search", "web_search", "unknown"]
+}
+
+class CountingResearcher(ResearcherAgent):
+    """ResearcherAgent that counts the uncached tool calls it makes"""
+    
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.tool_calls = []
+    
+    def _call_tool(self, tool_name, query):
+        self.tool_calls.append((tool_name, query))
+        return super()._call_tool(tool_name, query)
+
+class ResearchResultTest(unittest.TestCase):
+    def setUp(self):
+        self.result = ResearchResult(
+            ["Introduction", "Analysis"], ["intro", "analysis"], [["web"], []],
+            np.array([0.9, 0.4], dtype=np.float32), np.array([100, 200], dtype=np.int64)
+        )
+    
+    def test_confident_mask(self):
+        np.testing.assert_array_equal(self.result.confident(0.5), [True, False])
+    
+    def test_to_dict_uses_plain_python_values(self):
+        data = self.result.to_dict()
+        
+        self.assertEqual(list(data), ["Introduction", "Analysis"])
+        self.assertEqual(data["Analysis"]["content"], "analysis")
+        self.assertAlmostEqual(data["Analysis"]["confidence"], 0.4, places=6)
+        self.assertIs(type(data["Analysis"]["confidence"]), float)
+        self.assertIs(type(data["Analysis"]["last_updated"]), int)
+    
+    def test_quality_check_needs_content_and_sources(self):
+        self.assertFalse(ResearcherAgent().validate_research_quality(self.result))
+
+class ExecuteTest(unittest.TestCase):
+    def test_execute_collects_every_section(self):
+        result = ResearcherAgent().execute(PLAN)
+        data = result["data"]
+        
+        self.assertEqual(data.section_names, PLAN["sections"])
+        self.assertEqual(data.sources[0], ["source_from_web_search", "source_from_academic_search"])
+        self.assertEqual(data.confidences.dtype, np.float32)
+    
+    def test_execute_inside_a_running_event_loop(self):
+        async def run():
+            return ResearcherAgent().execute(PLAN)
+        
+        result = asyncio.run(run())
+        
+        self.assertEqual(len(result["data"]), 2)
+
+class ToolCacheTest(unittest.TestCase):
+    def test_repeated_queries_reuse_results(self):
+        agent = CountingResearcher()
+        first = agent._use_tool("web_search", "Quantum  Computing")
+        first["sources"].append("mutated")
+        
+        second = agent._use_tool("web_search", "quantum computing")
+        
+        self.assertEqual(len(agent.tool_calls), 1)
+        self.assertEqual(second["sources"], ["source_from_web_search"])
+    
+    def test_expired_results_are_fetched_again(self):
+        agent = CountingResearcher(tool_cache_ttl_s=0)
+        agent._use_tool("web_search", "quantum computing")
+        
+        agent._use_tool("web_search", "quantum computing")
+        
+        self.assertEqual(len(agent.tool_calls), 2)
+    
+    def test_each_approach_runs_once_per_section(self):
+        agent = CountingResearcher()
+        
+        agent.execute(PLAN)
+        
+        self.assertEqual(sorted(agent.tool_calls), sorted(
+            (tool, section) for tool in ("web_search", "academic_search") for section in PLAN["sections"]
+        ))
+
+if __name__ == "__main__":
+    unittest.main()
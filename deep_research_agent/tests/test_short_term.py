@@ -0,0 +1,82 @@
+"""
+Tests for ShortTermMemory: trigram search, token-budget summaries and running statistics
+"""
+
+import unittest
+
+import support  # noqa: F401  (import path setup)
+
+from memory.short_term import ShortTermMemory
+
+def _tracking_state(memory):
+    """Running statistics that must match a rebuild from the buffer"""
+    return (
+        +memory._role_counts,
+        memory._total_tokens,
+        +memory._topic_counts,
+        list(memory._user_msgs),
+        list(memory._assistant_msgs),
+        # Sequence numbers are renumbered by a rebuild, so compare the messages they name
+        {gram: {memory._msg_by_seq[seq].id for seq in seqs} for gram, seqs in memory._gram_postings.items()},
+    )
+
+def _rebuilt_state(memory):
+    memory._reset_tracking()
+    return _tracking_state(memory)
+
+class SearchTest(unittest.TestCase):
+    def setUp(self):
+        self.memory = ShortTermMemory(max_messages=5)
+        for text in ["Quantum computing", "protein folding", "quantum error correction"]:
+            self.memory.add_message({"role": "user", "content": text})
+    
+    def test_substring_search_in_buffer_order(self):
+        results = self.memory.search_messages("QUANTUM")
+        
+        self.assertEqual([r["content"] for r in results], ["Quantum computing", "quantum error correction"])
+    
+    def test_short_queries_scan_the_buffer(self):
+        self.assertEqual(len(self.memory.search_messages("o")), 3)
+    
+    def test_evicted_messages_leave_the_index(self):
+        for i in range(5):
+            self.memory.add_message({"role": "assistant", "content": f"filler {i}"})
+        
+        self.assertEqual(self.memory.search_messages("quantum"), [])
+        self.assertEqual(_tracking_state(self.memory), _rebuilt_state(self.memory))
+
+class SummaryTest(unittest.TestCase):
+    def setUp(self):
+        self.memory = ShortTermMemory(max_messages=100, token_budget=200, keep_recent=3)
+        for i in range(40):
+            self.memory.add_message({
+                "role": "user" if i % 2 == 0 else "assistant",
+                "content": f"message {i} about quantum physics experiments " * 2
+            })
+    
+    def summaries(self):
+        return [message for message in self.memory.messages if message.role == "system"]
+    
+    def test_repeated_summaries_are_merged(self):
+        summaries = self.summaries()
+        
+        self.assertEqual(len(summaries), 1)
+        self.assertIs(self.memory.messages[0], summaries[0])
+        self.assertEqual(summaries[0].extra["summarized_messages"] + len(self.memory.messages) - 1, 40)
+        self.assertIn("Started with: message 0", summaries[0].content)
+    
+    def test_running_statistics_match_a_rebuild(self):
+        state = _tracking_state(self.memory)
+        seqs = [message.seq for message in self.memory.messages]
+        
+        self.assertEqual(seqs, sorted(seqs))
+        self.assertEqual(state, _rebuilt_state(self.memory))
+    
+    def test_round_trip_through_dict(self):
+        restored = ShortTermMemory()
+        restored.from_dict(self.memory.to_dict())
+        
+        self.assertEqual(restored.get_messages(), self.memory.get_messages())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,160 @@
+"""
+Tests for the search tools: the shared search cache, ResultSet columns, ArXiv
+parsing and web search error responses
+"""
+
+import asyncio
+import json
+import unittest
+from unittest import mock
+
+import support  # noqa: F401  (import path setup)
+
+from tools.acad_search import AcademicSearchTool, ResultSet
+from tools.search_cache import SearchCache, cached_search
+from tools.web_search import WebSearchTool
+
+ARXIV_FEED = b"""<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <entry>
+    <id>http://arxiv.org/abs/1234.5678</id>
+    <published>2024-01-02T00:00:00Z</published>
+    <title>Quantum error correction</title>
+    <summary>Surface codes.</summary>
+    <author><name>Ada Lovelace</name></author>
+    <author><name>Alan Turing</name></author>
+  </entry>
+  <entry>
+    <title>Untitled preprint</title>
+  </entry>
+</feed>"""
+
+class CountingSearch:
+    """Tool with sync and async searches sharing one cache namespace"""
+    
+    def __init__(self, cache):
+        self.search_cache = cache
+        self.calls = 0
+        self.success = True
+    
+    @cached_search("counting")
+    def search(self, query, max_results=10):
+        self.calls += 1
+        return {"success": self.success, "query": query, "results": [{"title": query}]}
+    
+    @cached_search("counting")
+    async def asearch(self, query, max_results=10):
+        self.calls += 1
+        return {"success": self.success, "query": query, "results": [{"title": query}]}
+
+class SearchCacheTest(unittest.TestCase):
+    def test_positional_keyword_and_async_calls_share_entries(self):
+        tool = CountingSearch(SearchCache())
+        tool.search("quantum")
+        
+        tool.search(query="quantum", max_results=10)
+        asyncio.run(tool.asearch("quantum"))
+        
+        self.assertEqual(tool.calls, 1)
+    
+    def test_failures_are_not_cached(self):
+        tool = CountingSearch(SearchCache())
+        tool.success = False
+        tool.search("quantum")
+        
+        tool.search("quantum")
+        
+        self.assertEqual(tool.calls, 2)
+    
+    def test_cached_responses_are_copies(self):
+        tool = CountingSearch(SearchCache())
+        tool.search("quantum")["results"].clear()
+        
+        self.assertEqual(tool.search("quantum")["results"], [{"title": "quantum"}])
+    
+    def test_entries_expire(self):
+        tool = CountingSearch(SearchCache(ttl_s=0))
+        tool.search("quantum")
+        
+        tool.search("quantum")
+        
+        self.assertEqual(tool.calls, 2)
+    
+    def test_least_recently_used_entry_is_evicted(self):
+        tool = CountingSearch(SearchCache(maxsize=2))
+        for query in ("a", "b", "a", "c"):
+            tool.search(query)
+        
+        tool.search("a")
+        tool.search("b")
+        
+        self.assertEqual(tool.calls, 4)
+
+class ResultSetTest(unittest.TestCase):
+    def setUp(self):
+        self.results = ResultSet.empty()
+        self.results.append("First", "abstract", ["A"], "2024", "link1", "arxiv", "preprint")
+        self.results.append("Second", "abstract", ["B"], "2023", "link2", "pubmed", "journal_article", pmid="42")
+    
+    def test_items_are_built_per_paper(self):
+        self.assertNotIn("pmid", self.results[0])
+        self.assertEqual(self.results[1]["pmid"], "42")
+        self.assertEqual([paper["title"] for paper in self.results], ["First", "Second"])
+    
+    def test_slices_are_result_sets(self):
+        head = self.results[:1]
+        
+        self.assertIsInstance(head, ResultSet)
+        self.assertEqual(head.to_list(), [self.results[0]])
+    
+    def test_extend(self):
+        combined = ResultSet.empty()
+        combined.extend(self.results)
+        combined.extend(self.results[1:])
+        
+        self.assertEqual([paper["title"] for paper in combined], ["First", "Second", "Second"])
+
+class AcademicSearchTest(unittest.TestCase):
+    def setUp(self):
+        self.tool = AcademicSearchTool(pubmed_api_key="test")
+    
+    def test_arxiv_results_are_plain_json(self):
+        response = self.tool._process_arxiv_results(ARXIV_FEED, "quantum")
+        
+        self.assertEqual(json.loads(json.dumps(response)), response)
+        self.assertEqual(response["total_results"], 2)
+        self.assertEqual(response["results"][0]["authors"], ["Ada Lovelace", "Alan Turing"])
+        self.assertEqual(response["results"][1]["abstract"], "")
+    
+    def test_malformed_xml_is_an_error_response(self):
+        response = self.tool._process_arxiv_results(b"<feed", "quantum")
+        
+        self.assertFalse(response["success"])
+
+class WebSearchTest(unittest.TestCase):
+    def setUp(self):
+        self.tool = WebSearchTool(api_key="test")
+    
+    def test_unexpected_errors_become_error_responses(self):
+        with mock.patch.object(self.tool.http, "get", side_effect=RuntimeError("boom")):
+            response = self.tool.search("quantum")
+        
+        self.assertEqual(response["error"], "Unexpected error: boom")
+        self.assertEqual(response["results"], [])
+    
+    def test_malformed_provider_data_is_an_error_response(self):
+        response = self.tool._safe_process_results({"organic_results": [None]}, "quantum")
+        
+        self.assertFalse(response["success"])
+    
+    def test_results_are_ordered_organic_then_news(self):
+        response = self.tool._process_results({
+            "organic_results": [{"title": "web", "position": 1}],
+            "news_results": [{"title": "news"}]
+        }, "quantum")
+        
+        self.assertEqual([(r["title"], r["source"]) for r in response["results"]], [("web", "web"), ("news", "news")])
+        self.assertEqual(response["results"][1]["position"], 0)
+
+if __name__ == "__main__":
+    unittest.main()
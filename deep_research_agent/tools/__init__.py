@@ -4,21 +4,25 @@ Contains web search and academic search tools
 """
 
 from .web_search import WebSearchTool
-from .acad_search import AcademicSearchTool
+from .acad_search import AcademicSearchTool, ResultSet
+from .http_session import create_http_session, gather_limited
 
 __all__ = [
     'WebSearchTool',
-    'AcademicSearchTool'
+    'AcademicSearchTool',
+    'ResultSet',
+    'create_http_session',
+    'gather_limited'
 ]
 
 # Tool factory function for easy instantiation
-def create_web_search_tool(api_key=None):
-    """Create a web search tool instance"""
-    return WebSearchTool(api_key=api_key)
+def create_web_search_tool(api_key=None, session=None):
+    """Create a web search tool instance, optionally sharing an aiohttp session"""
+    return WebSearchTool(api_key=api_key, session=session)
 
-def create_academic_search_tool(pubmed_api_key=None):
-    """Create an academic search tool instance"""
-    return AcademicSearchTool(pubmed_api_key=pubmed_api_key)
+def create_academic_search_tool(pubmed_api_key=None, session=None):
+    """Create an academic search tool instance, optionally sharing an aiohttp session"""
+    return AcademicSearchTool(pubmed_api_key=pubmed_api_key, session=session)
 
 # Tool validation utilities
 def validate_all_tools():
@@ -2,22 +2,167 @@
 Academic Search Tool - ArXiv and PubMed API wrappers for academic research
 """
 
-import os
+import asyncio
 import requests
-import xml.etree.ElementTree as ET
-from typing import Dict, List, Any, Optional
-from dotenv import load_dotenv
-from urllib.parse import urlencode
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from types import MappingProxyType
+from urllib3.exceptions import HTTPError as Urllib3HTTPError
+from typing import Dict, Iterator, List, Any, Optional, Union
+from utils.config import get_config
+from .http_session import (
+    AIOHTTP_AVAILABLE, ASYNC_HTTP_ERRORS, gather_limited, get_requests_session, session_scope
+)
+from .search_cache import SearchCache, cached_search
 
-# Load environment variables
-load_dotenv()
+if AIOHTTP_AVAILABLE:
+    import aiohttp
+
+try:
+    from lxml import etree as ET
+    LXML_AVAILABLE = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    LXML_AVAILABLE = False
+
+if LXML_AVAILABLE:
+    # Entities are not resolved, so responses cannot pull in external content
+    _XML_PARSER = ET.XMLParser(remove_blank_text=True, collect_ids=False, resolve_entities=False)
+    XMLParseError = ET.XMLSyntaxError
+else:
+    _XML_PARSER = None
+    XMLParseError = ET.ParseError
+
+# ArXiv Atom feed tags in Clark notation, so lookups skip namespace-prefix resolution
+_ATOM = "{http://www.w3.org/2005/Atom}"
+_ATOM_ENTRY = _ATOM + "entry"
+_ATOM_TITLE = _ATOM + "title"
+_ATOM_SUMMARY = _ATOM + "summary"
+_ATOM_PUBLISHED = _ATOM + "published"
+_ATOM_ID = _ATOM + "id"
+_ATOM_AUTHOR = _ATOM + "author"
+_ATOM_NAME = _ATOM + "name"
+
+# PubMed efetch requests are split into chunks of this many IDs and fetched
+# concurrently; NCBI allows 3 requests/s without an API key and 10 with one
+PUBMED_FETCH_CHUNK_SIZE = 20
+PUBMED_MAX_CONCURRENCY = 3
+PUBMED_MAX_CONCURRENCY_WITH_KEY = 10
+
+def _chunks(items: List[str], size: int) -> List[List[str]]:
+    """Split a list into consecutive chunks of at most size items"""
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+def _first(element: "ET.Element", tag: str) -> Optional["ET.Element"]:
+    """First descendant with the given tag in document order, like find(".//tag")"""
+    return next(element.iter(tag), None)
+
+def _parse_xml(xml_content: Union[str, bytes]) -> "ET.Element":
+    """Parse an XML response body (raw bytes, decoded per its XML declaration)"""
+    if not LXML_AVAILABLE:
+        return ET.fromstring(xml_content)
+    # lxml rejects str input that carries an encoding declaration
+    if isinstance(xml_content, str):
+        xml_content = xml_content.encode("utf-8")
+    return ET.fromstring(xml_content, _XML_PARSER)
+
+@dataclass
+class ResultSet:
+    """
+    Paper results stored column-wise: entry i of every field belongs to paper i
+    
+    Parsers fill a ResultSet; search responses carry its to_list() form so they
+    stay plain JSON-serializable data.
+    """
+    __slots__ = ("titles", "abstracts", "authors", "published_dates",
+                 "links", "sources", "types", "pmids")
+    
+    titles: List[str]
+    abstracts: List[str]
+    authors: List[List[str]]
+    published_dates: List[str]
+    links: List[str]
+    sources: List[str]
+    types: List[str]
+    pmids: List[Optional[str]]  # None for ArXiv papers
+    
+    @classmethod
+    def empty(cls) -> "ResultSet":
+        """Result set with no papers"""
+        return cls(*([] for _ in cls.__slots__))
+    
+    def __len__(self) -> int:
+        return len(self.titles)
+    
+    def __getitem__(self, index: Union[int, slice]) -> Union[Dict[str, Any], "ResultSet"]:
+        """Result dict for one paper built on access, or a ResultSet for a slice"""
+        if isinstance(index, slice):
+            return ResultSet(*(getattr(self, name)[index] for name in self.__slots__))
+        result = {
+            "title": self.titles[index],
+            "abstract": self.abstracts[index],
+            "authors": self.authors[index],
+            "published_date": self.published_dates[index]
+        }
+        if self.pmids[index] is not None:
+            result["pmid"] = self.pmids[index]
+        result["link"] = self.links[index]
+        result["source"] = self.sources[index]
+        result["type"] = self.types[index]
+        return result
+    
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return (self[i] for i in range(len(self)))
+    
+    def append(self, title: str, abstract: str, authors: List[str], published_date: str,
+               link: str, source: str, paper_type: str, pmid: Optional[str] = None) -> None:
+        """Add one paper to every column"""
+        self.titles.append(title)
+        self.abstracts.append(abstract)
+        self.authors.append(authors)
+        self.published_dates.append(published_date)
+        self.links.append(link)
+        self.sources.append(source)
+        self.types.append(paper_type)
+        self.pmids.append(pmid)
+    
+    def extend(self, other: "ResultSet") -> None:
+        """Append every paper of another result set"""
+        for name in self.__slots__:
+            getattr(self, name).extend(getattr(other, name))
+    
+    def to_list(self) -> List[Dict[str, Any]]:
+        """Per-paper dict layout, e.g. for JSON serialization"""
+        return list(self)
 
 class AcademicSearchTool:
-    def __init__(self, pubmed_api_key: Optional[str] = None):
-        self.pubmed_api_key = pubmed_api_key or os.getenv("PUBMED_API_KEY")
+    def __init__(self, pubmed_api_key: Optional[str] = None,
+                 session: Optional["aiohttp.ClientSession"] = None):
+        # Keys come from the shared config, which reads .env once
+        self.pubmed_api_key = pubmed_api_key or get_config().api_config.pubmed_api_key
+        # Pooled requests session for the sync methods, shared with the other tools
+        self.http = get_requests_session()
+        # Shared aiohttp session used by the async methods; one is opened per call when unset
+        self.session = session
+        # Recent successful responses, shared by the sync and async search methods
+        self.search_cache = SearchCache()
         self.arxiv_base_url = "http://export.arxiv.org/api/query"
         self.pubmed_base_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils"
+        self.pubmed_search_url = f"{self.pubmed_base_url}/esearch.fcgi"
+        self.pubmed_fetch_url = f"{self.pubmed_base_url}/efetch.fcgi"
+        
+        # Fixed query parameters, merged with the per-call ones on each request
+        self._arxiv_params_tpl = MappingProxyType({
+            "start": 0,
+            "sortBy": "relevance",
+            "sortOrder": "descending"
+        })
+        pubmed_params = {"db": "pubmed", "retmode": "xml"}
+        if self.pubmed_api_key:
+            pubmed_params["api_key"] = self.pubmed_api_key
+        self._pubmed_params_tpl = MappingProxyType(pubmed_params)
     
+    @cached_search("arxiv")
     def search_arxiv(self, query: str, max_results: int = 10) -> Dict[str, Any]:
         """
         Search ArXiv for academic papers
@@ -29,26 +174,17 @@ class AcademicSearchTool:
         Returns:
             Dict containing search results and metadata
         """
+        params = self._arxiv_params(query, max_results)
+        
         try:
-            params = {
-                "search_query": query,
-                "start": 0,
-                "max_results": max_results,
-                "sortBy": "relevance",
-                "sortOrder": "descending"
-            }
-            
-            url = f"{self.arxiv_base_url}?{urlencode(params)}"
-            response = requests.get(url, timeout=30)
+            response = self.http.get(self.arxiv_base_url, params=params, timeout=30)
             response.raise_for_status()
-            
-            return self._process_arxiv_results(response.text, query)
-            
         except requests.exceptions.RequestException as e:
             return self._error_response(f"ArXiv request failed: {str(e)}")
-        except Exception as e:
-            return self._error_response(f"ArXiv search error: {str(e)}")
+        
+        return self._process_arxiv_results(response.content, query)
     
+    @cached_search("pubmed")
     def search_pubmed(self, query: str, max_results: int = 10) -> Dict[str, Any]:
         """
         Search PubMed for medical/biological papers
@@ -60,41 +196,23 @@ class AcademicSearchTool:
         Returns:
             Dict containing search results and metadata
         """
+        # Step 1: Search for paper IDs
+        search_params = self._pubmed_search_params(query, max_results)
+        
         try:
-            # Step 1: Search for paper IDs
-            search_params = {
-                "db": "pubmed",
-                "term": query,
-                "retmax": max_results,
-                "retmode": "xml"
-            }
-            
-            if self.pubmed_api_key:
-                search_params["api_key"] = self.pubmed_api_key
-            
-            search_url = f"{self.pubmed_base_url}/esearch.fcgi"
-            search_response = requests.get(search_url, params=search_params, timeout=30)
+            search_response = self.http.get(self.pubmed_search_url, params=search_params, timeout=30)
             search_response.raise_for_status()
-            
-            # Extract paper IDs
-            paper_ids = self._extract_pubmed_ids(search_response.text)
-            
-            if not paper_ids:
-                return {
-                    "success": True,
-                    "query": query,
-                    "results": [],
-                    "total_results": 0,
-                    "tool": "pubmed_search"
-                }
-            
-            # Step 2: Fetch paper details
-            return self._fetch_pubmed_details(paper_ids, query)
-            
         except requests.exceptions.RequestException as e:
             return self._error_response(f"PubMed request failed: {str(e)}")
-        except Exception as e:
-            return self._error_response(f"PubMed search error: {str(e)}")
+        
+        # Extract paper IDs
+        paper_ids = self._extract_pubmed_ids(search_response.content)
+        
+        if not paper_ids:
+            return self._empty_pubmed_response(query)
+        
+        # Step 2: Fetch paper details
+        return self._fetch_pubmed_details(paper_ids, query)
     
     def search_combined(self, query: str, max_results_per_source: int = 5) -> Dict[str, Any]:
         """
@@ -107,16 +225,115 @@ class AcademicSearchTool:
         Returns:
             Dict containing combined search results
         """
-        arxiv_results = self.search_arxiv(query, max_results_per_source)
-        pubmed_results = self.search_pubmed(query, max_results_per_source)
+        # Both sources are independent network round-trips, so overlap them
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            arxiv_future = executor.submit(self.search_arxiv, query, max_results_per_source)
+            pubmed_future = executor.submit(self.search_pubmed, query, max_results_per_source)
+            arxiv_results = arxiv_future.result()
+            pubmed_results = pubmed_future.result()
+        return self._combine_results(query, arxiv_results, pubmed_results)
+    
+    @cached_search("arxiv")
+    async def asearch_arxiv(self, query: str, max_results: int = 10) -> Dict[str, Any]:
+        """Async version of search_arxiv over the shared aiohttp session"""
+        if not AIOHTTP_AVAILABLE:
+            return self._error_response("aiohttp is required for async search")
+        
+        params = self._arxiv_params(query, max_results)
         
+        try:
+            async with session_scope(self.session) as session:
+                xml_content = await self._get_bytes(session, self.arxiv_base_url, params)
+        except ASYNC_HTTP_ERRORS as e:
+            return self._error_response(f"ArXiv request failed: {str(e)}")
+        
+        return self._process_arxiv_results(xml_content, query)
+    
+    @cached_search("pubmed")
+    async def asearch_pubmed(self, query: str, max_results: int = 10) -> Dict[str, Any]:
+        """Async version of search_pubmed over the shared aiohttp session"""
+        if not AIOHTTP_AVAILABLE:
+            return self._error_response("aiohttp is required for async search")
+        
+        try:
+            async with session_scope(self.session) as session:
+                # Step 1: Search for paper IDs
+                search_xml = await self._get_bytes(
+                    session, self.pubmed_search_url,
+                    self._pubmed_search_params(query, max_results)
+                )
+                paper_ids = self._extract_pubmed_ids(search_xml)
+                
+                if not paper_ids:
+                    return self._empty_pubmed_response(query)
+                
+                # Step 2: Fetch paper details, one efetch request per chunk of IDs
+                fetch_xmls = await gather_limited(
+                    (self._get_bytes(session, self.pubmed_fetch_url, self._pubmed_fetch_params(chunk))
+                     for chunk in _chunks(paper_ids, PUBMED_FETCH_CHUNK_SIZE)),
+                    limit=self._pubmed_max_concurrency()
+                )
+        except ASYNC_HTTP_ERRORS as e:
+            return self._error_response(f"PubMed request failed: {str(e)}")
+        
+        results = []
+        for fetch_xml in fetch_xmls:
+            if isinstance(fetch_xml, ASYNC_HTTP_ERRORS):
+                return self._error_response(f"PubMed fetch failed: {str(fetch_xml)}")
+            if isinstance(fetch_xml, BaseException):
+                raise fetch_xml
+            response = self._process_pubmed_results(fetch_xml, query)
+            if not response["success"]:
+                return response
+            results.extend(response["results"])
+        return self._pubmed_response(query, results)
+    
+    async def asearch_combined(self, query: str, max_results_per_source: int = 5) -> Dict[str, Any]:
+        """Async version of search_combined; ArXiv and PubMed are queried concurrently"""
+        arxiv_results, pubmed_results = await asyncio.gather(
+            self.asearch_arxiv(query, max_results_per_source),
+            self.asearch_pubmed(query, max_results_per_source)
+        )
+        return self._combine_results(query, arxiv_results, pubmed_results)
+    
+    async def _get_bytes(self, session: "aiohttp.ClientSession", url: str, params: Dict[str, Any]) -> bytes:
+        """GET a URL and return the raw response body"""
+        async with session.get(url, params=params) as response:
+            response.raise_for_status()
+            return await response.read()
+    
+    def _arxiv_params(self, query: str, max_results: int) -> Dict[str, Any]:
+        """Query parameters for an ArXiv search"""
+        return self._arxiv_params_tpl | {"search_query": query, "max_results": max_results}
+    
+    def _pubmed_search_params(self, query: str, max_results: int) -> Dict[str, Any]:
+        """Query parameters for a PubMed esearch request"""
+        return self._pubmed_params_tpl | {"term": query, "retmax": max_results}
+    
+    def _pubmed_fetch_params(self, paper_ids: List[str]) -> Dict[str, Any]:
+        """Query parameters for a PubMed efetch request"""
+        return self._pubmed_params_tpl | {"id": ",".join(paper_ids)}
+    
+    def _empty_pubmed_response(self, query: str) -> Dict[str, Any]:
+        """Successful PubMed response with no matching papers"""
+        return {
+            "success": True,
+            "query": query,
+            "results": [],
+            "total_results": 0,
+            "tool": "pubmed_search"
+        }
+    
+    def _combine_results(self, query: str, arxiv_results: Dict[str, Any],
+                         pubmed_results: Dict[str, Any]) -> Dict[str, Any]:
+        """Merge successful ArXiv and PubMed results into one response"""
         combined_results = []
         
         if arxiv_results.get("success"):
-            combined_results.extend(arxiv_results.get("results", []))
+            combined_results.extend(arxiv_results["results"])
         
         if pubmed_results.get("success"):
-            combined_results.extend(pubmed_results.get("results", []))
+            combined_results.extend(pubmed_results["results"])
         
         return {
             "success": True,
@@ -127,146 +344,179 @@ class AcademicSearchTool:
             "tool": "academic_search"
         }
     
-    def _process_arxiv_results(self, xml_content: str, query: str) -> Dict[str, Any]:
+    def _process_arxiv_results(self, xml_content: bytes, query: str) -> Dict[str, Any]:
         """Process ArXiv XML response"""
         try:
-            root = ET.fromstring(xml_content)
-            namespace = {"atom": "http://www.w3.org/2005/Atom"}
-            
-            entries = root.findall("atom:entry", namespace)
-            results = []
+            root = _parse_xml(xml_content)
+            entries = root.findall(_ATOM_ENTRY)
+            results = ResultSet.empty()
             
             for entry in entries:
-                title = entry.find("atom:title", namespace)
-                summary = entry.find("atom:summary", namespace)
-                published = entry.find("atom:published", namespace)
-                link = entry.find("atom:id", namespace)
+                title = entry.find(_ATOM_TITLE)
+                summary = entry.find(_ATOM_SUMMARY)
+                published = entry.find(_ATOM_PUBLISHED)
+                link = entry.find(_ATOM_ID)
                 
                 authors = []
-                for author in entry.findall("atom:author", namespace):
-                    name = author.find("atom:name", namespace)
+                for author in entry.findall(_ATOM_AUTHOR):
+                    name = author.find(_ATOM_NAME)
                     if name is not None:
                         authors.append(name.text)
                 
-                results.append({
-                    "title": title.text if title is not None else "",
-                    "abstract": summary.text if summary is not None else "",
-                    "authors": authors,
-                    "published_date": published.text if published is not None else "",
-                    "link": link.text if link is not None else "",
-                    "source": "arxiv",
-                    "type": "preprint"
-                })
+                results.append(
+                    title.text if title is not None else "",
+                    summary.text if summary is not None else "",
+                    authors,
+                    published.text if published is not None else "",
+                    link.text if link is not None else "",
+                    "arxiv",
+                    "preprint"
+                )
             
             return {
                 "success": True,
                 "query": query,
-                "results": results,
+                "results": results.to_list(),
                 "total_results": len(results),
                 "tool": "arxiv_search"
             }
             
-        except ET.ParseError as e:
+        except XMLParseError as e:
             return self._error_response(f"ArXiv XML parsing error: {str(e)}")
     
-    def _extract_pubmed_ids(self, xml_content: str) -> List[str]:
+    def _extract_pubmed_ids(self, xml_content: bytes) -> List[str]:
         """Extract PubMed IDs from search response"""
         try:
-            root = ET.fromstring(xml_content)
-            ids = []
+            root = _parse_xml(xml_content)
+            return [id_elem.text for id_elem in root.iter("Id") if id_elem.text]
             
-            for id_elem in root.findall(".//Id"):
-                if id_elem.text:
-                    ids.append(id_elem.text)
-            
-            return ids
-            
-        except ET.ParseError:
+        except XMLParseError:
             return []
     
     def _fetch_pubmed_details(self, paper_ids: List[str], query: str) -> Dict[str, Any]:
-        """Fetch detailed information for PubMed papers"""
+        """Fetch detailed information for PubMed papers, chunking large ID lists"""
+        chunks = _chunks(paper_ids, PUBMED_FETCH_CHUNK_SIZE)
+        if len(chunks) == 1:
+            return self._fetch_pubmed_chunk(paper_ids, query)
+        
+        with ThreadPoolExecutor(max_workers=min(len(chunks), self._pubmed_max_concurrency())) as executor:
+            responses = list(executor.map(lambda chunk: self._fetch_pubmed_chunk(chunk, query), chunks))
+        
+        results = []
+        for response in responses:
+            if not response["success"]:
+                return response
+            results.extend(response["results"])
+        return self._pubmed_response(query, results)
+    
+    def _pubmed_max_concurrency(self) -> int:
+        """Concurrent efetch requests allowed under NCBI's rate limits"""
+        return PUBMED_MAX_CONCURRENCY_WITH_KEY if self.pubmed_api_key else PUBMED_MAX_CONCURRENCY
+    
+    def _fetch_pubmed_chunk(self, paper_ids: List[str], query: str) -> Dict[str, Any]:
+        """Fetch and parse one efetch request's worth of PubMed papers"""
+        fetch_params = self._pubmed_fetch_params(paper_ids)
+        
         try:
-            ids_str = ",".join(paper_ids)
-            
-            fetch_params = {
-                "db": "pubmed",
-                "id": ids_str,
-                "retmode": "xml"
-            }
+            if not LXML_AVAILABLE:
+                fetch_response = self.http.get(self.pubmed_fetch_url, params=fetch_params, timeout=30)
+                fetch_response.raise_for_status()
+                return self._process_pubmed_results(fetch_response.content, query)
             
-            if self.pubmed_api_key:
-                fetch_params["api_key"] = self.pubmed_api_key
+            # Parse articles as they arrive instead of buffering the whole body
+            with self.http.get(self.pubmed_fetch_url, params=fetch_params, timeout=30, stream=True) as fetch_response:
+                fetch_response.raise_for_status()
+                fetch_response.raw.decode_content = True
+                return self._process_pubmed_stream(fetch_response.raw, query)
             
-            fetch_url = f"{self.pubmed_base_url}/efetch.fcgi"
-            fetch_response = requests.get(fetch_url, params=fetch_params, timeout=30)
-            fetch_response.raise_for_status()
-            
-            return self._process_pubmed_results(fetch_response.text, query)
-            
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, Urllib3HTTPError) as e:
             return self._error_response(f"PubMed fetch failed: {str(e)}")
     
-    def _process_pubmed_results(self, xml_content: str, query: str) -> Dict[str, Any]:
+    def _process_pubmed_results(self, xml_content: bytes, query: str) -> Dict[str, Any]:
         """Process PubMed XML response"""
         try:
-            root = ET.fromstring(xml_content)
-            results = []
+            root = _parse_xml(xml_content)
+            results = ResultSet.empty()
+            for article in root.iter("PubmedArticle"):
+                self._append_pubmed_article(results, article)
+            return self._pubmed_response(query, results.to_list())
             
-            for article in root.findall(".//PubmedArticle"):
-                # Extract title
-                title_elem = article.find(".//ArticleTitle")
-                title = title_elem.text if title_elem is not None else ""
-                
-                # Extract abstract
-                abstract_elem = article.find(".//AbstractText")
-                abstract = abstract_elem.text if abstract_elem is not None else ""
-                
-                # Extract authors
-                authors = []
-                for author in article.findall(".//Author"):
-                    last_name = author.find("LastName")
-                    first_name = author.find("ForeName")
-                    if last_name is not None and first_name is not None:
-                        authors.append(f"{first_name.text} {last_name.text}")
-                
-                # Extract publication date
-                pub_date = article.find(".//PubDate")
-                date_str = ""
-                if pub_date is not None:
-                    year = pub_date.find("Year")
-                    month = pub_date.find("Month")
-                    if year is not None:
-                        date_str = year.text
-                        if month is not None:
-                            date_str += f"-{month.text}"
-                
-                # Extract PMID
-                pmid = article.find(".//PMID")
-                pmid_text = pmid.text if pmid is not None else ""
+        except XMLParseError as e:
+            return self._error_response(f"PubMed XML parsing error: {str(e)}")
+    
+    def _process_pubmed_stream(self, source, query: str) -> Dict[str, Any]:
+        """Process a streamed PubMed XML response one article at a time (lxml only)"""
+        try:
+            results = ResultSet.empty()
+            for _, article in ET.iterparse(source, events=("end",), tag="PubmedArticle",
+                                           remove_blank_text=True, resolve_entities=False):
+                self._append_pubmed_article(results, article)
                 
-                results.append({
-                    "title": title,
-                    "abstract": abstract,
-                    "authors": authors,
-                    "published_date": date_str,
-                    "pmid": pmid_text,
-                    "link": f"https://pubmed.ncbi.nlm.nih.gov/{pmid_text}/" if pmid_text else "",
-                    "source": "pubmed",
-                    "type": "peer_reviewed"
-                })
+                # Free the parsed article and any siblings already processed
+                article.clear(keep_tail=True)
+                while article.getprevious() is not None:
+                    del article.getparent()[0]
             
-            return {
-                "success": True,
-                "query": query,
-                "results": results,
-                "total_results": len(results),
-                "tool": "pubmed_search"
-            }
+            return self._pubmed_response(query, results.to_list())
             
-        except ET.ParseError as e:
+        except XMLParseError as e:
             return self._error_response(f"PubMed XML parsing error: {str(e)}")
     
+    def _append_pubmed_article(self, results: ResultSet, article: "ET.Element") -> None:
+        """Extract the result fields of a single PubmedArticle element into results"""
+        # Descendant lookups use tag-filtered iter(), which skips ElementPath parsing
+        # Extract title
+        title_elem = _first(article, "ArticleTitle")
+        title = title_elem.text if title_elem is not None else ""
+        
+        # Extract abstract
+        abstract_elem = _first(article, "AbstractText")
+        abstract = abstract_elem.text if abstract_elem is not None else ""
+        
+        # Extract authors
+        authors = []
+        for author in article.iter("Author"):
+            last_name = author.find("LastName")
+            first_name = author.find("ForeName")
+            if last_name is not None and first_name is not None:
+                authors.append(f"{first_name.text} {last_name.text}")
+        
+        # Extract publication date
+        pub_date = _first(article, "PubDate")
+        date_str = ""
+        if pub_date is not None:
+            year = pub_date.find("Year")
+            month = pub_date.find("Month")
+            if year is not None:
+                date_str = year.text
+                if month is not None:
+                    date_str += f"-{month.text}"
+        
+        # Extract PMID
+        pmid = _first(article, "PMID")
+        pmid_text = pmid.text if pmid is not None else ""
+        
+        results.append(
+            title,
+            abstract,
+            authors,
+            date_str,
+            f"https://pubmed.ncbi.nlm.nih.gov/{pmid_text}/" if pmid_text else "",
+            "pubmed",
+            "peer_reviewed",
+            pmid=pmid_text
+        )
+    
+    def _pubmed_response(self, query: str, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Successful PubMed search response"""
+        return {
+            "success": True,
+            "query": query,
+            "results": results,
+            "total_results": len(results),
+            "tool": "pubmed_search"
+        }
+    
     def _error_response(self, error_message: str) -> Dict[str, Any]:
         """Return standardized error response"""
         return {
@@ -0,0 +1,121 @@
+"""
+HTTP Session - Shared aiohttp session and concurrency helpers for async tool calls
+"""
+
+import asyncio
+import threading
+import requests
+from contextlib import nullcontext
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Any, AsyncContextManager, Awaitable, Iterable, List, Optional
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+# Failures of an async request; aiohttp timeouts are not ClientErrors
+if AIOHTTP_AVAILABLE:
+    ASYNC_HTTP_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError)
+else:
+    ASYNC_HTTP_ERRORS = (asyncio.TimeoutError,)
+
+# Connection pool settings shared by all tools using one session
+HTTP_POOL_LIMIT = 50
+HTTP_POOL_LIMIT_PER_HOST = 10
+HTTP_DNS_CACHE_TTL_S = 300
+HTTP_TIMEOUT_S = 30
+
+# Pooled requests session for the synchronous tool methods; connections are
+# kept alive per host and transient failures are retried with backoff.
+# Both requests and aiohttp advertise gzip/deflate, plus br when the brotli
+# package is installed, and decompress responses transparently
+REQUESTS_POOL_CONNECTIONS = 4
+REQUESTS_POOL_MAXSIZE = 16
+REQUESTS_MAX_RETRIES = 3
+REQUESTS_BACKOFF_FACTOR = 0.3
+REQUESTS_RETRY_STATUSES = (429, 500, 502, 503, 504)
+USER_AGENT = "deep-research-agent/1.0"
+
+_requests_session = None
+_requests_session_lock = threading.Lock()
+
+# Maximum number of tool requests in flight at once, to respect provider rate limits
+TOOL_MAX_CONCURRENCY = 8
+
+def create_requests_session() -> requests.Session:
+    """Create a keep-alive requests session with connection pooling and retries"""
+    retry = Retry(
+        total=REQUESTS_MAX_RETRIES,
+        backoff_factor=REQUESTS_BACKOFF_FACTOR,
+        status_forcelist=REQUESTS_RETRY_STATUSES
+    )
+    adapter = HTTPAdapter(
+        pool_connections=REQUESTS_POOL_CONNECTIONS,
+        pool_maxsize=REQUESTS_POOL_MAXSIZE,
+        max_retries=retry
+    )
+    
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"User-Agent": USER_AGENT})
+    return session
+
+def get_requests_session() -> requests.Session:
+    """Module-wide requests session shared by all tools, created on first use"""
+    global _requests_session
+    if _requests_session is None:
+        with _requests_session_lock:
+            if _requests_session is None:
+                _requests_session = create_requests_session()
+    return _requests_session
+
+def create_http_session() -> "aiohttp.ClientSession":
+    """
+    Create a pooled aiohttp session with keep-alive and DNS caching
+    
+    The session belongs to the running event loop; create it inside the
+    coroutine that uses it (e.g. `async with create_http_session() as session`)
+    and pass it to every tool involved in that run.
+    """
+    if not AIOHTTP_AVAILABLE:
+        raise ImportError("aiohttp is required for async tool calls")
+    
+    connector = aiohttp.TCPConnector(
+        limit=HTTP_POOL_LIMIT,
+        limit_per_host=HTTP_POOL_LIMIT_PER_HOST,
+        ttl_dns_cache=HTTP_DNS_CACHE_TTL_S
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT_S)
+    )
+
+def session_scope(session: Optional["aiohttp.ClientSession"]) -> AsyncContextManager["aiohttp.ClientSession"]:
+    """Use a shared session without closing it, or open one for this call only"""
+    if session is not None:
+        return nullcontext(session)
+    return create_http_session()
+
+async def gather_limited(calls: Iterable[Awaitable[Any]],
+                         limit: int = TOOL_MAX_CONCURRENCY) -> List[Any]:
+    """
+    Await tool calls concurrently, at most `limit` at a time
+    
+    Args:
+        calls: Awaitables such as `tool.asearch(query, session=session)`
+        limit: Maximum number of calls in flight
+    
+    Returns:
+        Results in input order; failed calls return their exception
+    """
+    semaphore = asyncio.Semaphore(limit)
+    
+    async def run(call: Awaitable[Any]) -> Any:
+        async with semaphore:
+            return await call
+    
+    return await asyncio.gather(*[run(call) for call in calls], return_exceptions=True)
@@ -0,0 +1,106 @@
+"""
+Search Cache - In-memory TTL/LRU cache for tool search results
+"""
+
+import copy
+import time
+import hashlib
+import asyncio
+import inspect
+import threading
+import functools
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# Number of search responses kept per tool, and how long they stay fresh
+SEARCH_CACHE_SIZE = 256
+SEARCH_CACHE_TTL_S = 600.0
+
+class SearchCache:
+    """Thread-safe LRU of successful search responses with a time-to-live"""
+    
+    def __init__(self, maxsize: int = SEARCH_CACHE_SIZE, ttl_s: float = SEARCH_CACHE_TTL_S):
+        self.maxsize = maxsize
+        self.ttl_s = ttl_s
+        self._entries: "OrderedDict[bytes, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def make_key(name: str, arguments: Dict[str, Any]) -> bytes:
+        """Digest of a search name and its bound arguments"""
+        items = sorted(
+            (arg, sorted(value.items()) if isinstance(value, dict) else value)
+            for arg, value in arguments.items()
+        )
+        return hashlib.blake2b(repr((name, items)).encode(), digest_size=16).digest()
+    
+    def get(self, key: bytes) -> Optional[Dict[str, Any]]:
+        """Cached response for key, or None when missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return copy.deepcopy(entry[1])
+    
+    def put(self, key: bytes, response: Dict[str, Any]) -> None:
+        """Store a successful response; failures are never cached"""
+        if not response.get("success"):
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_s, copy.deepcopy(response))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Drop every cached response"""
+        with self._lock:
+            self._entries.clear()
+
+def cached_search(name: str) -> Callable:
+    """
+    Cache a tool search method in the tool's `search_cache`
+    
+    Sync and async methods decorated with the same name share entries, so
+    `search_arxiv` and `asearch_arxiv` answer the same query from one cache.
+    
+    Args:
+        name: Cache namespace for the search
+    """
+    def decorator(method: Callable) -> Callable:
+        signature = inspect.signature(method)
+        
+        def call_key(self, args: tuple, kwargs: Dict[str, Any]) -> bytes:
+            # Bind with defaults so positional and keyword calls share a key
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            arguments = dict(bound.arguments)
+            del arguments["self"]
+            return SearchCache.make_key(name, arguments)
+        
+        if asyncio.iscoroutinefunction(method):
+            @functools.wraps(method)
+            async def async_wrapper(self, *args, **kwargs):
+                key = call_key(self, args, kwargs)
+                response = self.search_cache.get(key)
+                if response is None:
+                    response = await method(self, *args, **kwargs)
+                    self.search_cache.put(key, response)
+                return response
+            return async_wrapper
+        
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            key = call_key(self, args, kwargs)
+            response = self.search_cache.get(key)
+            if response is None:
+                response = method(self, *args, **kwargs)
+                self.search_cache.put(key, response)
+            return response
+        return wrapper
+    
+    return decorator
@@ -2,17 +2,58 @@
 Web Search Tool - SerpAPI wrapper for web search functionality
 """
 
-import os
+import json
 import requests
+from itertools import chain, repeat
+from operator import itemgetter
 from typing import Dict, List, Any, Optional
-from dotenv import load_dotenv
+from utils.config import get_config
+from .http_session import AIOHTTP_AVAILABLE, ASYNC_HTTP_ERRORS, get_requests_session, session_scope
+from .search_cache import SearchCache, cached_search
 
-# Load environment variables
-load_dotenv()
+if AIOHTTP_AVAILABLE:
+    import aiohttp
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Basic query expansions returned by get_search_suggestions
+_SUGGESTION_TEMPLATES = (
+    "{query} definition",
+    "{query} examples",
+    "{query} benefits",
+    "{query} challenges",
+    "latest {query} news"
+)
+
+# SerpAPI answers these statuses when the API key is missing or invalid
+_AUTH_ERROR_STATUSES = frozenset((401, 403))
+
+# Fields copied from each SerpAPI organic/news result, with their defaults
+_RESULT_DEFAULTS = {"title": "", "link": "", "snippet": "", "date": "", "position": 0}
+_RESULT_FIELDS = itemgetter(*_RESULT_DEFAULTS)
+
+def _loads_json(data: bytes) -> Any:
+    """Decode a JSON response body, using orjson when available"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
 
 class WebSearchTool:
-    def __init__(self, api_key: Optional[str] = None):
-        self.api_key = api_key or os.getenv("SERPAPI_KEY")
+    def __init__(self, api_key: Optional[str] = None, session: Optional["aiohttp.ClientSession"] = None):
+        # Keys come from the shared config, which reads .env once
+        self.api_key = api_key or get_config().api_config.serpapi_key
+        # Pooled requests session for the sync methods, shared with the other tools
+        self.http = get_requests_session()
+        # Shared aiohttp session used by the async methods; one is opened per call when unset
+        self.session = session
+        # Recent successful responses, shared by the sync and async search methods
+        self.search_cache = SearchCache()
+        # Whether SerpAPI accepted the key, learned from real searches (None until known)
+        self._api_key_valid: Optional[bool] = None
         self.base_url = "https://serpapi.com/search"
         self.default_params = {
             "engine": "google",
@@ -21,6 +62,7 @@ class WebSearchTool:
             "gl": "us"
         }
     
+    @cached_search("web_search")
     def search(self, query: str, num_results: int = 10, **kwargs) -> Dict[str, Any]:
         """
         Perform web search using SerpAPI
@@ -35,26 +77,91 @@ class WebSearchTool:
         """
         if not self.api_key:
             return self._error_response("SerpAPI key not found. Please set SERPAPI_KEY environment variable.")
+        if self._api_key_valid is False:
+            return self._error_response("SerpAPI key was rejected. Please check SERPAPI_KEY.")
+        
+        params = self._build_params(query, num_results, kwargs)
         
         try:
-            params = {
-                **self.default_params,
-                "q": query,
-                "num": num_results,
-                "api_key": self.api_key,
-                **kwargs
-            }
-            
-            response = requests.get(self.base_url, params=params, timeout=30)
+            response = self.http.get(self.base_url, params=params, timeout=30)
+            self._record_key_status(response.status_code)
             response.raise_for_status()
-            
-            data = response.json()
-            return self._process_results(data, query)
-            
         except requests.exceptions.RequestException as e:
             return self._error_response(f"Request failed: {str(e)}")
         except Exception as e:
             return self._error_response(f"Unexpected error: {str(e)}")
+        
+        try:
+            data = _loads_json(response.content)
+        except ValueError as e:
+            return self._error_response(f"Invalid JSON response: {str(e)}")
+        
+        return self._safe_process_results(data, query)
+    
+    @cached_search("web_search")
+    async def asearch(self, query: str, num_results: int = 10, **kwargs) -> Dict[str, Any]:
+        """
+        Async version of search over the shared aiohttp session
+        
+        Args:
+            query: Search query string
+            num_results: Number of results to return
+            **kwargs: Additional search parameters
+            
+        Returns:
+            Dict containing search results and metadata
+        """
+        if not self.api_key:
+            return self._error_response("SerpAPI key not found. Please set SERPAPI_KEY environment variable.")
+        if self._api_key_valid is False:
+            return self._error_response("SerpAPI key was rejected. Please check SERPAPI_KEY.")
+        if not AIOHTTP_AVAILABLE:
+            return self._error_response("aiohttp is required for async search")
+        
+        params = self._build_params(query, num_results, kwargs)
+        
+        try:
+            async with session_scope(self.session) as session:
+                data = await self._get_json(session, params)
+        except ASYNC_HTTP_ERRORS as e:
+            return self._error_response(f"Request failed: {str(e)}")
+        except ValueError as e:
+            return self._error_response(f"Invalid JSON response: {str(e)}")
+        except Exception as e:
+            return self._error_response(f"Unexpected error: {str(e)}")
+        
+        return self._safe_process_results(data, query)
+    
+    def _safe_process_results(self, data: Any, query: str) -> Dict[str, Any]:
+        """Process results, reporting malformed provider data as an error response"""
+        try:
+            return self._process_results(data, query)
+        except Exception as e:
+            return self._error_response(f"Unexpected error: {str(e)}")
+    
+    async def _get_json(self, session: "aiohttp.ClientSession", params: Dict[str, Any]) -> Dict[str, Any]:
+        """GET the SerpAPI endpoint and decode the JSON body"""
+        async with session.get(self.base_url, params=params) as response:
+            self._record_key_status(response.status)
+            response.raise_for_status()
+            return _loads_json(await response.read())
+    
+    def _record_key_status(self, status: int) -> None:
+        """Remember whether SerpAPI accepted the key, based on a search's HTTP status"""
+        if status in _AUTH_ERROR_STATUSES:
+            self._api_key_valid = False
+        elif status < 400:
+            self._api_key_valid = True
+    
+    def _build_params(self, query: str, num_results: int, extra: Dict[str, Any]) -> Dict[str, Any]:
+        """Merge default, query and caller parameters for a SerpAPI request"""
+        return {
+            **self.default_params,
+            "q": query,
+            "num": num_results,
+            "api_key": self.api_key,
+            **extra
+        }
     
     def search_news(self, query: str, num_results: int = 5) -> Dict[str, Any]:
         """Search for news articles"""
@@ -69,29 +176,22 @@ class WebSearchTool:
         organic_results = data.get("organic_results", [])
         news_results = data.get("news_results", [])
         
-        processed_results = []
+        processed_results = [None] * (len(organic_results) + len(news_results))
         
-        # Process organic results
-        for result in organic_results:
-            processed_results.append({
-                "title": result.get("title", ""),
-                "link": result.get("link", ""),
-                "snippet": result.get("snippet", ""),
-                "source": "web",
-                "date": result.get("date", ""),
-                "position": result.get("position", 0)
-            })
-        
-        # Process news results
-        for result in news_results:
-            processed_results.append({
-                "title": result.get("title", ""),
-                "link": result.get("link", ""),
-                "snippet": result.get("snippet", ""),
-                "source": "news",
-                "date": result.get("date", ""),
-                "position": result.get("position", 0)
-            })
+        # Organic results first, then news, each tagged with its source
+        for i, (source, result) in enumerate(chain(
+            zip(repeat("web"), organic_results),
+            zip(repeat("news"), news_results)
+        )):
+            title, link, snippet, date, position = _RESULT_FIELDS({**_RESULT_DEFAULTS, **result})
+            processed_results[i] = {
+                "title": title,
+                "link": link,
+                "snippet": snippet,
+                "source": source,
+                "date": date,
+                "position": position
+            }
         
         return {
             "success": True,
@@ -113,32 +213,15 @@ class WebSearchTool:
         }
     
     def validate_api_key(self) -> bool:
-        """Validate if API key is working"""
-        if not self.api_key:
-            return False
+        """
+        Check whether the API key is usable without a network round-trip
         
-        try:
-            test_params = {
-                "engine": "google",
-                "q": "test",
-                "api_key": self.api_key,
-                "num": 1
-            }
-            
-            response = requests.get(self.base_url, params=test_params, timeout=10)
-            return response.status_code == 200
-            
-        except Exception:
-            return False
+        A configured key counts as valid until a search is rejected with 401/403.
+        """
+        return bool(self.api_key) and self._api_key_valid is not False
     
     def get_search_suggestions(self, query: str) -> List[str]:
         """Get search suggestions for a query"""
         # TODO: Implement search suggestions using SerpAPI
         # For now, return basic suggestions
-        return [
-            f"{query} definition",
-            f"{query} examples",
-            f"{query} benefits",
-            f"{query} challenges",
-            f"latest {query} news"
-        ] 
\ No newline at end of file
+        return [template.format(query=query) for template in _SUGGESTION_TEMPLATES]
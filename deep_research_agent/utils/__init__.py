@@ -27,6 +27,7 @@ from .prompts import (
     PromptManager,
     PromptTemplate,
     PromptType,
+    TemplateNotFoundError,
     get_prompt_manager,
     generate_prompt
 )
@@ -54,6 +55,7 @@ __all__ = [
     'PromptManager',
     'PromptTemplate',
     'PromptType',
+    'TemplateNotFoundError',
     'get_prompt_manager',
     'generate_prompt'
 ] 
\ No newline at end of file
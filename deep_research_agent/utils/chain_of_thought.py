@@ -4,11 +4,99 @@ Chain-of-Thought Logging Module - Tracks agent reasoning and decision processes
 
 import json
 import os
-from typing import Dict, List, Any, Optional
+import sys
+import time
+import queue
+import atexit
+import threading
+import functools
+from collections import Counter, deque
+from itertools import islice
+from typing import Deque, Dict, List, Any, Optional, Sequence
 from datetime import datetime
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, field, fields, is_dataclass
 from enum import Enum
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import numpy as np
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Logged entries waiting for the background writer; log_step blocks when it is full
+# (re-checking every LOG_QUEUE_PUT_TIMEOUT_S that the writer is still running)
+LOG_QUEUE_SIZE = 4096
+LOG_QUEUE_PUT_TIMEOUT_S = 1.0
+
+# Entry count above which topic searches run the compiled scan (below it, JIT
+# dispatch and packing the search text cost more than the Python loop). The
+# search text is built and packed only by searches, so logging never pays for it
+REASONING_SCAN_NUMBA_MIN = 5000
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True)
+    def _match_blobs(buffer, offsets, needle):
+        """Mask of the packed UTF-8 blobs buffer[offsets[i]:offsets[i + 1]] containing needle"""
+        n = len(offsets) - 1
+        m = len(needle)
+        mask = np.zeros(n, dtype=np.bool_)
+        for i in prange(n):
+            last_start = offsets[i + 1] - m
+            j = offsets[i]
+            while j <= last_start:
+                if buffer[j] == needle[0]:
+                    k = 1
+                    while k < m and buffer[j + k] == needle[k]:
+                        k += 1
+                    if k == m:
+                        mask[i] = True
+                        break
+                j += 1
+        return mask
+
+def _json_default(obj: Any) -> Any:
+    """Stdlib json fallback for the dataclasses and enums orjson serializes natively"""
+    if is_dataclass(obj):
+        # Like orjson, leave out underscore-prefixed (private) fields
+        return {f.name: getattr(obj, f.name) for f in fields(obj) if not f.name.startswith("_")}
+    if isinstance(obj, Enum):
+        return obj.value
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def _write_json(file_path: str, data: Any) -> None:
+    """Write indented JSON to a file, using orjson when available"""
+    if ORJSON_AVAILABLE:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    else:
+        payload = json.dumps(data, indent=2, ensure_ascii=False, default=_json_default).encode("utf-8")
+    _replace_file(file_path, payload)
+
+def _replace_file(file_path: str, payload: bytes) -> None:
+    """Write a file through a temporary sibling so readers never see it half-written"""
+    tmp_file = f"{file_path}.tmp"
+    with open(tmp_file, 'wb') as f:
+        f.write(payload)
+    os.replace(tmp_file, file_path)
+
+def _dumps_line(data: Any) -> bytes:
+    """Serialize one JSON Lines record, using orjson when available"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS)
+    return (json.dumps(data, ensure_ascii=False, default=_json_default) + "\n").encode("utf-8")
+
+def _loads_json(data: bytes) -> Any:
+    """Deserialize JSON bytes, using orjson when available"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
 class LogLevel(Enum):
     """Log levels for chain-of-thought entries"""
     DEBUG = "debug"
@@ -17,7 +105,10 @@ class LogLevel(Enum):
     ERROR = "error"
     CRITICAL = "critical"
 
-@dataclass
+# Severity order used for level thresholds
+_LEVEL_ORDER = {level: rank for rank, level in enumerate(LogLevel)}
+
+@dataclass(slots=True)
 class ToolCall:
     """Structure for tool call information"""
     tool_name: str
@@ -27,8 +118,20 @@ class ToolCall:
     execution_time: float
     success: bool
     error_message: Optional[str] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for JSON serialization"""
+        return {
+            "tool_name": self.tool_name,
+            "query": self.query,
+            "parameters": self.parameters,
+            "results": self.results,
+            "execution_time": self.execution_time,
+            "success": self.success,
+            "error_message": self.error_message
+        }
 
-@dataclass
+@dataclass(slots=True)
 class ChainOfThoughtEntry:
     """Structure for a single chain-of-thought log entry"""
     timestamp: str
@@ -42,15 +145,32 @@ class ChainOfThoughtEntry:
     confidence: float
     level: LogLevel
     metadata: Dict[str, Any]
+    # Entries are not modified once logged, so their dict form is built once
+    _cached_dict: Optional[Dict[str, Any]] = field(default=None, repr=False, compare=False)
+    # Lowercased prompt, reasoning and decision, built on the first topic search
+    _search_blob: str = field(default="", repr=False, compare=False)
+    
+    def _search_text(self) -> str:
+        """Search text for topic lookups, built once on first use"""
+        if not self._search_blob:
+            # NUL-separated so a topic cannot match across two fields
+            self._search_blob = "\x00".join((self.input_prompt, self.reasoning, self.decision)).lower()
+        return self._search_blob
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for JSON serialization"""
+        """Convert to dictionary for JSON serialization (cached; treat as read-only)"""
+        if self._cached_dict is None:
+            self._cached_dict = self._build_dict()
+        return self._cached_dict
+    
+    def _build_dict(self) -> Dict[str, Any]:
+        """Dictionary form of the entry"""
         return {
             "timestamp": self.timestamp,
             "agent": self.agent,
             "step_id": self.step_id,
             "input_prompt": self.input_prompt,
-            "tool_calls": [asdict(tool_call) for tool_call in self.tool_calls],
+            "tool_calls": [tool_call.to_dict() for tool_call in self.tool_calls],
             "llm_response": self.llm_response,
             "decision": self.decision,
             "reasoning": self.reasoning,
@@ -59,26 +179,145 @@ class ChainOfThoughtEntry:
             "metadata": self.metadata
         }
 
+# Fields a logged record must have to be loaded back (tool_calls may be absent)
+_REQUIRED_ENTRY_KEYS = frozenset(
+    f.name for f in fields(ChainOfThoughtEntry) if not f.name.startswith("_")
+) - {"tool_calls"}
+
+def _is_key_decision(entry: ChainOfThoughtEntry) -> bool:
+    """Whether an entry is reported among a summary's key decisions"""
+    return bool(entry.decision) and entry.confidence > 0.7
+
+@dataclass
+class _SummaryStats:
+    """Running create_summary aggregates over a set of entries, updated per append/evict"""
+    agents: Counter = field(default_factory=Counter)
+    tools: Counter = field(default_factory=Counter)
+    levels: Counter = field(default_factory=Counter)
+    confidence_sum: float = 0.0
+    key_decisions: Deque[ChainOfThoughtEntry] = field(default_factory=deque)
+    
+    def add(self, entry: ChainOfThoughtEntry) -> None:
+        """Count a newly appended entry"""
+        self.agents[entry.agent] += 1
+        self.tools.update(tool.tool_name for tool in entry.tool_calls)
+        self.levels[entry.level.value] += 1
+        self.confidence_sum += entry.confidence
+        if _is_key_decision(entry):
+            self.key_decisions.append(entry)
+    
+    def remove_oldest(self, entry: ChainOfThoughtEntry) -> None:
+        """Uncount the oldest entry; values whose count reaches zero are dropped"""
+        self.agents.subtract((entry.agent,))
+        self.tools.subtract(tool.tool_name for tool in entry.tool_calls)
+        self.levels.subtract((entry.level.value,))
+        for counter in (self.agents, self.tools, self.levels):
+            for key in [key for key, count in counter.items() if count <= 0]:
+                del counter[key]
+        self.confidence_sum -= entry.confidence
+        if self.key_decisions and self.key_decisions[0] is entry:
+            self.key_decisions.popleft()
+
+def _locked(method):
+    """Run a logger method holding the logger's entry lock"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
 class ChainOfThoughtLogger:
-    """Logger for chain-of-thought processes"""
+    """
+    Logger for chain-of-thought processes
     
-    def __init__(self, log_file: str = "logs/chain_of_thought.json", max_entries: int = 1000):
+    Use get_logger() to share one logger per log file: each logger appends through
+    its own file handle and compact() replaces the file with its own entries.
+    """
+    
+    def __init__(self, log_file: str = "logs/chain_of_thought.jsonl", max_entries: int = 1000,
+                 min_level: LogLevel = LogLevel.DEBUG):
         """
         Initialize chain-of-thought logger
         
         Args:
-            log_file: Path to log file
+            log_file: Path to the JSON Lines log file (one entry per line)
             max_entries: Maximum number of entries to keep in memory
+            min_level: Steps below this level are not recorded
         """
         self.log_file = log_file
         self.max_entries = max_entries
-        self.entries: List[ChainOfThoughtEntry] = []
+        self.min_level = min_level
+        # Guards the entries, indexes and aggregates when agents share the logger across threads
+        self._lock = threading.RLock()
+        # Bumped on every change to the kept entries, so callers can use it as a cache key
+        self.revision = 0
+        self._reset_entries()
         self.current_session_id = self._generate_session_id()
         
+        # Local ISO date-time of the last whole second logged, reused within that second;
+        # one (second, prefix) tuple so threads never pair a second with another's prefix
+        self._iso_cache = (None, "")
+        
+        # Lines appended since the file was last rewritten with only the kept entries
+        self._appended = 0
+        self._fh = None
+        # Set after a failed write so a broken log file is reported once, not per batch
+        self._write_failed = False
+        
+        # Entries are serialized and written by a daemon thread; _io_lock guards the handle
+        self._queue: "queue.Queue[Optional[ChainOfThoughtEntry]]" = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+        self._io_lock = threading.Lock()
+        self._writer = threading.Thread(target=self._writer_loop, name="cot-log-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.flush)
+        
         # Create log directory if it doesn't exist
         os.makedirs(os.path.dirname(log_file), exist_ok=True)
         
-        # Load existing logs
+        # Logs written before the JSON Lines format sit beside the new file as .json
+        legacy_file = os.path.splitext(log_file)[0] + ".json"
+        if log_file.endswith(".jsonl") and not os.path.exists(log_file) and os.path.exists(legacy_file):
+            os.replace(legacy_file, log_file)
+        
+        # Existing logs are loaded on first read, so write-only loggers never parse them.
+        # A legacy single-document file is converted now, before lines are appended to it
+        self._loaded = False
+        if self._is_legacy_file():
+            self._ensure_loaded()
+        self._fh = open(self.log_file, "ab")
+    
+    @property
+    def entries(self) -> Deque[ChainOfThoughtEntry]:
+        """Kept entries, oldest first (loads the log file on first access)"""
+        self._ensure_loaded()
+        return self._entries
+    
+    def _reset_entries(self) -> None:
+        """Empty the ring buffer, indexes and summary aggregates"""
+        # Ring buffer: appending past max_entries evicts the oldest entry
+        self._entries: Deque[ChainOfThoughtEntry] = deque(maxlen=self.max_entries)
+        # Entries per session id and per agent, oldest first, kept in step with _entries
+        self._by_session: Dict[str, Deque[ChainOfThoughtEntry]] = {}
+        self._by_agent: Dict[str, Deque[ChainOfThoughtEntry]] = {}
+        # Summary aggregates over all entries and per session id
+        self._stats = _SummaryStats()
+        self._session_stats: Dict[str, _SummaryStats] = {}
+        # Packed search text for the compiled topic scan, built on first large search
+        self._blob_pack = None
+    
+    def _ensure_loaded(self) -> None:
+        """Load the log file once; it already holds the entries logged since startup"""
+        if self._loaded:
+            return
+        with self._lock:
+            if not self._loaded:
+                self._load_once()
+    
+    def _load_once(self) -> None:
+        """Replace the in-memory state with the log file's entries"""
+        self._loaded = True
+        self.flush()
+        self._reset_entries()
         self._load_logs()
     
     def log_step(self,
@@ -90,7 +329,8 @@ class ChainOfThoughtLogger:
                 reasoning: str = "",
                 confidence: float = 1.0,
                 level: LogLevel = LogLevel.INFO,
-                metadata: Dict[str, Any] = None) -> str:
+                metadata: Dict[str, Any] = None,
+                session_id: Optional[str] = None) -> str:
         """
         Log a chain-of-thought step
         
@@ -104,14 +344,27 @@ class ChainOfThoughtLogger:
             confidence: Confidence level (0.0 to 1.0)
             level: Log level
             metadata: Additional metadata
+            session_id: Session to record the step under (defaults to current_session_id)
             
         Returns:
             Step ID for reference
         """
-        step_id = f"{agent}_{datetime.now().timestamp()}"
+        now_ns = time.time_ns()
+        step_id = f"{agent}_{now_ns}"
+        if not self.enabled_for(level):
+            return step_id
+        
+        # Agent names and session ids repeat across entries; share one string object each
+        agent = sys.intern(agent)
+        
+        # Copy caller metadata (it may be reused for later steps); most calls pass none
+        if metadata is None:
+            entry_metadata = {"session_id": session_id or self.current_session_id}
+        else:
+            entry_metadata = {"session_id": session_id or self.current_session_id, **metadata}
         
         entry = ChainOfThoughtEntry(
-            timestamp=datetime.now().isoformat(),
+            timestamp=self._isoformat_ns(now_ns),
             agent=agent,
             step_id=step_id,
             input_prompt=input_prompt,
@@ -121,23 +374,21 @@ class ChainOfThoughtLogger:
             reasoning=reasoning,
             confidence=confidence,
             level=level,
-            metadata={
-                "session_id": self.current_session_id,
-                **(metadata or {})
-            }
+            metadata=entry_metadata
         )
         
-        self.entries.append(entry)
-        
-        # Trim if necessary
-        if len(self.entries) > self.max_entries:
-            self.entries = self.entries[-self.max_entries:]
+        with self._lock:
+            self._append_entry(entry)
         
         # Auto-save
-        self._save_logs()
+        self._save_logs(entry)
         
         return step_id
     
+    def enabled_for(self, level: LogLevel) -> bool:
+        """Whether steps at this level are recorded; lets callers skip building them"""
+        return _LEVEL_ORDER[level] >= _LEVEL_ORDER[self.min_level]
+    
     def log_tool_call(self,
                      tool_name: str,
                      query: str,
@@ -171,6 +422,7 @@ class ChainOfThoughtLogger:
             error_message=error_message
         )
     
+    @_locked
     def get_entries(self,
                    agent: Optional[str] = None,
                    level: Optional[LogLevel] = None,
@@ -186,34 +438,48 @@ class ChainOfThoughtLogger:
         Returns:
             List of filtered entries
         """
-        filtered_entries = self.entries
-        
-        if agent:
-            filtered_entries = [e for e in filtered_entries if e.agent == agent]
+        self._ensure_loaded()
+        filtered_entries = self._by_agent.get(agent, ()) if agent else self._entries
         
         if level:
             filtered_entries = [e for e in filtered_entries if e.level == level]
         
         if limit:
-            filtered_entries = filtered_entries[-limit:]
+            # Deques do not slice; skip to the last `limit` entries instead
+            return list(islice(filtered_entries, max(0, len(filtered_entries) - limit), None))
         
-        return filtered_entries
+        return list(filtered_entries)
     
+    @_locked
     def get_session_entries(self, session_id: Optional[str] = None) -> List[ChainOfThoughtEntry]:
         """Get entries for a specific session"""
         target_session = session_id or self.current_session_id
-        return [e for e in self.entries if e.metadata.get("session_id") == target_session]
+        self._ensure_loaded()
+        return list(self._by_session.get(target_session, ()))
     
+    @_locked
     def get_reasoning_chain(self, topic: str) -> List[ChainOfThoughtEntry]:
         """Get reasoning chain for a specific topic"""
         topic_lower = topic.lower()
-        return [
-            e for e in self.entries
-            if topic_lower in e.input_prompt.lower() or 
-               topic_lower in e.reasoning.lower() or
-               topic_lower in e.decision.lower()
-        ]
+        entries = self.entries
+        if NUMBA_AVAILABLE and topic_lower and len(entries) > REASONING_SCAN_NUMBA_MIN:
+            snapshot, buffer, offsets = self._packed_blobs()
+            mask = _match_blobs(buffer, offsets, np.frombuffer(topic_lower.encode("utf-8"), dtype=np.uint8))
+            return [snapshot[i] for i in np.flatnonzero(mask)]
+        return [e for e in entries if topic_lower in e._search_text()]
     
+    def _packed_blobs(self):
+        """Kept entries with their search text packed into one UTF-8 buffer, rebuilt after changes"""
+        if self._blob_pack is None:
+            snapshot = list(self._entries)
+            encoded = [e._search_text().encode("utf-8") for e in snapshot]
+            offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+            np.cumsum([len(blob) for blob in encoded], out=offsets[1:])
+            buffer = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+            self._blob_pack = (snapshot, buffer, offsets)
+        return self._blob_pack
+    
+    @_locked
     def export_to_json(self, file_path: str, session_id: Optional[str] = None) -> None:
         """Export logs to JSON file"""
         entries_to_export = self.get_session_entries(session_id) if session_id else self.entries
@@ -222,15 +488,17 @@ class ChainOfThoughtLogger:
             "session_id": session_id or self.current_session_id,
             "exported_at": datetime.now().isoformat(),
             "total_entries": len(entries_to_export),
-            "entries": [entry.to_dict() for entry in entries_to_export]
+            # Entries serialize field by field, in the same layout as to_dict()
+            "entries": list(entries_to_export)
         }
         
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(export_data, f, indent=2, ensure_ascii=False)
+        _write_json(file_path, export_data)
     
+    @_locked
     def create_summary(self, session_id: Optional[str] = None) -> Dict[str, Any]:
         """Create a summary of the reasoning process"""
-        entries = self.get_session_entries(session_id) if session_id else self.entries
+        self._ensure_loaded()
+        entries = self._by_session.get(session_id, ()) if session_id else self._entries
         
         if not entries:
             return {
@@ -241,19 +509,11 @@ class ChainOfThoughtLogger:
                 "average_confidence": 0.0
             }
         
-        # Analyze entries
-        agents_involved = list(set(e.agent for e in entries))
-        tools_used = list(set(
-            tool.tool_name for e in entries for tool in e.tool_calls
-        ))
-        
-        total_confidence = sum(e.confidence for e in entries)
-        average_confidence = total_confidence / len(entries)
-        
-        # Count by level
-        level_counts = {}
-        for entry in entries:
-            level_counts[entry.level.value] = level_counts.get(entry.level.value, 0) + 1
+        stats = self._session_stats[session_id] if session_id else self._stats
+        agents_involved = list(stats.agents)
+        tools_used = list(stats.tools)
+        average_confidence = stats.confidence_sum / len(entries)
+        level_counts = dict(stats.levels)
         
         # Get key decisions
         key_decisions = [
@@ -263,7 +523,7 @@ class ChainOfThoughtLogger:
                 "confidence": e.confidence,
                 "timestamp": e.timestamp
             }
-            for e in entries if e.decision and e.confidence > 0.7
+            for e in stats.key_decisions
         ]
         
         return {
@@ -278,17 +538,35 @@ class ChainOfThoughtLogger:
             "time_span": self._calculate_time_span(entries)
         }
     
+    @_locked
     def clear_logs(self, session_id: Optional[str] = None) -> int:
         """Clear logs, optionally for a specific session"""
+        self._ensure_loaded()
         if session_id:
-            original_count = len(self.entries)
-            self.entries = [e for e in self.entries if e.metadata.get("session_id") != session_id]
-            cleared_count = original_count - len(self.entries)
+            cleared_count = len(self._by_session.pop(session_id, ()))
+            self._session_stats.pop(session_id, None)
+            if cleared_count and not self._by_session:
+                # Every kept entry belonged to the cleared session
+                self._reset_entries()
+            elif cleared_count:
+                # Other sessions keep their index entries; rebuild the rest in one pass
+                kept: Deque[ChainOfThoughtEntry] = deque(maxlen=self.max_entries)
+                self._by_agent = {}
+                self._stats = _SummaryStats()
+                for entry in self._entries:
+                    if entry.metadata.get("session_id") != session_id:
+                        kept.append(entry)
+                        self._by_agent.setdefault(entry.agent, deque()).append(entry)
+                        self._stats.add(entry)
+                self._entries = kept
+                self._blob_pack = None
         else:
-            cleared_count = len(self.entries)
-            self.entries = []
+            cleared_count = len(self._entries)
+            self._reset_entries()
         
-        self._save_logs()
+        if cleared_count:
+            self.revision += 1
+        self.compact()
         return cleared_count
     
     def start_new_session(self) -> str:
@@ -296,73 +574,244 @@ class ChainOfThoughtLogger:
         self.current_session_id = self._generate_session_id()
         return self.current_session_id
     
+    def new_session_id(self) -> str:
+        """Create a session id for log_step(session_id=...) without changing the current session"""
+        return self._generate_session_id()
+    
+    def _append_entry(self, entry: ChainOfThoughtEntry) -> None:
+        """Add an entry to the ring buffer and the session/agent indexes"""
+        if len(self._entries) == self.max_entries:
+            # The entry about to be evicted is the oldest one in its indexes too
+            evicted = self._entries[0]
+            evicted_session = evicted.metadata.get("session_id")
+            self._unindex_oldest(self._by_session, evicted_session)
+            self._unindex_oldest(self._by_agent, evicted.agent)
+            self._stats.remove_oldest(evicted)
+            if evicted_session in self._by_session:
+                self._session_stats[evicted_session].remove_oldest(evicted)
+            else:
+                del self._session_stats[evicted_session]
+        
+        self._blob_pack = None
+        self.revision += 1
+        
+        session_id = entry.metadata.get("session_id")
+        self._entries.append(entry)
+        self._by_session.setdefault(session_id, deque()).append(entry)
+        self._by_agent.setdefault(entry.agent, deque()).append(entry)
+        self._stats.add(entry)
+        self._session_stats.setdefault(session_id, _SummaryStats()).add(entry)
+    
+    @staticmethod
+    def _unindex_oldest(index: Dict[str, Deque[ChainOfThoughtEntry]], key: Optional[str]) -> None:
+        """Drop the oldest entry under key, and the key once it has none left"""
+        bucket = index[key]
+        bucket.popleft()
+        if not bucket:
+            del index[key]
+    
     def _generate_session_id(self) -> str:
         """Generate a unique session ID"""
-        return f"session_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{datetime.now().microsecond}"
+        now = datetime.now()
+        return sys.intern(f"session_{now:%Y%m%d_%H%M%S}_{now.microsecond}")
+    
+    def _isoformat_ns(self, timestamp_ns: int) -> str:
+        """Local ISO timestamp with microseconds, formatting the date-time part once per second"""
+        second, remainder_ns = divmod(timestamp_ns, 1_000_000_000)
+        cached_second, prefix = self._iso_cache
+        if second != cached_second:
+            prefix = datetime.fromtimestamp(second).isoformat()
+            self._iso_cache = (second, prefix)
+        return f"{prefix}.{remainder_ns // 1000:06d}"
     
     def _load_logs(self) -> None:
         """Load existing logs from file"""
         if os.path.exists(self.log_file):
             try:
-                with open(self.log_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    
-                # Load entries if they exist
-                if isinstance(data, dict) and "entries" in data:
-                    entries_data = data["entries"]
-                elif isinstance(data, list):
-                    entries_data = data
-                else:
-                    entries_data = []
+                with open(self.log_file, 'rb') as f:
+                    if self._is_legacy_file():
+                        # Legacy format: one JSON document holding every entry
+                        data = _loads_json(f.read())
+                        if isinstance(data, dict) and "entries" in data:
+                            entries_data = data["entries"]
+                        elif isinstance(data, list):
+                            entries_data = data
+                        else:
+                            entries_data = []
+                        legacy = True
+                        malformed = 0
+                    else:
+                        # JSON Lines: only the most recent lines are parsed
+                        line_count = 0
+                        recent_lines = deque(maxlen=self.max_entries)
+                        for line in f:
+                            if line.strip():
+                                recent_lines.append(line)
+                                line_count += 1
+                        entries_data = []
+                        for line in recent_lines:
+                            try:
+                                entries_data.append(_loads_json(line))
+                            except ValueError:
+                                # A line cut short by a crash during an append
+                                print(f"Skipping malformed log line in {self.log_file}")
+                        malformed = len(recent_lines) - len(entries_data)
+                        self._appended = line_count - len(recent_lines)
+                        legacy = False
                 
                 # Convert to ChainOfThoughtEntry objects
                 for entry_data in entries_data[-self.max_entries:]:  # Load only recent entries
                     try:
-                        # Convert tool calls
-                        tool_calls = []
-                        for tool_data in entry_data.get("tool_calls", []):
-                            tool_calls.append(ToolCall(**tool_data))
-                        
-                        # Create entry
-                        entry = ChainOfThoughtEntry(
-                            timestamp=entry_data["timestamp"],
-                            agent=entry_data["agent"],
-                            step_id=entry_data["step_id"],
-                            input_prompt=entry_data["input_prompt"],
-                            tool_calls=tool_calls,
-                            llm_response=entry_data["llm_response"],
-                            decision=entry_data["decision"],
-                            reasoning=entry_data["reasoning"],
-                            confidence=entry_data["confidence"],
-                            level=LogLevel(entry_data["level"]),
-                            metadata=entry_data["metadata"]
-                        )
-                        self.entries.append(entry)
+                        self._append_entry(self._entry_from_dict(entry_data))
                         
                     except Exception as e:
                         print(f"Error loading log entry: {e}")
                         continue
+                
+                # Rewrite legacy, oversized or torn files as JSON Lines of the kept entries
+                if legacy or self._appended or malformed:
+                    self.compact()
                         
-            except Exception as e:
+            except (OSError, ValueError) as e:
                 print(f"Error loading logs: {e}")
     
-    def _save_logs(self) -> None:
-        """Save logs to file"""
+    def _is_legacy_file(self) -> bool:
+        """Whether the log file holds one JSON document instead of JSON Lines"""
         try:
-            export_data = {
-                "session_id": self.current_session_id,
-                "saved_at": datetime.now().isoformat(),
-                "total_entries": len(self.entries),
-                "entries": [entry.to_dict() for entry in self.entries]
-            }
+            with open(self.log_file, 'rb') as f:
+                first_line = f.readline()
+        except OSError:
+            return False
+        if not first_line.lstrip().startswith((b"{", b"[")):
+            return False
+        try:
+            data = _loads_json(first_line)
+        except ValueError:
+            return True
+        return not (isinstance(data, dict) and "step_id" in data)
+    
+    @staticmethod
+    def _entry_from_dict(entry_data: Dict[str, Any]) -> ChainOfThoughtEntry:
+        """Rebuild an entry from its to_dict() form"""
+        missing = _REQUIRED_ENTRY_KEYS - entry_data.keys()
+        if missing:
+            raise KeyError(f"missing fields {sorted(missing)}")
+        
+        # Fill the slots directly instead of dispatching through __init__
+        entry = ChainOfThoughtEntry.__new__(ChainOfThoughtEntry)
+        for name in _REQUIRED_ENTRY_KEYS:
+            setattr(entry, name, entry_data[name])
+        # Share repeated agent names and session ids with live entries
+        entry.agent = entry_data["agent"] = sys.intern(entry_data["agent"])
+        session_id = entry.metadata.get("session_id")
+        if isinstance(session_id, str):
+            entry.metadata["session_id"] = sys.intern(session_id)
+        entry.tool_calls = [ToolCall(**tool_data) for tool_data in entry_data.get("tool_calls", ())]
+        entry.level = LogLevel(entry_data["level"])
+        # The loaded record already has the to_dict() layout
+        entry._cached_dict = entry_data if "tool_calls" in entry_data else None
+        entry._search_blob = ""
+        return entry
+    
+    def _save_logs(self, entry: ChainOfThoughtEntry) -> None:
+        """Queue one entry to be appended to the log file, or write it directly without a writer"""
+        while self._writer.is_alive():
+            try:
+                self._queue.put(entry, timeout=LOG_QUEUE_PUT_TIMEOUT_S)
+                break
+            except queue.Full:
+                continue
+        else:
+            # Closed logger or stopped writer: a full queue would otherwise block forever
+            self._write_batch([entry])
+        
+        # Drop lines for evicted entries once the file holds twice what is kept
+        if self._appended >= self.max_entries:
+            self.compact()
+    
+    def _writer_loop(self) -> None:
+        """Append queued entries to the log file, one write per batch"""
+        while True:
+            entry = self._queue.get()
+            if entry is None:
+                self._queue.task_done()
+                return
             
-            with open(self.log_file, 'w', encoding='utf-8') as f:
-                json.dump(export_data, f, indent=2, ensure_ascii=False)
-                
+            # Take whatever else is already waiting so the batch is written at once
+            batch = [entry]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = batch[-1] is None
+            if stop:
+                batch.pop()
+            
+            try:
+                self._write_batch(batch)
+            finally:
+                for _ in range(len(batch) + stop):
+                    self._queue.task_done()
+            
+            if stop:
+                return
+    
+    def _write_batch(self, batch: List[ChainOfThoughtEntry]) -> None:
+        """Append entries to the log file; errors are reported once and never raised"""
+        try:
+            data = b"".join(_dumps_line(e) for e in batch)
+            with self._io_lock:
+                if self._fh is None:
+                    with open(self.log_file, "ab") as f:
+                        f.write(data)
+                else:
+                    self._fh.write(data)
+                    self._fh.flush()
+                self._appended += len(batch)
+            self._write_failed = False
         except Exception as e:
-            print(f"Error saving logs: {e}")
+            # Anything escaping here would stop the writer thread
+            if not self._write_failed:
+                self._write_failed = True
+                print(f"Error saving logs: {e}", file=sys.stderr)
+    
+    def flush(self) -> None:
+        """Wait until every queued entry has been written"""
+        if self._writer.is_alive():
+            self._queue.join()
+    
+    @_locked
+    def compact(self) -> None:
+        """Rewrite the log file with only the entries kept in memory"""
+        self._ensure_loaded()
+        self.flush()
+        with self._io_lock:
+            try:
+                if self._fh is not None:
+                    self._fh.close()
+                
+                _replace_file(self.log_file, b"".join(_dumps_line(entry) for entry in self._entries))
+                self._appended = 0
+                
+            except (OSError, TypeError, ValueError) as e:
+                print(f"Error compacting logs: {e}")
+            finally:
+                if self._fh is not None:
+                    self._fh = open(self.log_file, "ab")
+    
+    def close(self) -> None:
+        """Write pending entries, compact the log file and stop the writer"""
+        if self._fh is None:
+            return
+        self.compact()
+        self._queue.put(None)
+        self._writer.join()
+        atexit.unregister(self.flush)
+        self._fh.close()
+        self._fh = None
     
-    def _calculate_time_span(self, entries: List[ChainOfThoughtEntry]) -> str:
+    def _calculate_time_span(self, entries: Sequence[ChainOfThoughtEntry]) -> str:
         """Calculate time span of entries"""
         if not entries:
             return "0 seconds"
@@ -385,15 +834,18 @@ class ChainOfThoughtLogger:
         except:
             return "unknown"
 
-# Global logger instance
-_global_logger = None
+# Logger instances per log file; a file must only ever be written by one logger
+_loggers: Dict[str, ChainOfThoughtLogger] = {}
+_loggers_lock = threading.Lock()
 
-def get_logger(log_file: str = "logs/chain_of_thought.json") -> ChainOfThoughtLogger:
-    """Get or create global logger instance"""
-    global _global_logger
-    if _global_logger is None:
-        _global_logger = ChainOfThoughtLogger(log_file)
-    return _global_logger
+def get_logger(log_file: str = "logs/chain_of_thought.jsonl") -> ChainOfThoughtLogger:
+    """Get or create the logger instance for a log file"""
+    key = os.path.abspath(log_file)
+    with _loggers_lock:
+        logger = _loggers.get(key)
+        if logger is None:
+            logger = _loggers[key] = ChainOfThoughtLogger(log_file)
+    return logger
 
 def log_agent_step(agent: str, **kwargs) -> str:
     """Convenience function to log an agent step"""
@@ -4,12 +4,51 @@ Configuration Management Module - Handles application settings and API keys
 
 import os
 import json
-from typing import Dict, Any, Optional, List
-from dataclasses import dataclass, asdict
+from typing import Dict, Any, Optional, List, Tuple
+from dataclasses import dataclass, field, fields
 from dotenv import load_dotenv
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+_env_loaded = False
+
+def load_environment() -> None:
+    """Load variables from .env into the process environment, once per process"""
+    global _env_loaded
+    if not _env_loaded:
+        load_dotenv()
+        _env_loaded = True
+
 # Load environment variables
-load_dotenv()
+load_environment()
+
+def _write_json(file_path: str, data: Dict[str, Any]) -> None:
+    """Write indented JSON holding config dataclasses, using orjson when available"""
+    if ORJSON_AVAILABLE:
+        # orjson serializes dataclasses natively, without a dict copy
+        with open(file_path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        return
+    with open(file_path, 'w') as f:
+        json.dump(data, f, indent=2, default=_section_dict)
+
+def _section_dict(section: Any) -> Dict[str, Any]:
+    """Field values of a flat config dataclass, without asdict()'s recursive deep copy"""
+    return {f.name: getattr(section, f.name) for f in fields(section) if not f.name.startswith("_")}
+
+# APIConfig fields filled from the environment when not given: (variable, default)
+_API_ENV_VARS = {
+    "serpapi_key": ("SERPAPI_KEY", None),
+    "openai_api_key": ("OPENAI_API_KEY", None),
+    "arxiv_api_key": ("ARXIV_API_KEY", None),
+    "pubmed_api_key": ("PUBMED_API_KEY", None),
+    "pinecone_api_key": ("PINECONE_API_KEY", None),
+    "pinecone_environment": ("PINECONE_ENVIRONMENT", "us-west1-gcp")
+}
 
 @dataclass
 class APIConfig:
@@ -20,46 +59,49 @@ class APIConfig:
     pubmed_api_key: Optional[str] = None
     pinecone_api_key: Optional[str] = None
     pinecone_environment: str = "us-west1-gcp"
+    # (all, required, optional) key availability; cleared whenever a field is set
+    _key_status: Optional[Tuple[Dict[str, bool], Dict[str, bool], Dict[str, bool]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        if not name.startswith("_"):
+            object.__setattr__(self, "_key_status", None)
     
     def __post_init__(self):
         """Load API keys from environment variables if not provided"""
-        if not self.serpapi_key:
-            self.serpapi_key = os.getenv("SERPAPI_KEY")
-        if not self.openai_api_key:
-            self.openai_api_key = os.getenv("OPENAI_API_KEY")
-        if not self.arxiv_api_key:
-            self.arxiv_api_key = os.getenv("ARXIV_API_KEY")
-        if not self.pubmed_api_key:
-            self.pubmed_api_key = os.getenv("PUBMED_API_KEY")
-        if not self.pinecone_api_key:
-            self.pinecone_api_key = os.getenv("PINECONE_API_KEY")
-        if not self.pinecone_environment:
-            self.pinecone_environment = os.getenv("PINECONE_ENVIRONMENT", "us-west1-gcp")
+        for name, (env_var, default) in _API_ENV_VARS.items():
+            # Values given explicitly (e.g. loaded from the config file) skip the lookup
+            if not getattr(self, name):
+                setattr(self, name, os.environ.get(env_var, default))
+    
+    def _key_statuses(self) -> Tuple[Dict[str, bool], Dict[str, bool], Dict[str, bool]]:
+        """Cached (all, required, optional) key availability"""
+        if self._key_status is None:
+            validation = {
+                "serpapi": bool(self.serpapi_key),
+                "openai": bool(self.openai_api_key),
+                "arxiv": bool(self.arxiv_api_key),
+                "pubmed": bool(self.pubmed_api_key),
+                "pinecone": bool(self.pinecone_api_key)
+            }
+            required = {name: validation[name] for name in ("serpapi", "openai")}
+            optional = {name: validation[name] for name in ("arxiv", "pubmed", "pinecone")}
+            object.__setattr__(self, "_key_status", (validation, required, optional))
+        return self._key_status
     
     def validate(self) -> Dict[str, bool]:
-        """Validate API key availability"""
-        return {
-            "serpapi": bool(self.serpapi_key),
-            "openai": bool(self.openai_api_key),
-            "arxiv": bool(self.arxiv_api_key),
-            "pubmed": bool(self.pubmed_api_key),
-            "pinecone": bool(self.pinecone_api_key)
-        }
+        """Validate API key availability (cached; treat as read-only)"""
+        return self._key_statuses()[0]
     
     def get_required_keys(self) -> Dict[str, bool]:
-        """Get status of required API keys"""
-        return {
-            "serpapi": bool(self.serpapi_key),
-            "openai": bool(self.openai_api_key)
-        }
+        """Get status of required API keys (cached; treat as read-only)"""
+        return self._key_statuses()[1]
     
     def get_optional_keys(self) -> Dict[str, bool]:
-        """Get status of optional API keys"""
-        return {
-            "arxiv": bool(self.arxiv_api_key),
-            "pubmed": bool(self.pubmed_api_key),
-            "pinecone": bool(self.pinecone_api_key)
-        }
+        """Get status of optional API keys (cached; treat as read-only)"""
+        return self._key_statuses()[2]
 
 @dataclass
 class ResearchConfig:
@@ -107,7 +149,7 @@ class MemoryConfig:
 class LoggingConfig:
     """Configuration for logging and chain-of-thought"""
     log_level: str = "INFO"
-    log_file: str = "logs/chain_of_thought.json"
+    log_file: str = "logs/chain_of_thought.jsonl"
     max_log_entries: int = 1000
     auto_save_logs: bool = True
     include_tool_calls: bool = True
@@ -147,6 +189,9 @@ class ConfigManager:
     
     def __init__(self, config_file: str = "config.json"):
         self.config_file = config_file
+        # Formatted API status and the validation dict it was built from
+        self._api_status: Optional[Dict[str, str]] = None
+        self._api_status_source: Optional[Dict[str, bool]] = None
         self.api_config = APIConfig()
         self.research_config = ResearchConfig()
         self.memory_config = MemoryConfig()
@@ -190,19 +235,12 @@ class ConfigManager:
     def save_config(self) -> bool:
         """Save configuration to file"""
         try:
-            config_data = {
-                "api": asdict(self.api_config),
-                "research": asdict(self.research_config),
-                "memory": asdict(self.memory_config),
-                "logging": asdict(self.logging_config),
-                "ui": asdict(self.ui_config)
-            }
+            config_data = self._config_sections()
             
             # Create directory if it doesn't exist
             os.makedirs(os.path.dirname(self.config_file), exist_ok=True)
             
-            with open(self.config_file, 'w') as f:
-                json.dump(config_data, f, indent=2)
+            _write_json(self.config_file, config_data)
             
             return True
             
@@ -210,6 +248,16 @@ class ConfigManager:
             print(f"Error saving configuration: {e}")
             return False
     
+    def _config_sections(self) -> Dict[str, Any]:
+        """Configuration sections keyed as in the config file"""
+        return {
+            "api": self.api_config,
+            "research": self.research_config,
+            "memory": self.memory_config,
+            "logging": self.logging_config,
+            "ui": self.ui_config
+        }
+    
     def validate_all(self) -> Dict[str, bool]:
         """Validate all configuration sections"""
         return {
@@ -223,6 +271,9 @@ class ConfigManager:
     def get_api_status(self) -> Dict[str, str]:
         """Get API status with user-friendly messages"""
         validation = self.api_config.validate()
+        # validate() returns the same dict until a key changes or api_config is replaced
+        if validation is self._api_status_source:
+            return dict(self._api_status)
         required = self.api_config.get_required_keys()
         
         status = {}
@@ -236,7 +287,8 @@ class ConfigManager:
         status["PubMed"] = "✅ Ready" if validation["pubmed"] else "⚠️ Optional"
         status["Pinecone"] = "✅ Ready" if validation["pinecone"] else "⚠️ Optional"
         
-        return status
+        self._api_status, self._api_status_source = status, validation
+        return dict(status)
     
     def is_ready_for_research(self) -> bool:
         """Check if minimum requirements are met for research"""
@@ -302,16 +354,11 @@ class ConfigManager:
         """Export configuration to a different file"""
         try:
             config_data = {
-                "api": asdict(self.api_config),
-                "research": asdict(self.research_config),
-                "memory": asdict(self.memory_config),
-                "logging": asdict(self.logging_config),
-                "ui": asdict(self.ui_config),
+                **self._config_sections(),
                 "exported_at": "2024-01-01T00:00:00"  # Would use actual timestamp
             }
             
-            with open(file_path, 'w') as f:
-                json.dump(config_data, f, indent=2)
+            _write_json(file_path, config_data)
             
             return True
             
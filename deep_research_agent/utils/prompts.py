@@ -2,10 +2,78 @@
 Prompt Templates Module - Contains structured prompts for different agents and research phases
 """
 
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass
+import re
+import string
+import threading
+from types import MappingProxyType
+from functools import lru_cache
+from typing import Callable, Dict, FrozenSet, List, Any, Mapping, Optional, Sequence, Tuple
+from dataclasses import dataclass, field
 from enum import Enum
 
+_FORMATTER = string.Formatter()
+
+# Variable a format field refers to: "topic" in "{topic}", "{topic.title}" or "{topic[0]}"
+_FIELD_ROOT_RE = re.compile(r"[^.\[]*")
+
+# Rendered prompts kept per manager, keyed by template name and variables
+PROMPT_CACHE_SIZE = 512
+
+_Segments = List[Tuple[str, Optional[str], str]]
+
+def _parse_template(text: str) -> Optional[_Segments]:
+    """
+    Split a str.format template into (literal, name, format spec) segments
+    
+    Returns None for templates with attribute or index fields, conversions or
+    nested format specs, which are left to format_map.
+    """
+    segments = []
+    for literal, name, spec, conversion in _FORMATTER.parse(text):
+        if name is not None and (not name.isidentifier() or conversion or "{" in spec):
+            return None
+        segments.append((literal, name, spec))
+    return segments
+
+def _fold_segments(segments: _Segments, values: Mapping[str, Any]) -> _Segments:
+    """Format the fields whose values are given into the literal text around them"""
+    folded = []
+    text = []
+    for literal, name, spec in segments:
+        text.append(literal)
+        if name is None:
+            continue
+        if name in values:
+            text.append(format(values[name], spec))
+        else:
+            folded.append(("".join(text), name, spec))
+            text = []
+    folded.append(("".join(text), None, ""))
+    return folded
+
+def _compile_template(text: str) -> Callable[[Mapping[str, Any]], str]:
+    """
+    Compile a str.format template into a function rendering it from a mapping
+    
+    The template is parsed once, so a render only looks values up and joins.
+    """
+    segments = _parse_template(text)
+    if segments is None:
+        return text.format_map
+    return _segment_renderer(segments)
+
+def _segment_renderer(segments: _Segments) -> Callable[[Mapping[str, Any]], str]:
+    """Function joining the segments' literals with their formatted field values"""
+    def render(values: Mapping[str, Any]) -> str:
+        parts = []
+        for literal, name, spec in segments:
+            parts.append(literal)
+            if name is not None:
+                parts.append(format(values[name], spec))
+        return "".join(parts)
+    
+    return render
+
 class PromptType(Enum):
     """Types of prompts available"""
     PLANNER = "planner"
@@ -14,40 +82,79 @@ class PromptType(Enum):
     ANALYZER = "analyzer"
     SUMMARIZER = "summarizer"
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PromptTemplate:
-    """Structure for prompt templates"""
+    """
+    Structure for prompt templates
+    
+    A prompt is static_prefix followed by the rendered template. The prefix holds
+    the fixed instructions, so LLM providers can cache it across calls.
+    """
     name: str
     type: PromptType
     template: str
-    variables: List[str]
+    # Stored as a tuple, so templates stay hashable
+    variables: Sequence[str]
     description: str
-    example_input: Dict[str, Any]
-    expected_output: str
-
-class PromptManager:
-    """Manager for prompt templates and generation"""
+    # Documentation only; the default templates keep theirs in _TEMPLATE_DOCS
+    example_input: Optional[Dict[str, Any]] = field(default=None, compare=False)
+    expected_output: Optional[str] = None
+    static_prefix: str = ""
+    # Variable names a render must be given, checked with one set difference
+    required_vars: FrozenSet[str] = field(init=False, repr=False, compare=False)
+    # Variables referenced by template fields, in order of first use
+    placeholders: Tuple[str, ...] = field(init=False, repr=False, compare=False)
+    # Renderer compiled from template on first use
+    _renderer: Optional[Callable[[Mapping[str, Any]], str]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # Read-only get_template_info() result, built on first request
+    _info: Optional[Mapping[str, Any]] = field(default=None, init=False, repr=False, compare=False)
     
-    def __init__(self):
-        self.templates = {}
-        self._initialize_templates()
+    def __post_init__(self):
+        # Frozen: normalized and derived fields are set through object.__setattr__
+        object.__setattr__(self, "variables", tuple(self.variables))
+        object.__setattr__(self, "required_vars", frozenset(self.variables))
+        # Parsed rather than regex-matched so escaped braces ("{{x}}") are not fields
+        names = (name for _, name, _, _ in _FORMATTER.parse(self.template) if name is not None)
+        object.__setattr__(self, "placeholders", tuple(dict.fromkeys(
+            _FIELD_ROOT_RE.match(name).group() for name in names
+        )))
+        if set(self.placeholders) != self.required_vars:
+            raise ValueError(
+                f"Template '{self.name}' fields {sorted(self.placeholders)} "
+                f"do not match its variables {sorted(self.required_vars)}"
+            )
     
-    def _initialize_templates(self):
-        """Initialize default prompt templates"""
-        
-        # Planner Agent Prompts
-        self.templates["research_planner"] = PromptTemplate(
-            name="research_planner",
-            type=PromptType.PLANNER,
-            template="""You are a Research Planning Agent. Your task is to analyze a research topic and create a comprehensive research plan.
-
-TOPIC: {topic}
-
-CONTEXT:
-- Research depth: {depth}
-- Available sources: {sources}
-- Time constraint: {time_limit}
-- Target audience: {audience}
+    def check_variables(self, values: Mapping[str, Any]) -> None:
+        """Raise ValueError naming any required variables missing from values"""
+        missing = self.required_vars - values.keys()
+        if missing:
+            names = ", ".join(f"'{name}'" for name in sorted(missing))
+            plural = "s" if len(missing) > 1 else ""
+            raise ValueError(f"Missing required variable{plural} {names} for template '{self.name}'")
+    
+    def render(self, values: Mapping[str, Any]) -> str:
+        """Fill the template from a mapping of its variables, after the static prefix"""
+        return self.static_prefix + self.render_dynamic(values)
+    
+    def render_dynamic(self, values: Mapping[str, Any]) -> str:
+        """Fill the template from a mapping of its variables, without the static prefix"""
+        return self.renderer()(values)
+    
+    def renderer(self) -> Callable[[Mapping[str, Any]], str]:
+        """Compiled renderer of the template (without the static prefix)"""
+        if self._renderer is None:
+            object.__setattr__(self, "_renderer", _compile_template(self.template))
+        return self._renderer
+
+# Planner Agent Prompts
+def _make_research_planner() -> PromptTemplate:
+    """Creates a structured research plan for any given topic"""
+    return PromptTemplate(
+        name="research_planner",
+        type=PromptType.PLANNER,
+        static_prefix="""You are a Research Planning Agent. Your task is to analyze a research topic and create a comprehensive research plan.
 
 INSTRUCTIONS:
 1. Analyze the topic to understand its scope and complexity
@@ -73,33 +180,27 @@ EXAMPLE SECTIONS:
 - Future Implications
 - Conclusion
 
-Generate a comprehensive research plan now.""",
-            variables=["topic", "depth", "sources", "time_limit", "audience"],
-            description="Creates a structured research plan for any given topic",
-            example_input={
-                "topic": "AI Ethics in Healthcare",
-                "depth": "comprehensive",
-                "sources": ["web", "academic", "news"],
-                "time_limit": "30 minutes",
-                "audience": "general"
-            },
-            expected_output="JSON with research plan structure"
-        )
-        
-        # Researcher Agent Prompts
-        self.templates["web_researcher"] = PromptTemplate(
-            name="web_researcher",
-            type=PromptType.RESEARCHER,
-            template="""You are a Web Research Agent. Your task is to gather and analyze information from web sources for a specific research section.
-
-RESEARCH SECTION: {section}
-MAIN TOPIC: {topic}
-SEARCH RESULTS: {search_results}
+""",
+        template="""TOPIC: {topic}
 
 CONTEXT:
-- Research focus: {focus}
-- Required depth: {depth}
-- Source quality threshold: {quality_threshold}
+- Research depth: {depth}
+- Available sources: {sources}
+- Time constraint: {time_limit}
+- Target audience: {audience}
+
+Generate a comprehensive research plan now.""",
+        variables=["topic", "depth", "sources", "time_limit", "audience"],
+        description="Creates a structured research plan for any given topic"
+    )
+
+# Researcher Agent Prompts
+def _make_web_researcher() -> PromptTemplate:
+    """Analyzes web search results for a specific research section"""
+    return PromptTemplate(
+        name="web_researcher",
+        type=PromptType.RESEARCHER,
+        static_prefix="""You are a Web Research Agent. Your task is to gather and analyze information from web sources for a specific research section.
 
 INSTRUCTIONS:
 1. Analyze the provided search results for relevance and credibility
@@ -117,33 +218,27 @@ Provide a structured response with:
 - "confidence_score": Your confidence in the findings (0-1)
 - "summary": Concise summary of the section content
 
-Focus on accuracy, relevance, and providing actionable insights.""",
-            variables=["section", "topic", "search_results", "focus", "depth", "quality_threshold"],
-            description="Analyzes web search results for a specific research section",
-            example_input={
-                "section": "Current Applications",
-                "topic": "AI in Healthcare",
-                "search_results": "[search results data]",
-                "focus": "practical applications",
-                "depth": "detailed",
-                "quality_threshold": "0.7"
-            },
-            expected_output="Structured analysis of web research findings"
-        )
-        
-        self.templates["academic_researcher"] = PromptTemplate(
-            name="academic_researcher",
-            type=PromptType.RESEARCHER,
-            template="""You are an Academic Research Agent. Your task is to analyze academic papers and research for a specific research section.
-
-RESEARCH SECTION: {section}
+""",
+        template="""RESEARCH SECTION: {section}
 MAIN TOPIC: {topic}
-ACADEMIC SOURCES: {academic_sources}
+SEARCH RESULTS: {search_results}
 
 CONTEXT:
-- Research methodology focus: {methodology}
-- Publication date range: {date_range}
-- Academic rigor required: {rigor_level}
+- Research focus: {focus}
+- Required depth: {depth}
+- Source quality threshold: {quality_threshold}
+
+Focus on accuracy, relevance, and providing actionable insights.""",
+        variables=["section", "topic", "search_results", "focus", "depth", "quality_threshold"],
+        description="Analyzes web search results for a specific research section"
+    )
+
+def _make_academic_researcher() -> PromptTemplate:
+    """Analyzes academic sources for research sections"""
+    return PromptTemplate(
+        name="academic_researcher",
+        type=PromptType.RESEARCHER,
+        static_prefix="""You are an Academic Research Agent. Your task is to analyze academic papers and research for a specific research section.
 
 INSTRUCTIONS:
 1. Analyze academic papers for methodological soundness
@@ -162,35 +257,28 @@ Provide a scholarly analysis with:
 - "citation_summary": Brief summary of key papers
 - "confidence_score": Confidence in academic evidence (0-1)
 
-Maintain academic rigor and cite specific studies when relevant.""",
-            variables=["section", "topic", "academic_sources", "methodology", "date_range", "rigor_level"],
-            description="Analyzes academic sources for research sections",
-            example_input={
-                "section": "Research Methods",
-                "topic": "Machine Learning in Diagnostics",
-                "academic_sources": "[academic papers data]",
-                "methodology": "empirical",
-                "date_range": "2020-2024",
-                "rigor_level": "high"
-            },
-            expected_output="Academic analysis with research findings and methodology assessment"
-        )
-        
-        # Writer Agent Prompts
-        self.templates["report_writer"] = PromptTemplate(
-            name="report_writer",
-            type=PromptType.WRITER,
-            template="""You are a Report Writing Agent. Your task is to compile research data into a well-structured, comprehensive report.
-
-TOPIC: {topic}
-RESEARCH DATA: {research_data}
-TARGET AUDIENCE: {audience}
-REPORT LENGTH: {length}
+""",
+        template="""RESEARCH SECTION: {section}
+MAIN TOPIC: {topic}
+ACADEMIC SOURCES: {academic_sources}
 
 CONTEXT:
-- Writing style: {style}
-- Technical level: {technical_level}
-- Include citations: {include_citations}
+- Research methodology focus: {methodology}
+- Publication date range: {date_range}
+- Academic rigor required: {rigor_level}
+
+Maintain academic rigor and cite specific studies when relevant.""",
+        variables=["section", "topic", "academic_sources", "methodology", "date_range", "rigor_level"],
+        description="Analyzes academic sources for research sections"
+    )
+
+# Writer Agent Prompts
+def _make_report_writer() -> PromptTemplate:
+    """Compiles research data into a structured report"""
+    return PromptTemplate(
+        name="report_writer",
+        type=PromptType.WRITER,
+        static_prefix="""You are a Report Writing Agent. Your task is to compile research data into a well-structured, comprehensive report.
 
 INSTRUCTIONS:
 1. Create a logical flow of information
@@ -216,35 +304,29 @@ WRITING GUIDELINES:
 - Highlight important insights
 - Ensure factual accuracy
 
-Write a comprehensive report now.""",
-            variables=["topic", "research_data", "audience", "length", "style", "technical_level", "include_citations"],
-            description="Compiles research data into a structured report",
-            example_input={
-                "topic": "AI Ethics Implementation",
-                "research_data": "[compiled research findings]",
-                "audience": "business executives",
-                "length": "medium",
-                "style": "professional",
-                "technical_level": "moderate",
-                "include_citations": "true"
-            },
-            expected_output="Complete structured report with all sections"
-        )
-        
-        # Analyzer Agent Prompts
-        self.templates["data_analyzer"] = PromptTemplate(
-            name="data_analyzer",
-            type=PromptType.ANALYZER,
-            template="""You are a Data Analysis Agent. Your task is to analyze research data and identify patterns, trends, and insights.
-
-RESEARCH DATA: {data}
-ANALYSIS FOCUS: {focus}
-ANALYSIS TYPE: {analysis_type}
+""",
+        template="""TOPIC: {topic}
+RESEARCH DATA: {research_data}
+TARGET AUDIENCE: {audience}
+REPORT LENGTH: {length}
 
 CONTEXT:
-- Data sources: {sources}
-- Time period: {time_period}
-- Analysis depth: {depth}
+- Writing style: {style}
+- Technical level: {technical_level}
+- Include citations: {include_citations}
+
+Write a comprehensive report now.""",
+        variables=["topic", "research_data", "audience", "length", "style", "technical_level", "include_citations"],
+        description="Compiles research data into a structured report"
+    )
+
+# Analyzer Agent Prompts
+def _make_data_analyzer() -> PromptTemplate:
+    """Analyzes research data to identify patterns and insights"""
+    return PromptTemplate(
+        name="data_analyzer",
+        type=PromptType.ANALYZER,
+        static_prefix="""You are a Data Analysis Agent. Your task is to analyze research data and identify patterns, trends, and insights.
 
 INSTRUCTIONS:
 1. Examine the data for patterns and trends
@@ -263,34 +345,28 @@ Provide analysis results with:
 - "confidence_level": Confidence in analysis (0-1)
 - "recommendations": Suggested actions based on analysis
 
-Focus on actionable insights and clear explanations.""",
-            variables=["data", "focus", "analysis_type", "sources", "time_period", "depth"],
-            description="Analyzes research data to identify patterns and insights",
-            example_input={
-                "data": "[research dataset]",
-                "focus": "market trends",
-                "analysis_type": "trend analysis",
-                "sources": "multiple",
-                "time_period": "2020-2024",
-                "depth": "comprehensive"
-            },
-            expected_output="Detailed analysis with patterns, trends, and insights"
-        )
-        
-        # Summarizer Agent Prompts
-        self.templates["content_summarizer"] = PromptTemplate(
-            name="content_summarizer",
-            type=PromptType.SUMMARIZER,
-            template="""You are a Content Summarization Agent. Your task is to create concise, accurate summaries of research content.
-
-CONTENT TO SUMMARIZE: {content}
-SUMMARY TYPE: {summary_type}
-TARGET LENGTH: {target_length}
+""",
+        template="""RESEARCH DATA: {data}
+ANALYSIS FOCUS: {focus}
+ANALYSIS TYPE: {analysis_type}
 
 CONTEXT:
-- Key focus areas: {focus_areas}
-- Audience level: {audience_level}
-- Include key statistics: {include_stats}
+- Data sources: {sources}
+- Time period: {time_period}
+- Analysis depth: {depth}
+
+Focus on actionable insights and clear explanations.""",
+        variables=["data", "focus", "analysis_type", "sources", "time_period", "depth"],
+        description="Analyzes research data to identify patterns and insights"
+    )
+
+# Summarizer Agent Prompts
+def _make_content_summarizer() -> PromptTemplate:
+    """Creates concise summaries of research content"""
+    return PromptTemplate(
+        name="content_summarizer",
+        type=PromptType.SUMMARIZER,
+        static_prefix="""You are a Content Summarization Agent. Your task is to create concise, accurate summaries of research content.
 
 INSTRUCTIONS:
 1. Identify the most important information
@@ -313,83 +389,306 @@ SUMMARY TYPES:
 - "general": Accessible summary for general audience
 - "bullet": Key points in bullet format
 
+""",
+        template="""CONTENT TO SUMMARIZE: {content}
+SUMMARY TYPE: {summary_type}
+TARGET LENGTH: {target_length}
+
+CONTEXT:
+- Key focus areas: {focus_areas}
+- Audience level: {audience_level}
+- Include key statistics: {include_stats}
+
 Create an effective summary now.""",
-            variables=["content", "summary_type", "target_length", "focus_areas", "audience_level", "include_stats"],
-            description="Creates concise summaries of research content",
-            example_input={
-                "content": "[research content to summarize]",
-                "summary_type": "executive",
-                "target_length": "200 words",
-                "focus_areas": "key findings, recommendations",
-                "audience_level": "executive",
-                "include_stats": "true"
-            },
-            expected_output="Concise summary with key points and statistics"
-        )
+        variables=["content", "summary_type", "target_length", "focus_areas", "audience_level", "include_stats"],
+        description="Creates concise summaries of research content"
+    )
+
+# Usage examples of the default templates, for get_template_info() and documentation;
+# kept out of the template instances used for rendering
+_TEMPLATE_DOCS: Dict[str, Dict[str, Any]] = {
+    "research_planner": {
+        "example_input": {
+            "topic": "AI Ethics in Healthcare",
+            "depth": "comprehensive",
+            "sources": ["web", "academic", "news"],
+            "time_limit": "30 minutes",
+            "audience": "general"
+        },
+        "expected_output": "JSON with research plan structure"
+    },
+    "web_researcher": {
+        "example_input": {
+            "section": "Current Applications",
+            "topic": "AI in Healthcare",
+            "search_results": "[search results data]",
+            "focus": "practical applications",
+            "depth": "detailed",
+            "quality_threshold": "0.7"
+        },
+        "expected_output": "Structured analysis of web research findings"
+    },
+    "academic_researcher": {
+        "example_input": {
+            "section": "Research Methods",
+            "topic": "Machine Learning in Diagnostics",
+            "academic_sources": "[academic papers data]",
+            "methodology": "empirical",
+            "date_range": "2020-2024",
+            "rigor_level": "high"
+        },
+        "expected_output": "Academic analysis with research findings and methodology assessment"
+    },
+    "report_writer": {
+        "example_input": {
+            "topic": "AI Ethics Implementation",
+            "research_data": "[compiled research findings]",
+            "audience": "business executives",
+            "length": "medium",
+            "style": "professional",
+            "technical_level": "moderate",
+            "include_citations": "true"
+        },
+        "expected_output": "Complete structured report with all sections"
+    },
+    "data_analyzer": {
+        "example_input": {
+            "data": "[research dataset]",
+            "focus": "market trends",
+            "analysis_type": "trend analysis",
+            "sources": "multiple",
+            "time_period": "2020-2024",
+            "depth": "comprehensive"
+        },
+        "expected_output": "Detailed analysis with patterns, trends, and insights"
+    },
+    "content_summarizer": {
+        "example_input": {
+            "content": "[research content to summarize]",
+            "summary_type": "executive",
+            "target_length": "200 words",
+            "focus_areas": "key findings, recommendations",
+            "audience_level": "executive",
+            "include_stats": "true"
+        },
+        "expected_output": "Concise summary with key points and statistics"
+    }
+}
+
+# Default templates, built by each PromptManager on first use
+_DEFAULT_TEMPLATES: Dict[str, Callable[[], PromptTemplate]] = {
+    "research_planner": _make_research_planner,
+    "web_researcher": _make_web_researcher,
+    "academic_researcher": _make_academic_researcher,
+    "report_writer": _make_report_writer,
+    "data_analyzer": _make_data_analyzer,
+    "content_summarizer": _make_content_summarizer
+}
+
+class TemplateNotFoundError(KeyError, ValueError):
+    """No prompt template is registered under the requested name"""
+    
+    def __init__(self, template_name: str):
+        super().__init__(template_name)
+        self.template_name = template_name
+    
+    def __str__(self) -> str:
+        return f"Template '{self.template_name}' not found"
+
+class TemplateDict(dict):
+    """Templates by name; a missing name is passed to on_missing, which builds or raises"""
+    
+    def __init__(self, on_missing: Callable[[str], PromptTemplate]):
+        super().__init__()
+        self._on_missing = on_missing
+    
+    def __missing__(self, template_name: str) -> PromptTemplate:
+        return self._on_missing(template_name)
+
+class PromptManager:
+    """Manager for prompt templates and generation"""
+    
+    def __init__(self):
+        # Indexing builds a pending default template or raises TemplateNotFoundError
+        self.templates = TemplateDict(self._build_default)
+        # Templates per type, keyed by name, kept in step with self.templates
+        self._by_type: Dict[PromptType, Dict[str, PromptTemplate]] = {}
+        self._render_cached = lru_cache(maxsize=PROMPT_CACHE_SIZE)(self._render_frozen)
+        # Default templates not built yet; each is built on first lookup
+        self._pending: Dict[str, Callable[[], PromptTemplate]] = dict(_DEFAULT_TEMPLATES)
+        self._build_lock = threading.Lock()
+        # Names whose current template is a built default, documented in _TEMPLATE_DOCS
+        self._default_names = set()
     
     def get_template(self, template_name: str) -> Optional[PromptTemplate]:
         """Get a specific prompt template"""
-        return self.templates.get(template_name)
+        try:
+            return self.templates[template_name]
+        except TemplateNotFoundError:
+            return None
+    
+    def _build_default(self, template_name: str) -> PromptTemplate:
+        """Build and register a pending default template, for names missing from templates"""
+        with self._build_lock:
+            # Another thread may have built it while this one waited
+            factory = self._pending.pop(template_name, None)
+            if factory is not None:
+                self._register(factory())
+                self._default_names.add(template_name)
+            template = self.templates.get(template_name)
+        if template is None:
+            raise TemplateNotFoundError(template_name)
+        return template
     
     def get_templates_by_type(self, prompt_type: PromptType) -> List[PromptTemplate]:
         """Get all templates of a specific type"""
-        return [template for template in self.templates.values() if template.type == prompt_type]
+        # A type's defaults are only known once built
+        for template_name in list(self._pending):
+            self.get_template(template_name)
+        return list(self._by_type.get(prompt_type, {}).values())
     
     def generate_prompt(self, template_name: str, **kwargs) -> str:
         """Generate a prompt from a template with provided variables"""
-        template = self.get_template(template_name)
-        if not template:
-            raise ValueError(f"Template '{template_name}' not found")
+        template = self.templates[template_name]
         
+        template.check_variables(kwargs)
         try:
-            return template.template.format(**kwargs)
-        except KeyError as e:
-            missing_var = str(e).strip("'")
-            raise ValueError(f"Missing required variable '{missing_var}' for template '{template_name}'")
+            # Values are keyed with their type so equal values like 1 and True render apart
+            key = tuple(sorted((name, type(value), value) for name, value in kwargs.items()))
+            hash(key)
+        except TypeError:
+            # Unhashable values (e.g. lists) are rendered without the cache
+            return template.render(kwargs)
+        return self._render_cached(template_name, key)
     
-    def validate_template_variables(self, template_name: str, variables: Dict[str, Any]) -> List[str]:
-        """Validate that all required variables are provided"""
-        template = self.get_template(template_name)
-        if not template:
-            raise ValueError(f"Template '{template_name}' not found")
+    def generate_prompt_parts(self, template_name: str, **kwargs) -> Tuple[str, str]:
+        """
+        Generate a prompt as (static prefix, rendered remainder)
         
-        missing_variables = []
-        for var in template.variables:
-            if var not in variables:
-                missing_variables.append(var)
+        The prefix is the same on every call, so the LLM request can mark it for
+        provider prompt caching (e.g. an Anthropic "cache_control" text block)
+        and only the remainder varies.
+        """
+        template = self.templates[template_name]
         
-        return missing_variables
+        template.check_variables(kwargs)
+        return template.static_prefix, template.render_dynamic(kwargs)
+    
+    def compile(self, template_name: str) -> Callable[..., str]:
+        """
+        Bind a template to a reusable renderer, for rendering it many times in a loop
+        
+        The template is looked up and compiled once; the returned function takes the
+        template variables as keyword arguments and bypasses the prompt cache. It is
+        thread-safe and keeps rendering this template if the name is later replaced.
+        """
+        template = self.templates[template_name]
+        
+        prefix = template.static_prefix
+        render_dynamic = template.renderer()
+        required_vars = template.required_vars
+        
+        def render(**kwargs) -> str:
+            if not required_vars <= kwargs.keys():
+                template.check_variables(kwargs)
+            return prefix + render_dynamic(kwargs)
+        
+        return render
+    
+    def partial(self, template_name: str, **fixed_kwargs) -> Callable[..., str]:
+        """
+        Bind some variables of a template, e.g. search results shared by several section prompts
+        
+        The fixed values are formatted into the template text once; the returned
+        function takes the remaining variables as keyword arguments and, like
+        compile(), bypasses the prompt cache.
+        """
+        template = self.templates[template_name]
+        remaining_vars = template.required_vars - fixed_kwargs.keys()
+        
+        segments = _parse_template(template.template)
+        if segments is None:
+            # Fields format_map must resolve itself; only the variables are bound
+            prefix = template.static_prefix
+            render_dynamic = template.renderer()
+            render_rest = lambda values: prefix + render_dynamic({**fixed_kwargs, **values})
+        else:
+            segments = [(template.static_prefix, None, "")] + segments
+            render_rest = _segment_renderer(_fold_segments(segments, fixed_kwargs))
+        
+        def render(**kwargs) -> str:
+            if not remaining_vars <= kwargs.keys():
+                template.check_variables({**fixed_kwargs, **kwargs})
+            return render_rest(kwargs)
+        
+        return render
+    
+    def _render_frozen(self, template_name: str, frozen_kwargs: tuple) -> str:
+        """Render a template from (name, type, value) triples; wrapped by the prompt cache"""
+        return self.templates[template_name].render({name: value for name, _, value in frozen_kwargs})
+    
+    def cache_info(self):
+        """Hit/miss statistics of the rendered-prompt cache"""
+        return self._render_cached.cache_info()
+    
+    def validate_template_variables(self, template_name: str, variables: Dict[str, Any]) -> List[str]:
+        """Validate that all required variables are provided; returns the missing names, sorted"""
+        template = self.templates[template_name]
+        
+        return sorted(template.required_vars - variables.keys())
     
     def add_custom_template(self, template: PromptTemplate) -> None:
         """Add a custom prompt template"""
+        # A custom template replaces a default of the same name, built or not
+        self._pending.pop(template.name, None)
+        self._default_names.discard(template.name)
+        self._register(template)
+        # Prompts rendered from a replaced template must not be served again
+        self._render_cached.cache_clear()
+    
+    def _register(self, template: PromptTemplate) -> None:
+        """Store a template by name and index it by type, replacing any of the same name"""
+        previous = self.templates.get(template.name)
+        if previous is not None:
+            del self._by_type[previous.type][template.name]
         self.templates[template.name] = template
+        self._by_type.setdefault(template.type, {})[template.name] = template
     
     def list_templates(self) -> List[str]:
         """List all available template names"""
-        return list(self.templates.keys())
+        return [*self.templates, *self._pending]
     
-    def get_template_info(self, template_name: str) -> Dict[str, Any]:
-        """Get information about a template"""
+    def get_template_info(self, template_name: str) -> Mapping[str, Any]:
+        """Get information about a template (a read-only mapping, shared between calls)"""
         template = self.get_template(template_name)
         if not template:
             return {}
         
-        return {
-            "name": template.name,
-            "type": template.type.value,
-            "description": template.description,
-            "variables": template.variables,
-            "example_input": template.example_input
-        }
-
-# Global prompt manager instance
+        if template._info is None:
+            example_input = template.example_input
+            if example_input is None and template_name in self._default_names:
+                example_input = _TEMPLATE_DOCS[template_name]["example_input"]
+            # Templates are frozen, so the info cannot go stale; a replaced template has its own
+            object.__setattr__(template, "_info", MappingProxyType({
+                "name": template.name,
+                "type": template.type.value,
+                "description": template.description,
+                "variables": template.variables,
+                "example_input": example_input
+            }))
+        return template._info
+
+# Global prompt manager instance, created once even when agents start concurrently
 _global_prompt_manager = None
+_global_prompt_manager_lock = threading.Lock()
 
 def get_prompt_manager() -> PromptManager:
     """Get or create global prompt manager instance"""
     global _global_prompt_manager
     if _global_prompt_manager is None:
-        _global_prompt_manager = PromptManager()
+        with _global_prompt_manager_lock:
+            if _global_prompt_manager is None:
+                _global_prompt_manager = PromptManager()
     return _global_prompt_manager
 
 def generate_prompt(template_name: str, **kwargs) -> str: